@@ -3,6 +3,7 @@ GigaChat Adapter - реализация AbstractLLMClient для Sber GigaChat
 """
 
 import asyncio
+import json
 import logging
 import time
 from typing import AsyncIterator, List, Optional
@@ -168,8 +169,6 @@ class GigaChatAdapter(AbstractLLMClient):
                         break
 
                     try:
-                        import json
-
                         chunk_data = json.loads(data_str)
                         choices = chunk_data.get("choices", [])
                         if choices:
@@ -203,6 +202,28 @@ class GigaChatAdapter(AbstractLLMClient):
         logger.warning("GigaChat может не поддерживать embeddings напрямую")
         raise NotImplementedError("GigaChat embeddings не реализованы")
 
+    async def get_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Получение embeddings для пачки текстов
+
+        Args:
+            texts: Тексты для векторизации
+
+        Returns:
+            Векторы embeddings в порядке входных текстов
+
+        Note:
+            GigaChat может не поддерживать embeddings напрямую
+        """
+        logger.warning("GigaChat может не поддерживать embeddings напрямую")
+        raise NotImplementedError("GigaChat embeddings не реализованы")
+
+    async def prepare(self) -> None:
+        """
+        Получение access_token заранее (кэшируется OAuth клиентом до истечения)
+        """
+        await self.oauth_client.get_access_token()
+
     async def health_check(self) -> bool:
         """
         Проверка доступности GigaChat API
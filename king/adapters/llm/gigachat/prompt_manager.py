@@ -60,7 +60,7 @@ class PromptManager:
                         self._templates[template_key] = self._jinja_env.from_string(
                             template_content
                         )
-                        logger.debug(f"Загружен шаблон: {template_key}")
+                        logger.debug("Загружен шаблон: %s", template_key)
 
             except Exception as e:
                 logger.error(f"Ошибка при загрузке шаблона {yaml_file}: {e}", exc_info=True)
@@ -5,7 +5,7 @@
 
 import asyncio
 import logging
-from typing import Callable, Optional
+from typing import Callable, List, Optional
 
 from king.core.domain import DomainEvent, EventBus
 from king.core.ports.messaging import AbstractMessageQueue
@@ -72,7 +72,42 @@ class MessagingEventBusAdapter:
             message = event.to_dict()
 
             await self.message_queue.publish(topic, message)
-            logger.debug(f"Событие {event.event_type} опубликовано в {topic}")
+            logger.debug("Событие %s опубликовано в %s", event.event_type, topic)
+        except Exception as e:
+            logger.error(f"Ошибка при публикации события в messaging: {e}", exc_info=True)
+
+    async def publish_many(self, events: List[DomainEvent]) -> None:
+        """
+        Публикация нескольких доменных событий одной пачкой
+
+        Args:
+            events: Доменные события
+        """
+        if not events:
+            return
+
+        try:
+            messages = [
+                (f"{self.topic_prefix}.{event.event_type.lower()}", event.to_dict())
+                for event in events
+            ]
+            await self.message_queue.publish_many(messages)
+            logger.debug("Опубликовано событий в messaging: %d", len(messages))
+        except Exception as e:
+            logger.error(f"Ошибка при публикации событий в messaging: {e}", exc_info=True)
+
+    async def publish_raw(self, event_type: str, payload: bytes) -> None:
+        """
+        Публикация уже сериализованного доменного события (например, из event store)
+
+        Args:
+            event_type: Тип события
+            payload: Сериализованное событие (JSON в UTF-8)
+        """
+        try:
+            topic = f"{self.topic_prefix}.{event_type.lower()}"
+            await self.message_queue.publish_raw(topic, payload)
+            logger.debug("Событие %s опубликовано в %s", event_type, topic)
         except Exception as e:
             logger.error(f"Ошибка при публикации события в messaging: {e}", exc_info=True)
 
@@ -5,7 +5,7 @@ Kafka адаптер для messaging
 import asyncio
 import json
 import logging
-from typing import AsyncIterator, Callable, Dict, List, Optional
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
 
 try:
     from aiokafka import AIOKafkaConsumer, AIOKafkaProducer
@@ -79,23 +79,29 @@ class KafkaAdapter(AbstractMessageQueue):
             topic: Название топика
             message: Данные сообщения
         """
+        await self.publish_raw(topic, json.dumps(message).encode("utf-8"))
+
+    async def publish_raw(self, topic: str, payload: bytes) -> None:
+        """
+        Публикация уже сериализованного сообщения в топик
+        (payload передается в producer без повторной сериализации)
+
+        Args:
+            topic: Название топика
+            payload: Сериализованное сообщение (JSON в UTF-8)
+        """
         topic_name = self._get_topic_name(topic)
+        await self._ensure_producer()
 
         if AIOKAFKA_AVAILABLE:
             # Асинхронная версия с aiokafka
-            if not self._producer:
-                self._producer = AIOKafkaProducer(
-                    bootstrap_servers=",".join(self.bootstrap_servers),
-                    value_serializer=lambda v: json.dumps(v).encode("utf-8"),
-                    acks="all",
-                    retries=3,
-                )
-                await self._producer.start()
-
             try:
-                record_metadata = await self._producer.send_and_wait(topic_name, message)
+                record_metadata = await self._producer.send_and_wait(topic_name, payload)
                 logger.debug(
-                    f"Сообщение опубликовано в топик {topic_name}, partition {record_metadata.partition}, offset {record_metadata.offset}"
+                    "Сообщение опубликовано в топик %s, partition %s, offset %s",
+                    topic_name,
+                    record_metadata.partition,
+                    record_metadata.offset,
                 )
             except Exception as e:
                 logger.error(f"Ошибка при публикации сообщения в Kafka: {e}", exc_info=True)
@@ -103,27 +109,82 @@ class KafkaAdapter(AbstractMessageQueue):
         else:
             # Синхронная версия с kafka-python (запускаем в executor)
             loop = asyncio.get_event_loop()
-            if not self._producer:
-                self._producer = await loop.run_in_executor(
-                    None,
-                    lambda: KafkaProducer(
-                        bootstrap_servers=self.bootstrap_servers,
-                        value_serializer=lambda v: json.dumps(v).encode("utf-8"),
-                        acks="all",
-                        retries=3,
-                    ),
-                )
-
             try:
-                future = self._producer.send(topic_name, message)
+                future = self._producer.send(topic_name, payload)
                 record_metadata = await loop.run_in_executor(None, lambda: future.get(timeout=10))
                 logger.debug(
-                    f"Сообщение опубликовано в топик {topic_name}, partition {record_metadata.partition}, offset {record_metadata.offset}"
+                    "Сообщение опубликовано в топик %s, partition %s, offset %s",
+                    topic_name,
+                    record_metadata.partition,
+                    record_metadata.offset,
                 )
             except Exception as e:
                 logger.error(f"Ошибка при публикации сообщения в Kafka: {e}", exc_info=True)
                 raise
 
+    async def publish_many(self, messages: List[Tuple[str, dict]]) -> None:
+        """
+        Публикация нескольких сообщений одной пачкой
+
+        Все сообщения передаются в producer без ожидания подтверждений,
+        затем выполняется один flush - вместо ожидания каждого сообщения.
+
+        Args:
+            messages: Пары (топик, данные сообщения)
+        """
+        if not messages:
+            return
+
+        await self._ensure_producer()
+        records = [
+            (self._get_topic_name(topic), json.dumps(message).encode("utf-8"))
+            for topic, message in messages
+        ]
+
+        try:
+            if AIOKAFKA_AVAILABLE:
+                futures = [
+                    await self._producer.send(topic_name, payload)
+                    for topic_name, payload in records
+                ]
+                await self._producer.flush()
+                await asyncio.gather(*futures)
+            else:
+                loop = asyncio.get_event_loop()
+                futures = [
+                    self._producer.send(topic_name, payload) for topic_name, payload in records
+                ]
+                await loop.run_in_executor(None, lambda: self._producer.flush(timeout=10))
+                for future in futures:
+                    future.get(timeout=0)
+            logger.debug("Опубликовано сообщений в Kafka: %d", len(records))
+        except Exception as e:
+            logger.error(f"Ошибка при пакетной публикации сообщений в Kafka: {e}", exc_info=True)
+            raise
+
+    async def _ensure_producer(self) -> None:
+        """Создание producer при первой публикации"""
+        if self._producer:
+            return
+
+        if AIOKAFKA_AVAILABLE:
+            self._producer = AIOKafkaProducer(
+                bootstrap_servers=",".join(self.bootstrap_servers),
+                acks="all",
+                retries=3,
+            )
+            await self._producer.start()
+        else:
+            loop = asyncio.get_event_loop()
+            self._producer = await loop.run_in_executor(
+                None,
+                lambda: KafkaProducer(
+                    bootstrap_servers=self.bootstrap_servers,
+                    acks="all",
+                    retries=3,
+                ),
+            )
+
     async def subscribe(
         self,
         topic: str,
@@ -247,7 +308,7 @@ class KafkaAdapter(AbstractMessageQueue):
             logger.info(f"Топик {topic_name} создан")
         except Exception as e:
             # Топик может уже существовать
-            logger.debug(f"Топик {topic_name} уже существует или ошибка создания: {e}")
+            logger.debug("Топик %s уже существует или ошибка создания: %s", topic_name, e)
 
     async def close(self) -> None:
         """Закрытие соединений"""
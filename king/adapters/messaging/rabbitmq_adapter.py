@@ -61,15 +61,25 @@ class RabbitMQAdapter(AbstractMessageQueue):
             topic: Routing key (используется как routing key)
             message: Данные сообщения
         """
+        await self.publish_raw(topic, json.dumps(message).encode("utf-8"))
+
+    async def publish_raw(self, topic: str, payload: bytes) -> None:
+        """
+        Публикация уже сериализованного сообщения в exchange
+
+        Args:
+            topic: Routing key (используется как routing key)
+            payload: Сериализованное сообщение (JSON в UTF-8)
+        """
         await self._ensure_connection()
 
-        # Сериализация сообщения
-        message_body = json.dumps(message).encode("utf-8")
-        rabbitmq_message = Message(message_body, delivery_mode=aio_pika.DeliveryMode.PERSISTENT)
+        rabbitmq_message = Message(payload, delivery_mode=aio_pika.DeliveryMode.PERSISTENT)
 
         try:
             await self._exchange.publish(rabbitmq_message, routing_key=topic)
-            logger.debug(f"Сообщение опубликовано в exchange {self.exchange_name} с routing key {topic}")
+            logger.debug(
+                "Сообщение опубликовано в exchange %s с routing key %s", self.exchange_name, topic
+            )
         except Exception as e:
             logger.error(f"Ошибка при публикации сообщения в RabbitMQ: {e}", exc_info=True)
             raise
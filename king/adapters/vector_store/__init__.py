@@ -1,5 +1,5 @@
 """
-Vector Store адаптеры (Qdrant, Chroma)
+Vector Store адаптеры (Qdrant, Chroma, FAISS)
 """
 
 try:
@@ -12,8 +12,14 @@ try:
 except ImportError:
     QdrantAdapter = None
 
+try:
+    from king.adapters.vector_store.faiss_adapter import FaissLocalIndex
+except ImportError:
+    FaissLocalIndex = None
+
 __all__ = [
     "QdrantAdapter",
     "ChromaAdapter",
+    "FaissLocalIndex",
 ]
 
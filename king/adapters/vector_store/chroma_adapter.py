@@ -3,7 +3,7 @@ Chroma адаптер для векторного хранилища
 """
 
 import logging
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
 try:
     import chromadb
@@ -12,7 +12,22 @@ try:
 except ImportError:
     CHROMA_AVAILABLE = False
 
-from king.core.ports.vector_store import AbstractVectorStore, SearchResult, Vector
+from king.core.ports.vector_store import (
+    AbstractVectorStore,
+    And,
+    Eq,
+    FilterLike,
+    In,
+    MetadataFilter,
+    Or,
+    Quantization,
+    Range,
+    SearchResult,
+    Vector,
+    VectorLike,
+    normalize_filter,
+    to_float32,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +44,7 @@ class ChromaAdapter(AbstractVectorStore):
         collection_name: str = "king_vectors",
         host: str = "localhost",
         port: int = 8000,
+        embed_queries: bool = False,
     ):
         """
         Инициализация Chroma адаптера
@@ -38,6 +54,8 @@ class ChromaAdapter(AbstractVectorStore):
             collection_name: Название коллекции
             host: Хост Chroma сервера (если используется клиент)
             port: Порт Chroma сервера (если используется клиент)
+            embed_queries: Векторизовать текст запроса функцией embeddings коллекции
+                (search_text); включать, только если документы векторизованы той же моделью
         """
         if not CHROMA_AVAILABLE:
             raise ImportError(
@@ -46,6 +64,7 @@ class ChromaAdapter(AbstractVectorStore):
 
         self.persist_directory = persist_directory
         self.collection_name = collection_name
+        self.supports_text_query = embed_queries
 
         # Создание клиента
         if persist_directory:
@@ -70,6 +89,7 @@ class ChromaAdapter(AbstractVectorStore):
         self,
         vectors: List[Vector],
         collection: Optional[str] = None,
+        batch_size: int = 256,
     ) -> None:
         """
         Добавление векторов в хранилище
@@ -77,6 +97,7 @@ class ChromaAdapter(AbstractVectorStore):
         Args:
             vectors: Список векторов с метаданными
             collection: Название коллекции (игнорируется, используется self.collection_name)
+            batch_size: Размер пачки для одного вызова add
         """
         collection_name = collection or self.collection_name
 
@@ -106,22 +127,27 @@ class ChromaAdapter(AbstractVectorStore):
                         flat_meta[key] = str(value)
                 flat_metadata.append(flat_meta)
 
-            coll.add(
-                ids=[v.id for v in vectors],
-                embeddings=[v.vector for v in vectors],
-                metadatas=flat_metadata,
-            )
-            logger.debug(f"Добавлено {len(vectors)} векторов в коллекцию {collection_name}")
+            # Загрузка полными пачками: один вызов add на batch_size векторов
+            for start in range(0, len(vectors), batch_size):
+                chunk = vectors[start:start + batch_size]
+                coll.add(
+                    ids=[v.id for v in chunk],
+                    embeddings=[v.vector.tolist() for v in chunk],
+                    metadatas=flat_metadata[start:start + batch_size],
+                )
+            logger.debug("Добавлено %d векторов в коллекцию %s", len(vectors), collection_name)
         except Exception as e:
             logger.error(f"Ошибка при добавлении векторов: {e}", exc_info=True)
             raise
 
     async def search(
         self,
-        query_vector: List[float],
+        query_vector: VectorLike,
         top_k: int = 10,
         collection: Optional[str] = None,
-        filter: Optional[dict] = None,
+        filter: Optional[FilterLike] = None,
+        with_vectors: bool = False,
+        with_payload: bool = True,
     ) -> List[SearchResult]:
         """
         Поиск похожих векторов
@@ -131,6 +157,8 @@ class ChromaAdapter(AbstractVectorStore):
             top_k: Количество результатов
             collection: Название коллекции (игнорируется, используется self.collection_name)
             filter: Фильтр по метаданным (опционально)
+            with_vectors: Возвращать векторы найденных записей
+            with_payload: Возвращать метаданные найденных записей
 
         Returns:
             Список результатов поиска
@@ -148,36 +176,231 @@ class ChromaAdapter(AbstractVectorStore):
 
         try:
             # Chroma использует where для фильтрации
-            where = filter if filter else None
+            where = self._build_where(filter)
 
             results = coll.query(
-                query_embeddings=[query_vector],
+                query_embeddings=[list(query_vector)],
                 n_results=top_k,
                 where=where,
+                include=self._include(with_vectors, with_payload),
             )
 
-            # Преобразование результатов
-            search_results = []
-            if results["ids"] and len(results["ids"][0]) > 0:
-                for i, vector_id in enumerate(results["ids"][0]):
-                    score = 1.0 - results["distances"][0][i] if "distances" in results else 1.0
-                    metadata = results["metadatas"][0][i] if results["metadatas"] else {}
-
-                    search_results.append(
-                        SearchResult(
-                            id=vector_id,
-                            score=score,
-                            vector=None,  # Chroma не возвращает векторы по умолчанию
-                            metadata=metadata or {},
-                        )
-                    )
-
-            logger.debug(f"Найдено {len(search_results)} результатов")
+            search_results = self._to_search_results(results, 0)
+            logger.debug("Найдено %d результатов", len(search_results))
             return search_results
         except Exception as e:
             logger.error(f"Ошибка при поиске векторов: {e}", exc_info=True)
             raise
 
+    async def search_batch(
+        self,
+        query_vectors: List[VectorLike],
+        top_k: int = 10,
+        collection: Optional[str] = None,
+        filter: Optional[FilterLike] = None,
+        with_vectors: bool = False,
+        with_payload: bool = True,
+    ) -> List[List[SearchResult]]:
+        """
+        Пакетный поиск похожих векторов одним запросом к Chroma
+
+        Args:
+            query_vectors: Векторы запросов
+            top_k: Количество результатов на каждый запрос
+            collection: Название коллекции
+            filter: Фильтр по метаданным (общий для всех запросов)
+            with_vectors: Возвращать векторы найденных записей
+            with_payload: Возвращать метаданные найденных записей
+
+        Returns:
+            Списки результатов поиска в порядке векторов запросов
+        """
+        if not query_vectors:
+            return []
+
+        collection_name = collection or self.collection_name
+
+        # Получение коллекции
+        if collection_name != self.collection_name:
+            try:
+                coll = self.client.get_collection(name=collection_name)
+            except Exception:
+                coll = self.collection
+        else:
+            coll = self.collection
+
+        try:
+            results = coll.query(
+                query_embeddings=[list(v) for v in query_vectors],
+                n_results=top_k,
+                where=self._build_where(filter),
+                include=self._include(with_vectors, with_payload),
+            )
+
+            logger.debug("Выполнен пакетный поиск по %d запросам", len(query_vectors))
+            return [self._to_search_results(results, q) for q in range(len(query_vectors))]
+        except Exception as e:
+            logger.error(f"Ошибка при пакетном поиске векторов: {e}", exc_info=True)
+            raise
+
+    async def search_text(
+        self,
+        query: str,
+        top_k: int = 10,
+        collection: Optional[str] = None,
+        filter: Optional[FilterLike] = None,
+    ) -> List[SearchResult]:
+        """
+        Поиск по тексту запроса (векторизация функцией embeddings коллекции)
+
+        Args:
+            query: Текст запроса
+            top_k: Количество результатов
+            collection: Название коллекции
+            filter: Фильтр по метаданным
+
+        Returns:
+            Список результатов поиска
+
+        Raises:
+            NotImplementedError: Если адаптер создан без embed_queries
+        """
+        if not self.supports_text_query:
+            return await super().search_text(query, top_k, collection, filter)
+
+        collection_name = collection or self.collection_name
+        if collection_name != self.collection_name:
+            try:
+                coll = self.client.get_collection(name=collection_name)
+            except Exception:
+                coll = self.collection
+        else:
+            coll = self.collection
+
+        try:
+            results = coll.query(
+                query_texts=[query],
+                n_results=top_k,
+                where=self._build_where(filter),
+                include=self._include(False, True),
+            )
+            return self._to_search_results(results, 0)
+        except Exception as e:
+            logger.error(f"Ошибка при поиске по тексту: {e}", exc_info=True)
+            raise
+
+    @staticmethod
+    def _include(with_vectors: bool, with_payload: bool) -> List[str]:
+        """Набор полей ответа Chroma (документы не запрашиваются)"""
+        include = ["distances"]
+        if with_payload:
+            include.append("metadatas")
+        if with_vectors:
+            include.append("embeddings")
+        return include
+
+    @classmethod
+    def _build_where(cls, filter: Optional[FilterLike]) -> Optional[dict]:
+        """Построение where-фильтра Chroma"""
+        spec = normalize_filter(filter)
+        return cls._to_where(spec) if spec is not None else None
+
+    @classmethod
+    def _to_where(cls, spec: MetadataFilter) -> dict:
+        """Трансляция типизированного фильтра в where-выражение Chroma"""
+        if isinstance(spec, Eq):
+            return {spec.field: {"$eq": spec.value}}
+        if isinstance(spec, In):
+            return {spec.field: {"$in": list(spec.values)}}
+        if isinstance(spec, Range):
+            bounds = [
+                {spec.field: {op: value}}
+                for op, value in (
+                    ("$gt", spec.gt),
+                    ("$gte", spec.gte),
+                    ("$lt", spec.lt),
+                    ("$lte", spec.lte),
+                )
+                if value is not None
+            ]
+            if not bounds:
+                raise ValueError(f"Пустой диапазон для поля {spec.field}")
+            return bounds[0] if len(bounds) == 1 else {"$and": bounds}
+        if isinstance(spec, (And, Or)):
+            clauses = [cls._to_where(f) for f in spec.filters]
+            # Chroma требует минимум два операнда у $and/$or
+            if len(clauses) == 1:
+                return clauses[0]
+            return {"$and" if isinstance(spec, And) else "$or": clauses}
+        raise ValueError(f"Неподдерживаемый фильтр: {spec!r}")
+
+    @staticmethod
+    def _to_search_results(results: dict, q: int) -> List[SearchResult]:
+        """
+        Преобразование ответа Chroma для одного запроса в результаты поиска
+
+        Args:
+            results: Ответ coll.query
+            q: Индекс запроса в пачке
+        """
+        search_results = []
+        if results["ids"] and len(results["ids"][q]) > 0:
+            for i, vector_id in enumerate(results["ids"][q]):
+                score = 1.0 - results["distances"][q][i] if results.get("distances") else 1.0
+                metadata = results["metadatas"][q][i] if results.get("metadatas") else {}
+                embeddings = results.get("embeddings")
+                vector = to_float32(embeddings[q][i]) if embeddings is not None else None
+
+                search_results.append(
+                    SearchResult(
+                        id=vector_id,
+                        score=score,
+                        vector=vector,
+                        metadata=metadata or {},
+                    )
+                )
+        return search_results
+
+    async def iter_vectors(
+        self,
+        collection: Optional[str] = None,
+        batch_size: int = 256,
+    ) -> AsyncIterator[List[Vector]]:
+        """
+        Постраничное чтение всех векторов коллекции (get с limit/offset)
+
+        Args:
+            collection: Название коллекции (None - коллекция адаптера)
+            batch_size: Количество векторов в одной странице
+
+        Yields:
+            Страницы векторов с метаданными
+        """
+        collection_name = collection or self.collection_name
+
+        # Получение коллекции
+        if collection_name != self.collection_name:
+            coll = self.client.get_collection(name=collection_name)
+        else:
+            coll = self.collection
+
+        offset = 0
+        while True:
+            page = coll.get(
+                include=["embeddings", "metadatas"],
+                limit=batch_size,
+                offset=offset,
+            )
+            ids = page["ids"]
+            if ids:
+                yield [
+                    Vector(id=id, vector=embedding, metadata=metadata or {})
+                    for id, embedding, metadata in zip(ids, page["embeddings"], page["metadatas"])
+                ]
+            if len(ids) < batch_size:
+                break
+            offset += len(ids)
+
     async def delete(self, ids: List[str], collection: Optional[str] = None) -> None:
         """
         Удаление векторов по ID
@@ -199,7 +422,7 @@ class ChromaAdapter(AbstractVectorStore):
 
         try:
             coll.delete(ids=ids)
-            logger.debug(f"Удалено {len(ids)} векторов из коллекции {collection_name}")
+            logger.debug("Удалено %d векторов из коллекции %s", len(ids), collection_name)
         except Exception as e:
             logger.error(f"Ошибка при удалении векторов: {e}", exc_info=True)
             raise
@@ -208,6 +431,12 @@ class ChromaAdapter(AbstractVectorStore):
         self,
         name: str,
         dimension: int,
+        *,
+        distance: str = "cosine",
+        quantization: Optional[Quantization] = None,
+        on_disk: bool = False,
+        hnsw_m: int = 16,
+        hnsw_ef_construct: int = 128,
         **kwargs
     ) -> None:
         """
@@ -216,12 +445,33 @@ class ChromaAdapter(AbstractVectorStore):
         Args:
             name: Название коллекции
             dimension: Размерность векторов (игнорируется для Chroma)
+            distance: Метрика расстояния ("cosine", "dot", "euclid")
+            quantization: Квантование (Chroma не поддерживает, игнорируется)
+            on_disk: Игнорируется (определяется режимом клиента persist_directory)
+            hnsw_m: Параметр M графа HNSW
+            hnsw_ef_construct: Параметр construction_ef графа HNSW
             **kwargs: Дополнительные параметры
+
+        Raises:
+            ValueError: Если метрика не поддерживается
         """
+        spaces = {"cosine": "cosine", "dot": "ip", "euclid": "l2"}
+        if distance not in spaces:
+            raise ValueError(f"Неподдерживаемая метрика расстояния: {distance}")
+
+        if quantization not in (None, "none"):
+            logger.warning(
+                f"Chroma не поддерживает квантование ({quantization}), параметр игнорируется"
+            )
+
         try:
             self.client.create_collection(
                 name=name,
-                metadata={"hnsw:space": "cosine"},
+                metadata={
+                    "hnsw:space": spaces[distance],
+                    "hnsw:M": hnsw_m,
+                    "hnsw:construction_ef": hnsw_ef_construct,
+                },
             )
             logger.info(f"Создана коллекция {name}")
         except Exception as e:
@@ -0,0 +1,391 @@
+"""
+FAISS адаптер - локальный (in-process) ANN-индекс IVF-PQ
+"""
+
+import asyncio
+import logging
+import math
+from typing import Any, Dict, List, Optional
+
+try:
+    import faiss
+    import numpy as np
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+from king.core.ports.vector_store import (
+    AbstractVectorStore,
+    And,
+    Eq,
+    FilterLike,
+    In,
+    MetadataFilter,
+    Or,
+    Quantization,
+    Range,
+    SearchResult,
+    Vector,
+    VectorLike,
+    normalize_filter,
+)
+
+logger = logging.getLogger(__name__)
+
+# Во сколько раз больше кандидатов запрашивается из индекса при фильтрации
+FILTER_OVERFETCH = 4
+
+
+class FaissLocalIndex(AbstractVectorStore):
+    """
+    Локальное зеркало коллекции на FAISS IVF-PQ
+
+    Используется RAGService как основной путь поиска (без сетевого запроса),
+    удаленное хранилище остается источником истины. health_check возвращает
+    True только после заполнения зеркала из удаленного хранилища (sync_from)
+    и обучения индекса (накоплено min_train_size векторов) - до этого поиск
+    выполняется в удаленном хранилище.
+
+    Все операции с индексом FAISS (обучение, добавление, удаление, поиск)
+    выполняются в пуле потоков по одной под asyncio.Lock: IVF-индекс не
+    допускает изменения одновременно с поиском.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        nprobe: int = 8,
+        pq_m: int = 8,
+        pq_nbits: int = 8,
+        min_train_size: int = 1024,
+    ):
+        """
+        Инициализация локального индекса
+
+        Args:
+            dimension: Размерность векторов
+            nprobe: Количество просматриваемых кластеров IVF при поиске
+            pq_m: Количество подвекторов PQ (размерность должна делиться на pq_m)
+            pq_nbits: Бит на код подвектора PQ
+            min_train_size: Количество векторов, после которого индекс обучается
+        """
+        if not FAISS_AVAILABLE:
+            raise ImportError(
+                "faiss не установлен. Установите: pip install faiss-cpu"
+            )
+
+        if dimension % pq_m != 0:
+            raise ValueError(f"Размерность {dimension} должна делиться на pq_m={pq_m}")
+
+        self.dimension = dimension
+        self.nprobe = nprobe
+        self.pq_m = pq_m
+        self.pq_nbits = pq_nbits
+        self.min_train_size = min_train_size
+        self._lock = asyncio.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        """Сброс индекса и сопоставлений ID"""
+        self._index = None
+        self._synced = False
+        # Векторы, накопленные до обучения (ID -> вектор, повторный ID заменяет вектор)
+        self._pending: Dict[str, Vector] = {}
+        # Внутренний int64 ID FAISS <-> строковый ID вектора
+        self._ids: Dict[int, str] = {}
+        self._int_ids: Dict[str, int] = {}
+        self._metadata: Dict[int, Dict[str, Any]] = {}
+        self._next_id = 0
+
+    @property
+    def trained(self) -> bool:
+        """Индекс обучен и используется для поиска"""
+        return self._index is not None
+
+    async def add_vectors(
+        self,
+        vectors: List[Vector],
+        collection: Optional[str] = None,
+        batch_size: int = 256,
+    ) -> None:
+        """
+        Добавление векторов в индекс
+
+        До обучения векторы накапливаются; при достижении min_train_size
+        индекс обучается на накопленных векторах (nlist = sqrt(N)).
+
+        Args:
+            vectors: Список векторов с метаданными
+            collection: Игнорируется (индекс зеркалирует одну коллекцию)
+            batch_size: Размер пачки для добавления в индекс
+        """
+        async with self._lock:
+            await self._ingest(vectors, batch_size)
+
+    async def sync_from(
+        self,
+        store: AbstractVectorStore,
+        collection: Optional[str] = None,
+        batch_size: int = 1024,
+    ) -> None:
+        """
+        Заполнение зеркала всеми векторами удаленного хранилища
+
+        Индекс сбрасывается и заполняется заново; до завершения health_check
+        возвращает False. Добавления, пришедшие во время синхронизации,
+        ожидают ее окончания (повторный ID заменяет вектор).
+
+        Args:
+            store: Удаленное хранилище (источник истины)
+            collection: Название коллекции в хранилище
+            batch_size: Размер страницы чтения из хранилища
+
+        Raises:
+            NotImplementedError: Если хранилище не поддерживает iter_vectors
+        """
+        async with self._lock:
+            self._reset()
+            count = 0
+            async for page in store.iter_vectors(collection=collection, batch_size=batch_size):
+                await self._ingest(page, batch_size)
+                count += len(page)
+            self._synced = True
+        logger.info("Локальный индекс FAISS синхронизирован: %d векторов", count)
+
+    async def _ingest(self, vectors: List[Vector], batch_size: int) -> None:
+        """Добавление векторов (вызывается под self._lock)"""
+        if self._index is None:
+            self._pending.update((vector.id, vector) for vector in vectors)
+            if len(self._pending) >= self.min_train_size:
+                pending = list(self._pending.values())
+                await asyncio.to_thread(self._train, pending)
+                self._pending = {}
+            return
+
+        for start in range(0, len(vectors), batch_size):
+            await asyncio.to_thread(self._add, vectors[start:start + batch_size])
+
+    def _train(self, vectors: List[Vector]) -> None:
+        """Обучение IVF-PQ на векторах и их добавление"""
+        nlist = max(1, int(math.sqrt(len(vectors))))
+        quantizer = faiss.IndexFlatIP(self.dimension)
+        index = faiss.IndexIVFPQ(
+            quantizer, self.dimension, nlist, self.pq_m, self.pq_nbits, faiss.METRIC_INNER_PRODUCT
+        )
+        index.train(self._matrix(v.vector for v in vectors))
+        index.nprobe = self.nprobe
+
+        self._quantizer = quantizer  # индекс не владеет квантизатором
+        self._index = index
+        self._add(vectors)
+        logger.info(f"Обучен локальный индекс FAISS IVF-PQ: {len(vectors)} векторов, nlist={nlist}")
+
+    def _add(self, vectors: List[Vector]) -> None:
+        """Добавление векторов в обученный индекс (повторный ID заменяет вектор)"""
+        if not vectors:
+            return
+
+        # Повторный ID внутри пачки - остается последний вектор
+        vectors = list({v.id: v for v in vectors}.values())
+        replaced = [self._int_ids[v.id] for v in vectors if v.id in self._int_ids]
+        if replaced:
+            self._remove(replaced)
+
+        int_ids = np.arange(self._next_id, self._next_id + len(vectors), dtype="int64")
+        self._next_id += len(vectors)
+        for int_id, vector in zip(int_ids.tolist(), vectors):
+            self._ids[int_id] = vector.id
+            self._int_ids[vector.id] = int_id
+            self._metadata[int_id] = vector.metadata
+
+        self._index.add_with_ids(self._matrix(v.vector for v in vectors), int_ids)
+
+    def _remove(self, int_ids: List[int]) -> None:
+        """Удаление векторов из индекса по внутренним ID"""
+        self._index.remove_ids(np.asarray(int_ids, dtype="int64"))
+        for int_id in int_ids:
+            self._int_ids.pop(self._ids.pop(int_id), None)
+            self._metadata.pop(int_id, None)
+
+    def _matrix(self, vectors) -> "np.ndarray":
+        """Нормированная матрица float32 (косинус = скалярное произведение)"""
+        matrix = np.vstack([np.asarray(v, dtype="float32") for v in vectors])
+        faiss.normalize_L2(matrix)
+        return matrix
+
+    async def search(
+        self,
+        query_vector: VectorLike,
+        top_k: int = 10,
+        collection: Optional[str] = None,
+        filter: Optional[FilterLike] = None,
+        with_vectors: bool = False,
+        with_payload: bool = True,
+    ) -> List[SearchResult]:
+        """
+        Поиск похожих векторов в локальном индексе
+
+        Args:
+            query_vector: Вектор запроса
+            top_k: Количество результатов
+            collection: Игнорируется
+            filter: Фильтр по метаданным (применяется к кандидатам индекса)
+            with_vectors: Игнорируется (PQ хранит только сжатые коды)
+            with_payload: Возвращать метаданные
+
+        Returns:
+            Список результатов поиска
+
+        Raises:
+            RuntimeError: Если индекс еще не обучен
+        """
+        results = await self.search_batch(
+            [query_vector], top_k, collection, filter, with_vectors, with_payload
+        )
+        return results[0]
+
+    async def search_batch(
+        self,
+        query_vectors: List[VectorLike],
+        top_k: int = 10,
+        collection: Optional[str] = None,
+        filter: Optional[FilterLike] = None,
+        with_vectors: bool = False,
+        with_payload: bool = True,
+    ) -> List[List[SearchResult]]:
+        """
+        Пакетный поиск одним вызовом index.search
+
+        Args:
+            query_vectors: Векторы запросов
+            top_k: Количество результатов на каждый запрос
+            collection: Игнорируется
+            filter: Фильтр по метаданным (общий для всех запросов)
+            with_vectors: Игнорируется (PQ хранит только сжатые коды)
+            with_payload: Возвращать метаданные
+
+        Returns:
+            Списки результатов поиска в порядке векторов запросов
+
+        Raises:
+            RuntimeError: Если индекс еще не обучен
+        """
+        if not query_vectors:
+            return []
+
+        spec = normalize_filter(filter)
+        k = top_k * FILTER_OVERFETCH if spec is not None else top_k
+        async with self._lock:
+            if self._index is None:
+                raise RuntimeError("Локальный индекс FAISS еще не обучен")
+            scores, int_ids = await asyncio.to_thread(
+                self._index.search, self._matrix(query_vectors), k
+            )
+
+        batch_results = []
+        for row_scores, row_ids in zip(scores.tolist(), int_ids.tolist()):
+            results = []
+            for score, int_id in zip(row_scores, row_ids):
+                if int_id < 0 or int_id not in self._ids:
+                    continue
+                metadata = self._metadata[int_id]
+                if spec is not None and not self._matches(spec, metadata):
+                    continue
+                results.append(
+                    SearchResult(
+                        id=self._ids[int_id],
+                        score=score,
+                        metadata=metadata if with_payload else None,
+                    )
+                )
+                if len(results) == top_k:
+                    break
+            batch_results.append(results)
+        return batch_results
+
+    @classmethod
+    def _matches(cls, spec: MetadataFilter, metadata: Dict[str, Any]) -> bool:
+        """Проверка метаданных на соответствие фильтру"""
+        if isinstance(spec, Eq):
+            return metadata.get(spec.field) == spec.value
+        if isinstance(spec, In):
+            return metadata.get(spec.field) in spec.values
+        if isinstance(spec, Range):
+            value = metadata.get(spec.field)
+            if value is None:
+                return False
+            return (
+                (spec.gt is None or value > spec.gt)
+                and (spec.gte is None or value >= spec.gte)
+                and (spec.lt is None or value < spec.lt)
+                and (spec.lte is None or value <= spec.lte)
+            )
+        if isinstance(spec, And):
+            return all(cls._matches(f, metadata) for f in spec.filters)
+        if isinstance(spec, Or):
+            return any(cls._matches(f, metadata) for f in spec.filters)
+        raise ValueError(f"Неподдерживаемый фильтр: {spec!r}")
+
+    async def delete(self, ids: List[str], collection: Optional[str] = None) -> None:
+        """
+        Удаление векторов по ID
+
+        Args:
+            ids: Список ID для удаления
+            collection: Игнорируется
+        """
+        async with self._lock:
+            if self._index is None:
+                for vector_id in ids:
+                    self._pending.pop(vector_id, None)
+                return
+
+            int_ids = [self._int_ids[i] for i in ids if i in self._int_ids]
+            if int_ids:
+                await asyncio.to_thread(self._remove, int_ids)
+
+    async def create_collection(
+        self,
+        name: str,
+        dimension: int,
+        *,
+        distance: str = "cosine",
+        quantization: Optional[Quantization] = None,
+        on_disk: bool = False,
+        hnsw_m: int = 16,
+        hnsw_ef_construct: int = 128,
+        **kwargs
+    ) -> None:
+        """
+        Пересоздание индекса с новой размерностью
+
+        Args:
+            name: Игнорируется (индекс зеркалирует одну коллекцию)
+            dimension: Размерность векторов
+            distance: Поддерживается только "cosine"
+            quantization: Игнорируется (индекс всегда использует PQ)
+            on_disk: Игнорируется
+            hnsw_m: Игнорируется
+            hnsw_ef_construct: Игнорируется
+            **kwargs: Дополнительные параметры
+
+        Raises:
+            ValueError: Если метрика или размерность не поддерживаются
+        """
+        if distance != "cosine":
+            raise ValueError(f"Неподдерживаемая метрика расстояния: {distance}")
+        if dimension % self.pq_m != 0:
+            raise ValueError(f"Размерность {dimension} должна делиться на pq_m={self.pq_m}")
+
+        async with self._lock:
+            self.dimension = dimension
+            self._reset()
+
+    async def health_check(self) -> bool:
+        """
+        Готовность индекса к поиску
+
+        Returns:
+            True если зеркало синхронизировано (sync_from) и индекс обучен, False иначе
+        """
+        return self._synced and self._index is not None
@@ -2,26 +2,56 @@
 Qdrant адаптер для векторного хранилища
 """
 
+import asyncio
 import logging
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
 try:
     from qdrant_client import QdrantClient
     from qdrant_client.models import (
+        BinaryQuantization,
+        BinaryQuantizationConfig,
         Distance,
         PointStruct,
         Filter,
         FieldCondition,
+        HnswConfigDiff,
+        MatchAny,
         MatchValue,
+        PayloadSchemaType,
+        Range as QdrantRange,
+        ScalarQuantization,
+        ScalarQuantizationConfig,
+        ScalarType,
+        SearchRequest,
+        VectorParams,
     )
     QDRANT_AVAILABLE = True
 except ImportError:
     QDRANT_AVAILABLE = False
 
-from king.core.ports.vector_store import AbstractVectorStore, SearchResult, Vector
+from king.core.ports.vector_store import (
+    AbstractVectorStore,
+    And,
+    Eq,
+    FilterLike,
+    In,
+    MetadataFilter,
+    Or,
+    Quantization,
+    Range,
+    SearchResult,
+    Vector,
+    VectorLike,
+    normalize_filter,
+    to_float32,
+)
 
 logger = logging.getLogger(__name__)
 
+# Максимальное количество одновременных upsert-запросов при загрузке пачками
+MAX_PARALLEL_UPSERTS = 8
+
 
 class QdrantAdapter(AbstractVectorStore):
     """
@@ -84,41 +114,59 @@ class QdrantAdapter(AbstractVectorStore):
         self,
         vectors: List[Vector],
         collection: Optional[str] = None,
+        batch_size: int = 256,
     ) -> None:
         """
         Добавление векторов в хранилище
 
+        Векторы загружаются пачками по batch_size, пачки отправляются
+        параллельно (не более MAX_PARALLEL_UPSERTS запросов одновременно).
+
         Args:
             vectors: Список векторов с метаданными
             collection: Название коллекции (игнорируется, используется self.collection_name)
+            batch_size: Размер пачки для одного upsert
         """
         collection_name = collection or self.collection_name
+        semaphore = asyncio.Semaphore(MAX_PARALLEL_UPSERTS)
 
-        try:
+        async def upsert_chunk(chunk: List[Vector]) -> None:
             points = [
                 PointStruct(
                     id=vector.id,
-                    vector=vector.vector,
+                    vector=vector.vector.tolist(),
                     payload=vector.metadata,
                 )
-                for vector in vectors
+                for vector in chunk
             ]
+            async with semaphore:
+                # Синхронный клиент - выполняем запрос в пуле потоков
+                await asyncio.to_thread(
+                    self.client.upsert,
+                    collection_name=collection_name,
+                    points=points,
+                )
 
-            self.client.upsert(
-                collection_name=collection_name,
-                points=points,
+        try:
+            await asyncio.gather(
+                *(
+                    upsert_chunk(vectors[start:start + batch_size])
+                    for start in range(0, len(vectors), batch_size)
+                )
             )
-            logger.debug(f"Добавлено {len(points)} векторов в коллекцию {collection_name}")
+            logger.debug("Добавлено %d векторов в коллекцию %s", len(vectors), collection_name)
         except Exception as e:
             logger.error(f"Ошибка при добавлении векторов: {e}", exc_info=True)
             raise
 
     async def search(
         self,
-        query_vector: List[float],
+        query_vector: VectorLike,
         top_k: int = 10,
         collection: Optional[str] = None,
-        filter: Optional[dict] = None,
+        filter: Optional[FilterLike] = None,
+        with_vectors: bool = False,
+        with_payload: bool = True,
     ) -> List[SearchResult]:
         """
         Поиск похожих векторов
@@ -128,6 +176,8 @@ class QdrantAdapter(AbstractVectorStore):
             top_k: Количество результатов
             collection: Название коллекции (игнорируется, используется self.collection_name)
             filter: Фильтр по метаданным (опционально)
+            with_vectors: Возвращать векторы найденных точек
+            with_payload: Возвращать payload найденных точек
 
         Returns:
             Список результатов поиска
@@ -140,45 +190,183 @@ class QdrantAdapter(AbstractVectorStore):
             )
 
         try:
-            # Построение фильтра
-            qdrant_filter = None
-            if filter:
-                conditions = []
-                for key, value in filter.items():
-                    conditions.append(
-                        FieldCondition(
-                            key=key,
-                            match=MatchValue(value=value),
-                        )
-                    )
-                if conditions:
-                    qdrant_filter = Filter(must=conditions)
-
             # Поиск
             results = self.client.search(
                 collection_name=collection_name,
-                query_vector=query_vector,
+                query_vector=list(query_vector),
                 limit=top_k,
-                query_filter=qdrant_filter,
+                query_filter=self._build_filter(filter),
+                with_payload=with_payload,
+                with_vectors=with_vectors,
             )
 
-            # Преобразование результатов
-            search_results = [
-                SearchResult(
-                    id=str(point.id),
-                    score=point.score,
-                    vector=None,  # Qdrant не возвращает векторы по умолчанию
-                    metadata=point.payload or {},
-                )
-                for point in results
-            ]
-
-            logger.debug(f"Найдено {len(search_results)} результатов")
+            search_results = self._to_search_results(results)
+            logger.debug("Найдено %d результатов", len(search_results))
             return search_results
         except Exception as e:
             logger.error(f"Ошибка при поиске векторов: {e}", exc_info=True)
             raise
 
+    async def search_batch(
+        self,
+        query_vectors: List[VectorLike],
+        top_k: int = 10,
+        collection: Optional[str] = None,
+        filter: Optional[FilterLike] = None,
+        with_vectors: bool = False,
+        with_payload: bool = True,
+    ) -> List[List[SearchResult]]:
+        """
+        Пакетный поиск похожих векторов одним запросом к Qdrant
+
+        Args:
+            query_vectors: Векторы запросов
+            top_k: Количество результатов на каждый запрос
+            collection: Название коллекции
+            filter: Фильтр по метаданным (общий для всех запросов)
+            with_vectors: Возвращать векторы найденных точек
+            with_payload: Возвращать payload найденных точек
+
+        Returns:
+            Списки результатов поиска в порядке векторов запросов
+        """
+        collection_name = collection or self.collection_name
+
+        for query_vector in query_vectors:
+            if len(query_vector) != self.vector_size:
+                raise ValueError(
+                    f"Размер вектора запроса ({len(query_vector)}) не совпадает "
+                    f"с размером векторов коллекции ({self.vector_size})"
+                )
+
+        if not query_vectors:
+            return []
+
+        try:
+            qdrant_filter = self._build_filter(filter)
+            batch_results = self.client.search_batch(
+                collection_name=collection_name,
+                requests=[
+                    SearchRequest(
+                        vector=list(query_vector),
+                        limit=top_k,
+                        filter=qdrant_filter,
+                        with_payload=with_payload,
+                        with_vector=with_vectors,
+                    )
+                    for query_vector in query_vectors
+                ],
+            )
+
+            logger.debug("Выполнен пакетный поиск по %d запросам", len(query_vectors))
+            return [self._to_search_results(results) for results in batch_results]
+        except Exception as e:
+            logger.error(f"Ошибка при пакетном поиске векторов: {e}", exc_info=True)
+            raise
+
+    async def iter_vectors(
+        self,
+        collection: Optional[str] = None,
+        batch_size: int = 256,
+    ) -> AsyncIterator[List[Vector]]:
+        """
+        Постраничное чтение всех точек коллекции через scroll
+
+        Args:
+            collection: Название коллекции (None - коллекция адаптера)
+            batch_size: Количество точек в одной странице
+
+        Yields:
+            Страницы векторов с payload
+        """
+        collection_name = collection or self.collection_name
+        offset = None
+
+        while True:
+            points, offset = await asyncio.to_thread(
+                self.client.scroll,
+                collection_name=collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+            if points:
+                yield [
+                    Vector(id=str(point.id), vector=point.vector, metadata=point.payload or {})
+                    for point in points
+                ]
+            if offset is None:
+                break
+
+    async def create_payload_index(
+        self,
+        collection: Optional[str],
+        field: str,
+        schema: str = "keyword",
+    ) -> None:
+        """
+        Создание payload-индекса Qdrant по полю метаданных
+
+        Args:
+            collection: Название коллекции (None - коллекция адаптера)
+            field: Поле метаданных
+            schema: Тип индекса ("keyword", "integer", "float", "bool" и т.д.)
+        """
+        collection_name = collection or self.collection_name
+
+        try:
+            self.client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field,
+                field_schema=PayloadSchemaType(schema),
+            )
+            logger.info(f"Создан payload-индекс {field} ({schema}) в коллекции {collection_name}")
+        except Exception as e:
+            logger.error(f"Ошибка при создании payload-индекса: {e}", exc_info=True)
+            raise
+
+    @classmethod
+    def _build_filter(cls, filter: Optional[FilterLike]) -> Optional["Filter"]:
+        """Построение фильтра Qdrant (применяется во время поиска по индексу)"""
+        spec = normalize_filter(filter)
+        if spec is None:
+            return None
+
+        condition = cls._to_condition(spec)
+        return condition if isinstance(condition, Filter) else Filter(must=[condition])
+
+    @classmethod
+    def _to_condition(cls, spec: MetadataFilter):
+        """Трансляция типизированного фильтра в условие Qdrant"""
+        if isinstance(spec, Eq):
+            return FieldCondition(key=spec.field, match=MatchValue(value=spec.value))
+        if isinstance(spec, In):
+            return FieldCondition(key=spec.field, match=MatchAny(any=list(spec.values)))
+        if isinstance(spec, Range):
+            return FieldCondition(
+                key=spec.field,
+                range=QdrantRange(gt=spec.gt, gte=spec.gte, lt=spec.lt, lte=spec.lte),
+            )
+        if isinstance(spec, And):
+            return Filter(must=[cls._to_condition(f) for f in spec.filters])
+        if isinstance(spec, Or):
+            return Filter(should=[cls._to_condition(f) for f in spec.filters])
+        raise ValueError(f"Неподдерживаемый фильтр: {spec!r}")
+
+    @staticmethod
+    def _to_search_results(points) -> List[SearchResult]:
+        """Преобразование точек Qdrant в результаты поиска"""
+        return [
+            SearchResult(
+                id=str(point.id),
+                score=point.score,
+                vector=to_float32(point.vector) if point.vector is not None else None,
+                metadata=point.payload or {},
+            )
+            for point in points
+        ]
+
     async def delete(self, ids: List[str], collection: Optional[str] = None) -> None:
         """
         Удаление векторов по ID
@@ -194,7 +382,7 @@ class QdrantAdapter(AbstractVectorStore):
                 collection_name=collection_name,
                 points_selector=ids,
             )
-            logger.debug(f"Удалено {len(ids)} векторов из коллекции {collection_name}")
+            logger.debug("Удалено %d векторов из коллекции %s", len(ids), collection_name)
         except Exception as e:
             logger.error(f"Ошибка при удалении векторов: {e}", exc_info=True)
             raise
@@ -203,6 +391,12 @@ class QdrantAdapter(AbstractVectorStore):
         self,
         name: str,
         dimension: int,
+        *,
+        distance: str = "cosine",
+        quantization: Optional[Quantization] = None,
+        on_disk: bool = False,
+        hnsw_m: int = 16,
+        hnsw_ef_construct: int = 128,
         **kwargs
     ) -> None:
         """
@@ -211,17 +405,50 @@ class QdrantAdapter(AbstractVectorStore):
         Args:
             name: Название коллекции
             dimension: Размерность векторов
+            distance: Метрика расстояния ("cosine", "dot", "euclid")
+            quantization: Квантование векторов ("scalar_int8", "binary" или None)
+            on_disk: Хранить исходные векторы на диске
+                (квантованные векторы при этом остаются в RAM)
+            hnsw_m: Параметр M графа HNSW
+            hnsw_ef_construct: Параметр ef_construct графа HNSW
             **kwargs: Дополнительные параметры
+
+        Raises:
+            ValueError: Если метрика или режим квантования не поддерживаются
         """
+        distances = {
+            "cosine": Distance.COSINE,
+            "dot": Distance.DOT,
+            "euclid": Distance.EUCLID,
+        }
+        if distance not in distances:
+            raise ValueError(f"Неподдерживаемая метрика расстояния: {distance}")
+
+        if quantization in (None, "none"):
+            quantization_config = None
+        elif quantization == "scalar_int8":
+            quantization_config = ScalarQuantization(
+                scalar=ScalarQuantizationConfig(type=ScalarType.INT8, always_ram=True)
+            )
+        elif quantization == "binary":
+            quantization_config = BinaryQuantization(
+                binary=BinaryQuantizationConfig(always_ram=True)
+            )
+        else:
+            raise ValueError(f"Неподдерживаемый режим квантования: {quantization}")
+
         try:
             self.client.create_collection(
                 collection_name=name,
-                vectors_config={
-                    "size": dimension,
-                    "distance": Distance.COSINE,
-                },
+                vectors_config=VectorParams(
+                    size=dimension,
+                    distance=distances[distance],
+                    on_disk=on_disk,
+                ),
+                hnsw_config=HnswConfigDiff(m=hnsw_m, ef_construct=hnsw_ef_construct),
+                quantization_config=quantization_config,
             )
-            logger.info(f"Создана коллекция {name}")
+            logger.info(f"Создана коллекция {name} (квантование: {quantization or 'none'})")
         except Exception as e:
             logger.error(f"Ошибка при создании коллекции: {e}", exc_info=True)
             raise
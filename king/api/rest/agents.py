@@ -5,7 +5,7 @@ REST API endpoints для управления агентами
 import logging
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 
 from king.api.rest.schemas import AgentCreate, AgentResponse
 from king.core.domain import AgentStatus, AgentType
@@ -120,6 +120,7 @@ async def get_agent(
 
 @router.get("", response_model=List[AgentResponse])
 async def list_agents(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     orchestrator: AgentOrchestrator = Depends(get_agent_orchestrator),
@@ -127,7 +128,10 @@ async def list_agents(
     """
     Получение списка агентов
 
+    Приблизительное общее количество возвращается в заголовке X-Total-Count-Approx.
+
     Args:
+        response: HTTP ответ (для заголовков)
         skip: Количество пропущенных записей
         limit: Максимальное количество записей
         orchestrator: Оркестратор агентов
@@ -136,6 +140,7 @@ async def list_agents(
         Список агентов
     """
     agents = await orchestrator.get_all_agents(skip=skip, limit=limit)
+    response.headers["X-Total-Count-Approx"] = str(await orchestrator.estimated_agent_count())
 
     return [
         AgentResponse(
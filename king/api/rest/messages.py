@@ -5,7 +5,7 @@ REST API endpoints для работы с сообщениями
 import logging
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 
 from king.api.rest.schemas import ConversationResponse, MessageCreate, MessageResponse
 from king.core.services.message_processor import MessageProcessor
@@ -131,6 +131,7 @@ async def get_conversation(
 
 @router.get("/conversations", response_model=List[ConversationResponse])
 async def list_conversations(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     processor: MessageProcessor = Depends(get_message_processor),
@@ -138,7 +139,10 @@ async def list_conversations(
     """
     Получение списка диалогов
 
+    Приблизительное общее количество возвращается в заголовке X-Total-Count-Approx.
+
     Args:
+        response: HTTP ответ (для заголовков)
         skip: Количество пропущенных записей
         limit: Максимальное количество записей
         processor: Процессор сообщений
@@ -147,6 +151,9 @@ async def list_conversations(
         Список диалогов
     """
     conversations = await processor.get_all_conversations(skip=skip, limit=limit)
+    response.headers["X-Total-Count-Approx"] = str(
+        await processor.estimated_conversation_count()
+    )
 
     return [
         ConversationResponse(
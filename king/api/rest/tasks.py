@@ -5,9 +5,10 @@ REST API endpoints для управления задачами
 import logging
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 
 from king.api.rest.schemas import TaskCreate, TaskResponse
+from king.core.domain.task import TaskType
 from king.core.services.task_scheduler import TaskScheduler
 
 logger = logging.getLogger(__name__)
@@ -16,7 +17,7 @@ router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
 # Dependency для получения TaskScheduler
-from king.infrastructure.dependencies import get_task_scheduler
+from king.infrastructure.dependencies import get_task_repository, get_task_scheduler
 
 
 @router.post("", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
@@ -35,13 +36,15 @@ async def create_task(
         Созданная задача
     """
     # Валидация типа задачи
-    from king.core.domain.task import TaskType
     try:
-        task_type_enum = TaskType(task_data.type)
+        task_type_enum = TaskType.parse(task_data.type)
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Неверный тип задачи: {task_data.type}. Доступные типы: {[t.value for t in TaskType]}",
+            detail=(
+                f"Неверный тип задачи: {task_data.type}. "
+                f"Доступные типы: {[str(t) for t in TaskType]}"
+            ),
         )
     
     # Валидация payload
@@ -68,8 +71,8 @@ async def create_task(
 
         return TaskResponse(
             id=task.id,
-            type=task.type.value,
-            status=task.status.value,
+            type=str(task.type),
+            status=str(task.status),
             payload=task.payload,
             assigned_agent=task.assigned_agent,
             result=task.result,
@@ -119,8 +122,8 @@ async def get_task(
 
     return TaskResponse(
         id=task.id,
-        type=task.type.value,
-        status=task.status.value,
+        type=str(task.type),
+        status=str(task.status),
         payload=task.payload,
         assigned_agent=task.assigned_agent,
         result=task.result,
@@ -135,6 +138,7 @@ async def get_task(
 
 @router.get("", response_model=List[TaskResponse])
 async def list_tasks(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     status: str = None,
@@ -143,7 +147,11 @@ async def list_tasks(
     """
     Получение списка задач
 
+    Без фильтра по статусу приблизительное общее количество возвращается
+    в заголовке X-Total-Count-Approx.
+
     Args:
+        response: HTTP ответ (для заголовков)
         skip: Количество пропущенных записей
         limit: Максимальное количество записей
         status: Фильтр по статусу (опционально)
@@ -156,15 +164,15 @@ async def list_tasks(
         tasks = await scheduler.get_tasks_by_status(status)
     else:
         # Получаем все задачи через репозиторий
-        from king.infrastructure.dependencies import get_task_repository
         task_repo = get_task_repository()
         tasks = await task_repo.get_all(skip=skip, limit=limit)
+        response.headers["X-Total-Count-Approx"] = str(await task_repo.estimated_count())
 
     return [
         TaskResponse(
             id=task.id,
-            type=task.type.value,
-            status=task.status.value,
+            type=str(task.type),
+            status=str(task.status),
             payload=task.payload,
             assigned_agent=task.assigned_agent,
             result=task.result,
@@ -204,8 +212,8 @@ async def schedule_task(
 
         return TaskResponse(
             id=task.id,
-            type=task.type.value,
-            status=task.status.value,
+            type=str(task.type),
+            status=str(task.status),
             payload=task.payload,
             assigned_agent=task.assigned_agent,
             result=task.result,
@@ -47,7 +47,8 @@ __all__ = [
     # Event Infrastructure
     "EventBus",
     "EventDispatcher",
+    "SubscriptionToken",
 ]
 
 # Импорт Event Bus после определения событий
-from king.core.domain.event_bus import EventBus, EventDispatcher
+from king.core.domain.event_bus import EventBus, EventDispatcher, SubscriptionToken
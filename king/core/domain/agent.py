@@ -20,6 +20,10 @@ class AgentStatus(str, Enum):
     STOPPED = "stopped"
 
 
+# Статусы, в которых агент может принимать задачи
+AVAILABLE_STATUSES = frozenset({AgentStatus.ACTIVE, AgentStatus.IDLE})
+
+
 class AgentType(str, Enum):
     """Типы агентов"""
 
@@ -30,7 +34,7 @@ class AgentType(str, Enum):
     MULTIMODAL = "multimodal"
 
 
-@dataclass
+@dataclass(slots=True)
 class Agent:
     """
     Доменная модель агента
@@ -105,7 +109,7 @@ class Agent:
         Returns:
             True если агент доступен, False иначе
         """
-        return self.status in [AgentStatus.ACTIVE, AgentStatus.IDLE]
+        return self.status in AVAILABLE_STATUSES
 
     def to_dict(self) -> Dict[str, Any]:
         """Преобразование агента в словарь"""
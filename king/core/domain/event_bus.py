@@ -4,14 +4,19 @@ Event Bus для доменных событий
 """
 
 import asyncio
+import itertools
 import logging
+import sys
 from collections import defaultdict
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, List, NewType, Optional, Tuple
 
 from king.core.domain.events import DomainEvent
 
 logger = logging.getLogger(__name__)
 
+# Непрозрачный идентификатор подписки, возвращаемый subscribe()
+SubscriptionToken = NewType("SubscriptionToken", int)
+
 
 class EventBus:
     """
@@ -20,8 +25,12 @@ class EventBus:
 
     def __init__(self):
         """Инициализация Event Bus"""
-        self._handlers: Dict[str, List[Callable]] = defaultdict(list)
-        self._async_handlers: Dict[str, List[Callable]] = defaultdict(list)
+        # event_type -> {token -> handler}
+        self._handlers: Dict[str, Dict[int, Callable]] = defaultdict(dict)
+        self._async_handlers: Dict[str, Dict[int, Callable]] = defaultdict(dict)
+        # token -> (event_type, async_processing) для отписки за O(1)
+        self._subscriptions: Dict[int, Tuple[str, bool]] = {}
+        self._token_counter = itertools.count(1)
         self._event_queue: asyncio.Queue = asyncio.Queue()
         self._processing = False
         self._processing_task: Optional[asyncio.Task] = None
@@ -35,9 +44,10 @@ class EventBus:
         """
         event_type = event.event_type
 
-        # Синхронная обработка
-        if event_type in self._handlers:
-            for handler in self._handlers[event_type]:
+        # Синхронная обработка (копия - обработчик может отписаться во время вызова)
+        handlers = self._handlers.get(event_type)
+        if handlers:
+            for handler in tuple(handlers.values()):
                 try:
                     if asyncio.iscoroutinefunction(handler):
                         await handler(event)
@@ -50,9 +60,19 @@ class EventBus:
         if event_type in self._async_handlers:
             await self._event_queue.put(event)
 
+    async def publish_many(self, events: List[DomainEvent]) -> None:
+        """
+        Публикация нескольких событий в порядке списка
+
+        Args:
+            events: Доменные события
+        """
+        for event in events:
+            await self.publish(event)
+
     async def subscribe(
         self, event_type: str, handler: Callable, async_processing: bool = False
-    ) -> None:
+    ) -> SubscriptionToken:
         """
         Подписка на тип событий
 
@@ -60,33 +80,48 @@ class EventBus:
             event_type: Тип события (имя класса события)
             handler: Функция-обработчик
             async_processing: Если True, обработка через очередь
+
+        Returns:
+            Токен подписки для unsubscribe()
         """
+        event_type = sys.intern(event_type)
+        token = SubscriptionToken(next(self._token_counter))
+        self._subscriptions[token] = (event_type, async_processing)
+
         if async_processing:
-            self._async_handlers[event_type].append(handler)
+            self._async_handlers[event_type][token] = handler
             logger.info(f"Добавлен асинхронный обработчик для {event_type}")
         else:
-            self._handlers[event_type].append(handler)
+            self._handlers[event_type][token] = handler
             logger.info(f"Добавлен синхронный обработчик для {event_type}")
 
         # Запуск обработки очереди, если еще не запущена
         if async_processing and not self._processing:
             self._processing_task = asyncio.create_task(self._process_event_queue())
 
-    async def unsubscribe(self, event_type: str, handler: Callable) -> None:
+        return token
+
+    async def unsubscribe(self, token: SubscriptionToken) -> None:
         """
-        Отписка от типа событий
+        Отписка по токену подписки
 
         Args:
-            event_type: Тип события
-            handler: Функция-обработчик для удаления
+            token: Токен, возвращенный subscribe()
         """
-        if handler in self._handlers[event_type]:
-            self._handlers[event_type].remove(handler)
-            logger.info(f"Удален синхронный обработчик для {event_type}")
+        subscription = self._subscriptions.pop(token, None)
+        if subscription is None:
+            return
 
-        if handler in self._async_handlers[event_type]:
-            self._async_handlers[event_type].remove(handler)
-            logger.info(f"Удален асинхронный обработчик для {event_type}")
+        event_type, async_processing = subscription
+        table = self._async_handlers if async_processing else self._handlers
+        handlers = table[event_type]
+        del handlers[token]
+        if not handlers:
+            # Пустые корзины не оставляем, чтобы publish не ставил события в очередь зря
+            del table[event_type]
+
+        kind = "асинхронный" if async_processing else "синхронный"
+        logger.info(f"Удален {kind} обработчик для {event_type}")
 
     async def _process_event_queue(self) -> None:
         """Обработка очереди событий"""
@@ -98,8 +133,9 @@ class EventBus:
                 event = await self._event_queue.get()
 
                 event_type = event.event_type
-                if event_type in self._async_handlers:
-                    for handler in self._async_handlers[event_type]:
+                handlers = self._async_handlers.get(event_type)
+                if handlers:
+                    for handler in tuple(handlers.values()):
                         try:
                             if asyncio.iscoroutinefunction(handler):
                                 await handler(event)
@@ -178,7 +214,9 @@ class EventDispatcher:
 
     def __init__(self):
         """Инициализация диспетчера"""
-        self._handlers: Dict[str, List[Callable]] = defaultdict(list)
+        self._handlers: Dict[str, Dict[int, Callable]] = defaultdict(dict)
+        self._subscriptions: Dict[int, str] = {}
+        self._token_counter = itertools.count(1)
 
     def publish(self, event: DomainEvent) -> None:
         """
@@ -189,33 +227,46 @@ class EventDispatcher:
         """
         event_type = event.event_type
 
-        if event_type in self._handlers:
-            for handler in self._handlers[event_type]:
+        handlers = self._handlers.get(event_type)
+        if handlers:
+            for handler in tuple(handlers.values()):
                 try:
                     handler(event)
                 except Exception as e:
                     logger.error(f"Ошибка в обработчике события {event_type}: {e}", exc_info=True)
 
-    def subscribe(self, event_type: str, handler: Callable) -> None:
+    def subscribe(self, event_type: str, handler: Callable) -> SubscriptionToken:
         """
         Подписка на тип событий
 
         Args:
             event_type: Тип события
             handler: Функция-обработчик
+
+        Returns:
+            Токен подписки для unsubscribe()
         """
-        self._handlers[event_type].append(handler)
+        event_type = sys.intern(event_type)
+        token = SubscriptionToken(next(self._token_counter))
+        self._subscriptions[token] = event_type
+        self._handlers[event_type][token] = handler
         logger.info(f"Добавлен обработчик для {event_type}")
+        return token
 
-    def unsubscribe(self, event_type: str, handler: Callable) -> None:
+    def unsubscribe(self, token: SubscriptionToken) -> None:
         """
-        Отписка от типа событий
+        Отписка по токену подписки
 
         Args:
-            event_type: Тип события
-            handler: Функция-обработчик для удаления
+            token: Токен, возвращенный subscribe()
         """
-        if handler in self._handlers[event_type]:
-            self._handlers[event_type].remove(handler)
-            logger.info(f"Удален обработчик для {event_type}")
+        event_type = self._subscriptions.pop(token, None)
+        if event_type is None:
+            return
+
+        handlers = self._handlers[event_type]
+        del handlers[token]
+        if not handlers:
+            del self._handlers[event_type]
+        logger.info(f"Удален обработчик для {event_type}")
 
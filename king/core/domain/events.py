@@ -8,7 +8,7 @@ from typing import Any, Dict, Optional
 from uuid import uuid4
 
 
-@dataclass
+@dataclass(kw_only=True)
 class DomainEvent:
     """
     Базовый класс для всех доменных событий
@@ -17,7 +17,6 @@ class DomainEvent:
     event_id: str = field(default_factory=lambda: str(uuid4()))
     event_type: str = field(init=False)
     occurred_at: datetime = field(default_factory=datetime.utcnow)
-    aggregate_id: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
 
     def __post_init__(self):
@@ -26,6 +25,11 @@ class DomainEvent:
             self.event_type = self.__class__.__name__
             self._event_type_set = True
 
+    @property
+    def aggregate_id(self) -> Optional[str]:
+        """ID агрегата, к которому относится событие"""
+        return None
+
     def to_dict(self) -> Dict[str, Any]:
         """Преобразование события в словарь"""
         return {
@@ -46,16 +50,20 @@ class AgentCreated(DomainEvent):
     agent_type: str
     capabilities: Dict[str, Any] = field(default_factory=dict)
 
+    @property
+    def aggregate_id(self) -> str:
+        return self.agent_id
+
     def __post_init__(self):
         super().__post_init__()
-        self.aggregate_id = self.agent_id
-        self.metadata.update(
-            {
-                "agent_name": self.agent_name,
-                "agent_type": self.agent_type,
-                "capabilities": self.capabilities,
-            }
-        )
+        # Метаданные собираются одним литералом (без update и роста словаря);
+        # поля события перекрывают переданные значения, как и раньше
+        self.metadata = {
+            **self.metadata,
+            "agent_name": self.agent_name,
+            "agent_type": self.agent_type,
+            "capabilities": self.capabilities,
+        }
 
 
 @dataclass
@@ -67,16 +75,18 @@ class AgentStatusChanged(DomainEvent):
     new_status: str
     reason: Optional[str] = None
 
+    @property
+    def aggregate_id(self) -> str:
+        return self.agent_id
+
     def __post_init__(self):
         super().__post_init__()
-        self.aggregate_id = self.agent_id
-        self.metadata.update(
-            {
-                "old_status": self.old_status,
-                "new_status": self.new_status,
-                "reason": self.reason,
-            }
-        )
+        self.metadata = {
+            **self.metadata,
+            "old_status": self.old_status,
+            "new_status": self.new_status,
+            "reason": self.reason,
+        }
 
 
 @dataclass
@@ -88,16 +98,18 @@ class LLMRequestInitiated(DomainEvent):
     model: Optional[str] = None
     parameters: Dict[str, Any] = field(default_factory=dict)
 
+    @property
+    def aggregate_id(self) -> str:
+        return self.request_id
+
     def __post_init__(self):
         super().__post_init__()
-        self.aggregate_id = self.request_id
-        self.metadata.update(
-            {
-                "prompt": self.prompt,
-                "model": self.model,
-                "parameters": self.parameters,
-            }
-        )
+        self.metadata = {
+            **self.metadata,
+            "prompt": self.prompt,
+            "model": self.model,
+            "parameters": self.parameters,
+        }
 
 
 @dataclass
@@ -109,16 +121,18 @@ class LLMResponseReceived(DomainEvent):
     tokens_used: Optional[int] = None
     model: Optional[str] = None
 
+    @property
+    def aggregate_id(self) -> str:
+        return self.request_id
+
     def __post_init__(self):
         super().__post_init__()
-        self.aggregate_id = self.request_id
-        self.metadata.update(
-            {
-                "response_content": self.response_content,
-                "tokens_used": self.tokens_used,
-                "model": self.model,
-            }
-        )
+        self.metadata = {
+            **self.metadata,
+            "response_content": self.response_content,
+            "tokens_used": self.tokens_used,
+            "model": self.model,
+        }
 
 
 @dataclass
@@ -129,15 +143,17 @@ class LLMErrorOccurred(DomainEvent):
     error_message: str
     error_type: Optional[str] = None
 
+    @property
+    def aggregate_id(self) -> str:
+        return self.request_id
+
     def __post_init__(self):
         super().__post_init__()
-        self.aggregate_id = self.request_id
-        self.metadata.update(
-            {
-                "error_message": self.error_message,
-                "error_type": self.error_type,
-            }
-        )
+        self.metadata = {
+            **self.metadata,
+            "error_message": self.error_message,
+            "error_type": self.error_type,
+        }
 
 
 @dataclass
@@ -148,15 +164,17 @@ class TaskCreated(DomainEvent):
     task_type: str
     payload: Dict[str, Any] = field(default_factory=dict)
 
+    @property
+    def aggregate_id(self) -> str:
+        return self.task_id
+
     def __post_init__(self):
         super().__post_init__()
-        self.aggregate_id = self.task_id
-        self.metadata.update(
-            {
-                "task_type": self.task_type,
-                "payload": self.payload,
-            }
-        )
+        self.metadata = {
+            **self.metadata,
+            "task_type": self.task_type,
+            "payload": self.payload,
+        }
 
 
 @dataclass
@@ -166,10 +184,13 @@ class TaskAssigned(DomainEvent):
     task_id: str
     agent_id: str
 
+    @property
+    def aggregate_id(self) -> str:
+        return self.task_id
+
     def __post_init__(self):
         super().__post_init__()
-        self.aggregate_id = self.task_id
-        self.metadata.update({"agent_id": self.agent_id})
+        self.metadata = {**self.metadata, "agent_id": self.agent_id}
 
 
 @dataclass
@@ -179,10 +200,13 @@ class TaskCompleted(DomainEvent):
     task_id: str
     result: Dict[str, Any] = field(default_factory=dict)
 
+    @property
+    def aggregate_id(self) -> str:
+        return self.task_id
+
     def __post_init__(self):
         super().__post_init__()
-        self.aggregate_id = self.task_id
-        self.metadata.update({"result": self.result})
+        self.metadata = {**self.metadata, "result": self.result}
 
 
 @dataclass
@@ -193,15 +217,17 @@ class TaskFailed(DomainEvent):
     error_message: str
     error_type: Optional[str] = None
 
+    @property
+    def aggregate_id(self) -> str:
+        return self.task_id
+
     def __post_init__(self):
         super().__post_init__()
-        self.aggregate_id = self.task_id
-        self.metadata.update(
-            {
-                "error_message": self.error_message,
-                "error_type": self.error_type,
-            }
-        )
+        self.metadata = {
+            **self.metadata,
+            "error_message": self.error_message,
+            "error_type": self.error_type,
+        }
 
 
 @dataclass
@@ -213,16 +239,18 @@ class MessageReceived(DomainEvent):
     content: str
     conversation_id: Optional[str] = None
 
+    @property
+    def aggregate_id(self) -> str:
+        return self.message_id
+
     def __post_init__(self):
         super().__post_init__()
-        self.aggregate_id = self.message_id
-        self.metadata.update(
-            {
-                "role": self.role,
-                "content": self.content,
-                "conversation_id": self.conversation_id,
-            }
-        )
+        self.metadata = {
+            **self.metadata,
+            "role": self.role,
+            "content": self.content,
+            "conversation_id": self.conversation_id,
+        }
 
 
 @dataclass
@@ -232,8 +260,11 @@ class MessageProcessed(DomainEvent):
     message_id: str
     response: Optional[str] = None
 
+    @property
+    def aggregate_id(self) -> str:
+        return self.message_id
+
     def __post_init__(self):
         super().__post_init__()
-        self.aggregate_id = self.message_id
-        self.metadata.update({"response": self.response})
+        self.metadata = {**self.metadata, "response": self.response}
 
@@ -8,7 +8,7 @@ from typing import List, Optional
 from uuid import uuid4
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """
     Доменная модель сообщения
@@ -50,7 +50,7 @@ class Message:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Conversation:
     """
     Доменная модель диалога
@@ -4,33 +4,78 @@
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from enum import Enum
+from enum import IntEnum
 from typing import Any, Dict, Optional
 from uuid import uuid4
 
 
-class TaskStatus(str, Enum):
-    """Статусы задачи"""
+class TaskStatus(IntEnum):
+    """
+    Статусы задачи
+
+    Внутри домена статус - целое число (сравнения в FSM задачи без строк),
+    при сериализации отображается в строку через таблицу _STATUS_STR.
+    """
+
+    CREATED = 0
+    ASSIGNED = 1
+    IN_PROGRESS = 2
+    COMPLETED = 3
+    FAILED = 4
+    CANCELLED = 5
+
+    def __str__(self) -> str:
+        return _STATUS_STR[self]
+
+    @classmethod
+    def parse(cls, value: str) -> "TaskStatus":
+        """
+        Получение статуса по строковому значению
+
+        Raises:
+            ValueError: Если статус неизвестен
+        """
+        try:
+            return _STATUS_IDX[value]
+        except KeyError:
+            raise ValueError(f"Неизвестный статус задачи: {value}") from None
 
-    CREATED = "created"
-    ASSIGNED = "assigned"
-    IN_PROGRESS = "in_progress"
-    COMPLETED = "completed"
-    FAILED = "failed"
-    CANCELLED = "cancelled"
 
+_STATUS_STR = ("created", "assigned", "in_progress", "completed", "failed", "cancelled")
+_STATUS_IDX = {name: TaskStatus(i) for i, name in enumerate(_STATUS_STR)}
+
+
+class TaskType(IntEnum):
+    """Типы задач (сериализуются в строку через таблицу _TYPE_STR)"""
+
+    LLM_GENERATION = 0
+    RAG_QUERY = 1
+    DATA_PROCESSING = 2
+    MULTIMODAL = 3
+    CUSTOM = 4
+
+    def __str__(self) -> str:
+        return _TYPE_STR[self]
+
+    @classmethod
+    def parse(cls, value: str) -> "TaskType":
+        """
+        Получение типа задачи по строковому значению
+
+        Raises:
+            ValueError: Если тип неизвестен
+        """
+        try:
+            return _TYPE_IDX[value]
+        except KeyError:
+            raise ValueError(f"Неизвестный тип задачи: {value}") from None
 
-class TaskType(str, Enum):
-    """Типы задач"""
 
-    LLM_GENERATION = "llm_generation"
-    RAG_QUERY = "rag_query"
-    DATA_PROCESSING = "data_processing"
-    MULTIMODAL = "multimodal"
-    CUSTOM = "custom"
+_TYPE_STR = ("llm_generation", "rag_query", "data_processing", "multimodal", "custom")
+_TYPE_IDX = {name: TaskType(i) for i, name in enumerate(_TYPE_STR)}
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """
     Доменная модель задачи
@@ -117,8 +162,8 @@ class Task:
         """Преобразование задачи в словарь"""
         return {
             "id": self.id,
-            "type": self.type.value,
-            "status": self.status.value,
+            "type": _TYPE_STR[self.type],
+            "status": _STATUS_STR[self.status],
             "payload": self.payload,
             "assigned_agent": self.assigned_agent,
             "result": self.result,
@@ -143,8 +188,8 @@ class Task:
 
         return cls(
             id=data.get("id", str(uuid4())),
-            type=TaskType(data.get("type", TaskType.CUSTOM.value)),
-            status=TaskStatus(data.get("status", TaskStatus.CREATED.value)),
+            type=TaskType.parse(data["type"]) if "type" in data else TaskType.CUSTOM,
+            status=TaskStatus.parse(data["status"]) if "status" in data else TaskStatus.CREATED,
             payload=data.get("payload", {}),
             assigned_agent=data.get("assigned_agent"),
             result=data.get("result"),
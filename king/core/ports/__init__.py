@@ -4,13 +4,31 @@
 
 from king.core.ports.config import AbstractConfigProvider
 from king.core.ports.llm import AbstractLLMClient, LLMResponse, Message
-from king.core.ports.messaging import AbstractEventBus, AbstractMessageQueue, Event
+from king.core.ports.messaging import (
+    AbstractEventBus,
+    AbstractMessageQueue,
+    Event,
+    SubscriptionToken,
+)
+from king.core.ports.pool import AbstractPool
 from king.core.ports.repositories import (
     IAgentRepository,
     IMessageRepository,
     ITaskRepository,
 )
-from king.core.ports.vector_store import AbstractVectorStore, SearchResult, Vector
+from king.core.ports.vector_store import (
+    AbstractVectorStore,
+    And,
+    Eq,
+    FilterLike,
+    In,
+    MetadataFilter,
+    Or,
+    Range,
+    SearchResult,
+    Vector,
+    VectorLike,
+)
 
 __all__ = [
     # Config
@@ -23,7 +41,9 @@ __all__ = [
     "AbstractMessageQueue",
     "AbstractEventBus",
     "Event",
+    "SubscriptionToken",
     # Repositories
+    "AbstractPool",
     "IAgentRepository",
     "ITaskRepository",
     "IMessageRepository",
@@ -31,4 +51,12 @@ __all__ = [
     "AbstractVectorStore",
     "Vector",
     "SearchResult",
+    "VectorLike",
+    "MetadataFilter",
+    "FilterLike",
+    "Eq",
+    "In",
+    "Range",
+    "And",
+    "Or",
 ]
@@ -3,7 +3,7 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 
 
 class AbstractConfigProvider(ABC):
@@ -69,4 +69,34 @@ class AbstractConfigProvider(ABC):
             Целочисленное значение
         """
         pass
-
+    
+    def compile_schema(self, schema: Dict[str, type]) -> None:
+        """
+        Предварительная материализация типизированных значений по схеме
+        
+        После компиляции get_bool/get_int/get_typed для ключей схемы
+        сводятся к одному обращению к словарю без разбора строк.
+        
+        Args:
+            schema: Словарь "ключ -> тип" (str, int, bool, float)
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} не поддерживает компиляцию схемы конфигурации"
+        )
+    
+    def get_typed(self, key: str) -> Any:
+        """
+        Получение типизированного значения, материализованного compile_schema
+        
+        Args:
+            key: Ключ конфигурации из схемы
+        
+        Returns:
+            Типизированное значение
+        
+        Raises:
+            KeyError: Если ключ не входит в скомпилированную схему
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} не поддерживает компиляцию схемы конфигурации"
+        )
@@ -86,6 +86,29 @@ class AbstractLLMClient(ABC):
         """
         pass
     
+    @abstractmethod
+    async def get_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Получение embeddings для пачки текстов одним запросом к провайдеру
+        
+        Args:
+            texts: Тексты для векторизации
+        
+        Returns:
+            Векторы embeddings в порядке входных текстов
+        """
+        pass
+    
+    async def prepare(self) -> None:
+        """
+        Подготовка клиента к генерации (получение токена, прогрев соединения)
+        
+        Вызывается перед generate конкурентно с подготовкой промпта, чтобы
+        сетевое ожидание не попадало на критический путь. Реализация по
+        умолчанию ничего не делает.
+        """
+        pass
+    
     def preprocess_context(self, context: List[Message]) -> str:
         """
         Предобработка контекста для включения в промпт
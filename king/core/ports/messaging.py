@@ -2,10 +2,13 @@
 Интерфейсы для messaging-систем (Kafka, RabbitMQ и т.д.)
 """
 
+import json
 from abc import ABC, abstractmethod
-from typing import Any, Callable, AsyncIterator, Optional
+from typing import Any, Callable, AsyncIterator, List, Optional, Tuple
 from dataclasses import dataclass
 
+from king.core.domain.event_bus import SubscriptionToken
+
 
 @dataclass
 class Event:
@@ -31,6 +34,34 @@ class AbstractMessageQueue(ABC):
             message: Данные сообщения (будут сериализованы в JSON)
         """
         pass
+
+    async def publish_raw(self, topic: str, payload: bytes) -> None:
+        """
+        Публикация уже сериализованного сообщения (JSON в UTF-8)
+        
+        Позволяет передать байты из event store без повторной сериализации.
+        Адаптеры переопределяют метод, чтобы отправлять payload как есть;
+        реализация по умолчанию декодирует payload и вызывает publish.
+        
+        Args:
+            topic: Название топика
+            payload: Сериализованное сообщение
+        """
+        await self.publish(topic, json.loads(payload))
+
+    async def publish_many(self, messages: List[Tuple[str, dict]]) -> None:
+        """
+        Публикация нескольких сообщений
+        
+        Адаптеры переопределяют метод, чтобы отправить сообщения одной пачкой
+        (например, один flush producer вместо ожидания каждого сообщения);
+        реализация по умолчанию публикует их по очереди.
+        
+        Args:
+            messages: Пары (топик, данные сообщения)
+        """
+        for topic, message in messages:
+            await self.publish(topic, message)
     
     @abstractmethod
     async def subscribe(
@@ -82,34 +113,59 @@ class AbstractEventBus(ABC):
             event: Доменное событие
         """
         pass
+
+    async def publish_many(self, events: List[Event]) -> None:
+        """
+        Публикация нескольких доменных событий
+        
+        Адаптеры брокеров переопределяют метод, чтобы отправить события
+        одной пачкой; реализация по умолчанию публикует их по очереди.
+        
+        Args:
+            events: Доменные события
+        """
+        for event in events:
+            await self.publish(event)
+
+    @abstractmethod
+    async def publish_raw(self, event_type: str, payload: bytes) -> None:
+        """
+        Публикация уже сериализованного доменного события
+        
+        Args:
+            event_type: Тип события
+            payload: Сериализованное событие (JSON в UTF-8)
+        """
+        pass
     
     @abstractmethod
     async def subscribe(
         self,
         event_type: str,
         handler: Callable[[Event], None]
-    ) -> None:
+    ) -> SubscriptionToken:
         """
         Подписка на тип событий
         
+        Реализации хранят обработчики в словаре
+        event_type -> {token -> handler}, поэтому отписка выполняется за O(1).
+        
         Args:
             event_type: Тип события (например, "agent.created")
             handler: Функция-обработчик события
+        
+        Returns:
+            Токен подписки для unsubscribe()
         """
         pass
     
     @abstractmethod
-    async def unsubscribe(
-        self,
-        event_type: str,
-        handler: Callable[[Event], None]
-    ) -> None:
+    async def unsubscribe(self, token: SubscriptionToken) -> None:
         """
-        Отписка от типа событий
+        Отписка по токену подписки
         
         Args:
-            event_type: Тип события
-            handler: Функция-обработчик для удаления
+            token: Токен, возвращенный subscribe()
         """
         pass
 
@@ -0,0 +1,79 @@
+"""
+Интерфейс пула соединений для адаптеров хранилищ
+"""
+
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+
+class AbstractPool(ABC):
+    """
+    Абстракция над асинхронным пулом соединений (asyncpg, SQLAlchemy и т.д.)
+
+    Адаптеры репозиториев получают пул в __init__ и выполняют каждый запрос
+    через `async with pool.acquire() as conn`, не открывая соединение на вызов.
+    """
+
+    def __init__(self, min_size: int = 1, max_size: int = 10, timeout: float = 30.0):
+        """
+        Инициализация пула
+
+        Args:
+            min_size: Минимальное количество открытых соединений
+            max_size: Максимальное количество соединений
+            timeout: Таймаут ожидания свободного соединения (секунды)
+        """
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(
+                f"Некорректные размеры пула: min_size={min_size}, max_size={max_size}"
+            )
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+
+    @abstractmethod
+    async def get_connection(self) -> Any:
+        """
+        Получение соединения из пула
+
+        Returns:
+            Соединение
+
+        Raises:
+            TimeoutError: Если свободное соединение не получено за timeout
+        """
+        pass
+
+    @abstractmethod
+    async def release(self, connection: Any) -> None:
+        """
+        Возврат соединения в пул
+
+        Реализации должны закрывать незавершенные курсоры/readers соединения
+        сразу, не дожидаясь сборщика мусора.
+
+        Args:
+            connection: Соединение, полученное через get_connection
+        """
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Закрытие всех соединений пула"""
+        pass
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Any]:
+        """
+        Получение соединения на время блока async with
+
+        Yields:
+            Соединение (возвращается в пул при выходе из блока)
+        """
+        connection = await self.get_connection()
+        try:
+            yield connection
+        finally:
+            await self.release(connection)
@@ -1,13 +1,50 @@
 """
 Интерфейсы репозиториев для доменных сущностей
+
+Адаптеры к БД получают AbstractPool (king.core.ports.pool) в __init__
+и выполняют каждый метод через `async with pool.acquire() as conn`.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
 
 from king.core.domain import Agent, Conversation, Message, Task
 
 
+def encode_cursor(ts: datetime, entity_id: str) -> str:
+    """
+    Кодирование курсора keyset-пагинации по ключу (время создания, id)
+
+    Args:
+        ts: Время создания последней записи страницы
+        entity_id: ID последней записи страницы
+
+    Returns:
+        Непрозрачная строка курсора
+    """
+    return f"{ts.isoformat()}|{entity_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Декодирование курсора keyset-пагинации
+
+    Args:
+        cursor: Строка курсора из encode_cursor
+
+    Returns:
+        Кортеж (время создания, id)
+
+    Raises:
+        ValueError: Если курсор некорректен
+    """
+    ts, sep, entity_id = cursor.partition("|")
+    if not sep:
+        raise ValueError(f"Некорректный курсор: {cursor}")
+    return datetime.fromisoformat(ts), entity_id
+
+
 class IAgentRepository(ABC):
     """Интерфейс репозитория для агентов"""
 
@@ -37,11 +74,45 @@ class IAgentRepository(ABC):
         """
         pass
 
+    async def create_many(self, agents: List[Agent]) -> List[Agent]:
+        """
+        Создание нескольких агентов
+
+        Реализации для СУБД переопределяют метод, чтобы выполнить вставку
+        одним запросом (executemany / COPY); реализация по умолчанию
+        вызывает create для каждого агента.
+
+        Args:
+            agents: Агенты для создания
+
+        Returns:
+            Созданные агенты в том же порядке
+        """
+        return [await self.create(agent) for agent in agents]
+
+    async def get_many(self, agent_ids: List[str]) -> List[Agent]:
+        """
+        Получение нескольких агентов по ID
+
+        Реализация по умолчанию вызывает get_by_id для каждого ID.
+
+        Args:
+            agent_ids: ID агентов
+
+        Returns:
+            Найденные агенты в порядке agent_ids (отсутствующие пропускаются)
+        """
+        agents = [await self.get_by_id(agent_id) for agent_id in agent_ids]
+        return [agent for agent in agents if agent is not None]
+
     @abstractmethod
     async def get_all(self, skip: int = 0, limit: int = 100) -> List[Agent]:
         """
         Получение всех агентов
 
+        Устарело: offset-пагинация сканирует пропущенные записи,
+        используйте list_after.
+
         Args:
             skip: Количество пропущенных записей
             limit: Максимальное количество записей
@@ -51,6 +122,22 @@ class IAgentRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def list_after(
+        self, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Agent], Optional[str]]:
+        """
+        Keyset-пагинация агентов в порядке (created_at, id)
+
+        Args:
+            cursor: Курсор предыдущей страницы (None - первая страница)
+            limit: Максимальное количество записей
+
+        Returns:
+            Кортеж (агенты, курсор следующей страницы или None)
+        """
+        pass
+
     @abstractmethod
     async def update(self, agent: Agent) -> Agent:
         """
@@ -100,6 +187,39 @@ class IAgentRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def find_available_with_capabilities(
+        self, required: List[str], limit: int = 1
+    ) -> List[Agent]:
+        """
+        Поиск доступных агентов, обладающих всеми требуемыми возможностями
+
+        Фильтр выполняется на стороне хранилища (в SQL - условие
+        capabilities @> :caps по GIN-индексу с LIMIT).
+
+        Args:
+            required: Требуемые возможности (пустой список - любой доступный агент)
+            limit: Максимальное количество агентов
+
+        Returns:
+            Список подходящих агентов (не более limit)
+        """
+        pass
+
+    @abstractmethod
+    async def estimated_count(self) -> int:
+        """
+        Приблизительное количество агентов (для метаданных пагинации)
+
+        Реализации не выполняют точный COUNT(*): для PostgreSQL - оценка
+        планировщика (pg_class.reltuples), точное значение кэшируется
+        только для небольших таблиц.
+
+        Returns:
+            Оценка количества записей
+        """
+        pass
+
 
 class ITaskRepository(ABC):
     """Интерфейс репозитория для задач"""
@@ -130,11 +250,45 @@ class ITaskRepository(ABC):
         """
         pass
 
+    async def create_many(self, tasks: List[Task]) -> List[Task]:
+        """
+        Создание нескольких задач
+
+        Реализации для СУБД переопределяют метод, чтобы выполнить вставку
+        одним запросом (executemany / COPY); реализация по умолчанию
+        вызывает create для каждой задачи.
+
+        Args:
+            tasks: Задачи для создания
+
+        Returns:
+            Созданные задачи в том же порядке
+        """
+        return [await self.create(task) for task in tasks]
+
+    async def get_many(self, task_ids: List[str]) -> List[Task]:
+        """
+        Получение нескольких задач по ID
+
+        Реализация по умолчанию вызывает get_by_id для каждого ID.
+
+        Args:
+            task_ids: ID задач
+
+        Returns:
+            Найденные задачи в порядке task_ids (отсутствующие пропускаются)
+        """
+        tasks = [await self.get_by_id(task_id) for task_id in task_ids]
+        return [task for task in tasks if task is not None]
+
     @abstractmethod
     async def get_all(self, skip: int = 0, limit: int = 100) -> List[Task]:
         """
         Получение всех задач
 
+        Устарело: offset-пагинация сканирует пропущенные записи,
+        используйте list_after.
+
         Args:
             skip: Количество пропущенных записей
             limit: Максимальное количество записей
@@ -144,6 +298,22 @@ class ITaskRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def list_after(
+        self, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Task], Optional[str]]:
+        """
+        Keyset-пагинация задач в порядке (created_at, id)
+
+        Args:
+            cursor: Курсор предыдущей страницы (None - первая страница)
+            limit: Максимальное количество записей
+
+        Returns:
+            Кортеж (задачи, курсор следующей страницы или None)
+        """
+        pass
+
     @abstractmethod
     async def update(self, task: Task) -> Task:
         """
@@ -157,6 +327,22 @@ class ITaskRepository(ABC):
         """
         pass
 
+    async def update_many(self, tasks: List[Task]) -> List[Task]:
+        """
+        Обновление нескольких задач
+
+        Реализации для СУБД переопределяют метод, чтобы выполнить
+        обновление одним запросом (UPDATE ... FROM VALUES / executemany);
+        реализация по умолчанию вызывает update для каждой задачи.
+
+        Args:
+            tasks: Задачи для обновления
+
+        Returns:
+            Обновленные задачи в том же порядке
+        """
+        return [await self.update(task) for task in tasks]
+
     @abstractmethod
     async def delete(self, task_id: str) -> bool:
         """
@@ -197,15 +383,32 @@ class ITaskRepository(ABC):
         pass
 
     @abstractmethod
-    async def get_pending(self) -> List[Task]:
+    async def get_pending(self, limit: Optional[int] = None) -> List[Task]:
         """
         Получение задач, ожидающих выполнения
 
+        Args:
+            limit: Максимальное количество задач (None - без ограничения)
+
         Returns:
             Список задач в статусе CREATED или ASSIGNED
         """
         pass
 
+    @abstractmethod
+    async def estimated_count(self) -> int:
+        """
+        Приблизительное количество задач (для метаданных пагинации)
+
+        Реализации не выполняют точный COUNT(*): для PostgreSQL - оценка
+        планировщика (pg_class.reltuples), точное значение кэшируется
+        только для небольших таблиц.
+
+        Returns:
+            Оценка количества записей
+        """
+        pass
+
 
 class IMessageRepository(ABC):
     """Интерфейс репозитория для сообщений и диалогов"""
@@ -223,6 +426,22 @@ class IMessageRepository(ABC):
         """
         pass
 
+    async def create_messages(self, messages: List[Message]) -> List[Message]:
+        """
+        Создание нескольких сообщений
+
+        Реализации для СУБД переопределяют метод, чтобы выполнить вставку
+        одним запросом; реализация по умолчанию вызывает create_message
+        для каждого сообщения.
+
+        Args:
+            messages: Сообщения для создания
+
+        Returns:
+            Созданные сообщения в том же порядке
+        """
+        return [await self.create_message(message) for message in messages]
+
     @abstractmethod
     async def get_message_by_id(self, message_id: str) -> Optional[Message]:
         """
@@ -269,6 +488,9 @@ class IMessageRepository(ABC):
         """
         Получение сообщений диалога
 
+        Устарело: offset-пагинация сканирует пропущенные записи,
+        используйте list_messages_after.
+
         Args:
             conversation_id: ID диалога
             skip: Количество пропущенных записей
@@ -280,12 +502,71 @@ class IMessageRepository(ABC):
         pass
 
     @abstractmethod
+    async def iter_conversation_messages(
+        self,
+        conversation_id: str,
+        *,
+        reverse: bool = True,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[Message]:
+        """
+        Потоковое чтение сообщений диалога без материализации списка
+
+        Реализации для БД используют серверный курсор.
+
+        Args:
+            conversation_id: ID диалога
+            reverse: Если True, от новых сообщений к старым
+            limit: Максимальное количество сообщений (None - без ограничения)
+
+        Yields:
+            Сообщения диалога
+        """
+        pass
+
+    @abstractmethod
+    async def list_messages_after(
+        self, conversation_id: str, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Message], Optional[str]]:
+        """
+        Keyset-пагинация сообщений диалога в порядке (timestamp, id)
+
+        Args:
+            conversation_id: ID диалога
+            cursor: Курсор предыдущей страницы (None - первая страница)
+            limit: Максимальное количество записей
+
+        Returns:
+            Кортеж (сообщения, курсор следующей страницы или None)
+        """
+        pass
+
+    @abstractmethod
+    async def append_message(self, conversation_id: str, message: Message) -> Message:
+        """
+        Сохранение сообщения сразу привязанным к диалогу (одна операция записи)
+
+        Args:
+            conversation_id: ID диалога
+            message: Сообщение для добавления
+
+        Returns:
+            Сохраненное сообщение
+
+        Raises:
+            ValueError: Если диалог не найден
+        """
+        pass
+
     async def add_message_to_conversation(
         self, conversation_id: str, message: Message
     ) -> Message:
         """
         Добавление сообщения в диалог
 
+        Устарело: используйте append_message (сохраняет сообщение и
+        привязку к диалогу одной операцией).
+
         Args:
             conversation_id: ID диалога
             message: Сообщение для добавления
@@ -293,13 +574,16 @@ class IMessageRepository(ABC):
         Returns:
             Добавленное сообщение
         """
-        pass
+        return await self.append_message(conversation_id, message)
 
     @abstractmethod
     async def get_all_conversations(self, skip: int = 0, limit: int = 100) -> List[Conversation]:
         """
         Получение всех диалогов
 
+        Устарело: offset-пагинация сканирует пропущенные записи,
+        используйте list_conversations_after.
+
         Args:
             skip: Количество пропущенных записей
             limit: Максимальное количество записей
@@ -309,3 +593,29 @@ class IMessageRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def list_conversations_after(
+        self, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Conversation], Optional[str]]:
+        """
+        Keyset-пагинация диалогов в порядке (created_at, id)
+
+        Args:
+            cursor: Курсор предыдущей страницы (None - первая страница)
+            limit: Максимальное количество записей
+
+        Returns:
+            Кортеж (диалоги, курсор следующей страницы или None)
+        """
+        pass
+
+    @abstractmethod
+    async def estimated_conversation_count(self) -> int:
+        """
+        Приблизительное количество диалогов (для метаданных пагинации)
+
+        Returns:
+            Оценка количества диалогов
+        """
+        pass
+
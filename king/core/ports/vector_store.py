@@ -2,26 +2,191 @@
 Интерфейс для векторных хранилищ (Qdrant, Chroma и т.д.)
 """
 
+import asyncio
+import json
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from array import array
+from typing import AsyncIterator, List, Dict, Any, Literal, Optional, Sequence, Tuple, Union
 from dataclasses import dataclass
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-@dataclass
+# Вектор запроса: список float или array("f")
+VectorLike = Sequence[float]
+
+# Метрика расстояния коллекции
+Distance = Literal["cosine", "dot", "euclid"]
+
+# Режим квантования векторов коллекции
+Quantization = Literal["none", "scalar_int8", "binary"]
+
+
+@dataclass(slots=True, frozen=True)
+class Eq:
+    """Фильтр: значение поля метаданных равно value"""
+    field: str
+    value: Any
+
+
+@dataclass(slots=True, frozen=True)
+class In:
+    """Фильтр: значение поля метаданных входит в values"""
+    field: str
+    values: Tuple[Any, ...]
+
+
+@dataclass(slots=True, frozen=True)
+class Range:
+    """Фильтр: числовое значение поля в заданных границах"""
+    field: str
+    gt: Optional[float] = None
+    gte: Optional[float] = None
+    lt: Optional[float] = None
+    lte: Optional[float] = None
+
+
+@dataclass(slots=True, frozen=True)
+class And:
+    """Фильтр: выполнены все условия"""
+    filters: Tuple["MetadataFilter", ...]
+
+
+@dataclass(slots=True, frozen=True)
+class Or:
+    """Фильтр: выполнено хотя бы одно условие"""
+    filters: Tuple["MetadataFilter", ...]
+
+
+# Типизированный фильтр по метаданным, который адаптеры транслируют
+# в нативный фильтр хранилища (фильтрация во время ANN-поиска, а не после)
+MetadataFilter = Union[Eq, In, Range, And, Or]
+
+# Фильтр в параметрах search: типизированный или словарь {поле: значение}
+FilterLike = Union[MetadataFilter, Dict[str, Any]]
+
+
+def normalize_filter(filter: Optional[FilterLike]) -> Optional[MetadataFilter]:
+    """
+    Приведение фильтра к типизированному виду
+    
+    Словарь {поле: значение} (прежний формат) трактуется как And из Eq.
+    
+    Args:
+        filter: Фильтр или None
+    
+    Returns:
+        Типизированный фильтр или None, если фильтр пуст
+    """
+    if not filter:
+        return None
+    if isinstance(filter, dict):
+        conditions = tuple(Eq(key, value) for key, value in filter.items())
+        return conditions[0] if len(conditions) == 1 else And(conditions)
+    return filter
+
+
+def to_float32(values: VectorLike) -> array:
+    """
+    Приведение вектора к компактному array("f") (float32, 4 байта на элемент)
+    
+    Args:
+        values: Список float или array("f")
+    
+    Returns:
+        array("f") (тот же объект, если он уже float32)
+    """
+    if isinstance(values, array) and values.typecode == "f":
+        return values
+    return array("f", values)
+
+
+def _json_default(value: Any) -> Any:
+    """Сериализация array("f") векторов в JSON-массив"""
+    if isinstance(value, array):
+        return value.tolist()
+    raise TypeError(f"Тип {type(value).__name__} не сериализуется в JSON")
+
+
+def _dumps(data: Dict[str, Any]) -> bytes:
+    """JSON-сериализация в bytes (orjson, если установлен)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, default=_json_default)
+    return json.dumps(
+        data, ensure_ascii=False, separators=(",", ":"), default=_json_default
+    ).encode("utf-8")
+
+
+@dataclass(slots=True, frozen=True)
 class Vector:
-    """Вектор с метаданными"""
+    """
+    Вектор с метаданными
+    
+    Значения хранятся как array("f") - плоский буфер float32 вместо
+    списка Python-объектов; адаптеры переводят его в список только
+    на границе с клиентом хранилища. Экземпляры неизменяемы и без __dict__.
+    """
     id: str
-    vector: List[float]
+    vector: array
     metadata: Dict[str, Any]
+    
+    def __post_init__(self):
+        object.__setattr__(self, "vector", to_float32(self.vector))
+    
+    def to_bytes(self) -> bytes:
+        """Сырые байты вектора (float32, порядок байт платформы)"""
+        return self.vector.tobytes()
+    
+    def to_json_bytes(self) -> bytes:
+        """
+        JSON-представление вектора для HTTP-ответов
+        
+        Returns:
+            UTF-8 JSON {"id", "vector", "metadata"} без промежуточного str
+        """
+        return _dumps({"id": self.id, "vector": self.vector, "metadata": self.metadata})
+    
+    @classmethod
+    def from_bytes(
+        cls, id: str, data: bytes, metadata: Optional[Dict[str, Any]] = None
+    ) -> "Vector":
+        """
+        Восстановление вектора из сырых байт
+        
+        Args:
+            id: ID вектора
+            data: Байты float32 (результат to_bytes)
+            metadata: Метаданные
+        
+        Returns:
+            Vector
+        """
+        values = array("f")
+        values.frombytes(data)
+        return cls(id=id, vector=values, metadata=metadata or {})
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SearchResult:
-    """Результат поиска в векторном хранилище"""
+    """Результат поиска в векторном хранилище (неизменяемый, без __dict__)"""
     id: str
     score: float
-    vector: Optional[List[float]] = None
+    vector: Optional[array] = None
     metadata: Optional[Dict[str, Any]] = None
+    
+    def to_json_bytes(self) -> bytes:
+        """
+        JSON-представление результата для HTTP-ответов
+        
+        Returns:
+            UTF-8 JSON {"id", "score", "vector", "metadata"}
+        """
+        return _dumps(
+            {"id": self.id, "score": self.score, "vector": self.vector, "metadata": self.metadata}
+        )
 
 
 class AbstractVectorStore(ABC):
@@ -29,28 +194,38 @@ class AbstractVectorStore(ABC):
     Унифицированный интерфейс для векторных хранилищ
     """
     
+    # Хранилище само векторизует текст запроса (search_text)
+    supports_text_query: bool = False
+    
     @abstractmethod
     async def add_vectors(
         self,
         vectors: List[Vector],
-        collection: Optional[str] = None
+        collection: Optional[str] = None,
+        batch_size: int = 256
     ) -> None:
         """
         Добавление векторов в хранилище
         
+        Адаптеры должны разбивать список на пачки по batch_size и
+        загружать каждую пачку одним запросом (не по одному вектору).
+        
         Args:
             vectors: Список векторов для добавления
             collection: Название коллекции (опционально)
+            batch_size: Размер пачки для загрузки
         """
         pass
     
     @abstractmethod
     async def search(
         self,
-        query_vector: List[float],
+        query_vector: VectorLike,
         top_k: int = 10,
         collection: Optional[str] = None,
-        filter: Optional[Dict[str, Any]] = None
+        filter: Optional[FilterLike] = None,
+        with_vectors: bool = False,
+        with_payload: bool = True
     ) -> List[SearchResult]:
         """
         Поиск похожих векторов
@@ -59,13 +234,106 @@ class AbstractVectorStore(ABC):
             query_vector: Вектор запроса
             top_k: Количество результатов
             collection: Название коллекции
-            filter: Фильтр по метаданным
+            filter: Фильтр по метаданным (MetadataFilter или словарь {поле: значение})
+            with_vectors: Возвращать векторы найденных записей (SearchResult.vector)
+            with_payload: Возвращать метаданные найденных записей (SearchResult.metadata)
         
         Returns:
             Список результатов поиска, отсортированный по релевантности
         """
         pass
     
+    async def search_batch(
+        self,
+        query_vectors: List[VectorLike],
+        top_k: int = 10,
+        collection: Optional[str] = None,
+        filter: Optional[FilterLike] = None,
+        with_vectors: bool = False,
+        with_payload: bool = True
+    ) -> List[List[SearchResult]]:
+        """
+        Пакетный поиск похожих векторов
+        
+        Адаптеры переопределяют метод, чтобы выполнить все запросы одним
+        обращением к хранилищу; реализация по умолчанию выполняет search
+        для каждого вектора конкурентно.
+        
+        Args:
+            query_vectors: Векторы запросов
+            top_k: Количество результатов на каждый запрос
+            collection: Название коллекции
+            filter: Фильтр по метаданным (общий для всех запросов)
+            with_vectors: Возвращать векторы найденных записей
+            with_payload: Возвращать метаданные найденных записей
+        
+        Returns:
+            Списки результатов поиска в порядке векторов запросов
+        """
+        return list(
+            await asyncio.gather(
+                *(
+                    self.search(v, top_k, collection, filter, with_vectors, with_payload)
+                    for v in query_vectors
+                )
+            )
+        )
+    
+    async def search_text(
+        self,
+        query: str,
+        top_k: int = 10,
+        collection: Optional[str] = None,
+        filter: Optional[FilterLike] = None
+    ) -> List[SearchResult]:
+        """
+        Поиск по тексту запроса с векторизацией на стороне хранилища
+        
+        Доступен, если supports_text_query = True. Модель embeddings
+        хранилища должна совпадать с моделью, которой векторизованы документы.
+        
+        Args:
+            query: Текст запроса
+            top_k: Количество результатов
+            collection: Название коллекции
+            filter: Фильтр по метаданным
+        
+        Returns:
+            Список результатов поиска, отсортированный по релевантности
+        
+        Raises:
+            NotImplementedError: Если хранилище не векторизует запросы
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} не поддерживает поиск по тексту запроса"
+        )
+    
+    def iter_vectors(
+        self,
+        collection: Optional[str] = None,
+        batch_size: int = 256
+    ) -> AsyncIterator[List[Vector]]:
+        """
+        Постраничное чтение всех векторов коллекции
+        
+        Используется для заполнения локальных зеркал коллекции
+        (FaissLocalIndex.sync_from). Адаптеры реализуют метод асинхронным
+        генератором, возвращающим векторы вместе с метаданными.
+        
+        Args:
+            collection: Название коллекции
+            batch_size: Количество векторов в одной странице
+        
+        Returns:
+            Асинхронный итератор страниц векторов
+        
+        Raises:
+            NotImplementedError: Если хранилище не поддерживает полный обход
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} не поддерживает чтение всех векторов коллекции"
+        )
+    
     @abstractmethod
     async def delete(
         self,
@@ -86,6 +354,12 @@ class AbstractVectorStore(ABC):
         self,
         name: str,
         dimension: int,
+        *,
+        distance: Distance = "cosine",
+        quantization: Optional[Quantization] = None,
+        on_disk: bool = False,
+        hnsw_m: int = 16,
+        hnsw_ef_construct: int = 128,
         **kwargs
     ) -> None:
         """
@@ -94,10 +368,36 @@ class AbstractVectorStore(ABC):
         Args:
             name: Название коллекции
             dimension: Размерность векторов
-            **kwargs: Дополнительные параметры
+            distance: Метрика расстояния
+            quantization: Квантование векторов ("scalar_int8" - в 4 раза меньше
+                памяти, "binary" - в 32 раза; None/"none" - без квантования)
+            on_disk: Хранить исходные векторы на диске
+            hnsw_m: Параметр M графа HNSW
+            hnsw_ef_construct: Параметр ef_construct графа HNSW
+            **kwargs: Дополнительные параметры адаптера
         """
         pass
     
+    async def create_payload_index(
+        self,
+        collection: Optional[str],
+        field: str,
+        schema: str = "keyword"
+    ) -> None:
+        """
+        Создание индекса по полю метаданных для фильтрации
+        
+        Индексируются часто фильтруемые поля, чтобы фильтр применялся при
+        обходе индекса, а не перебором. Хранилища без индексов по полям
+        метаданных оставляют реализацию по умолчанию (ничего не делает).
+        
+        Args:
+            collection: Название коллекции (None - коллекция по умолчанию)
+            field: Поле метаданных
+            schema: Тип индекса ("keyword", "integer", "float", "bool" и т.д.)
+        """
+        return None
+    
     @abstractmethod
     async def health_check(self) -> bool:
         """
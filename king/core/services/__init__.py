@@ -4,9 +4,11 @@
 """
 
 from king.core.services.agent_orchestrator import AgentOrchestrator
+from king.core.services.batching_query_processor import BatchingQueryProcessor
 from king.core.services.llm_service import LLMService
 from king.core.services.message_processor import MessageProcessor
 from king.core.services.rag_service import RAGService
+from king.core.services.semantic_cache import SemanticCache
 from king.core.services.task_scheduler import TaskScheduler
 
 __all__ = [
@@ -15,4 +17,6 @@ __all__ = [
     "TaskScheduler",
     "MessageProcessor",
     "RAGService",
+    "BatchingQueryProcessor",
+    "SemanticCache",
 ]
@@ -2,14 +2,26 @@
 AgentOrchestrator - оркестрация агентов
 """
 
+import asyncio
 import logging
-from typing import List, Optional
-
-from king.core.domain import Agent, AgentCreated, AgentStatus, AgentStatusChanged, Task
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from king.core.domain import (
+    Agent,
+    AgentCreated,
+    AgentStatus,
+    AgentStatusChanged,
+    AgentType,
+    Task,
+    TaskStatus,
+)
 from king.core.ports.repositories import IAgentRepository, ITaskRepository
 
 logger = logging.getLogger(__name__)
 
+# Строковое значение -> AgentType (без повторного поиска по enum на каждый вызов)
+_AGENT_TYPE_CACHE = {t.value: t for t in AgentType}
+
 
 class AgentOrchestrator:
     """
@@ -33,6 +45,8 @@ class AgentOrchestrator:
         self.agent_repository = agent_repository
         self.task_repository = task_repository
         self.event_bus = event_bus
+        # Метод публикации определяется один раз, а не на каждое событие
+        self._publish_callable = getattr(event_bus, "publish", None) if event_bus else None
 
     async def create_agent(
         self,
@@ -53,11 +67,13 @@ class AgentOrchestrator:
         Returns:
             Созданный агент
         """
-        from king.core.domain import AgentType
+        if isinstance(agent_type, str):
+            # Неизвестное значение - AgentType() поднимет ValueError, как и раньше
+            agent_type = _AGENT_TYPE_CACHE.get(agent_type) or AgentType(agent_type)
 
         agent = Agent(
             name=name,
-            type=AgentType(agent_type) if isinstance(agent_type, str) else agent_type,
+            type=agent_type,
             status=AgentStatus.CREATED,
             capabilities=capabilities or {},
             metadata=metadata or {},
@@ -66,7 +82,7 @@ class AgentOrchestrator:
         agent = await self.agent_repository.create(agent)
 
         # Публикация события создания агента
-        if self.event_bus:
+        if self._publish_callable is not None:
             event = AgentCreated(
                 agent_id=agent.id,
                 agent_name=agent.name,
@@ -103,6 +119,15 @@ class AgentOrchestrator:
         """
         return await self.agent_repository.get_all(skip=skip, limit=limit)
 
+    async def estimated_agent_count(self) -> int:
+        """
+        Приблизительное количество агентов
+
+        Returns:
+            Оценка количества агентов
+        """
+        return await self.agent_repository.estimated_count()
+
     async def update_agent_status(
         self, agent_id: str, new_status: AgentStatus, reason: Optional[str] = None
     ) -> Agent:
@@ -126,7 +151,7 @@ class AgentOrchestrator:
         agent = await self.agent_repository.update(agent)
 
         # Публикация события изменения статуса
-        if self.event_bus:
+        if self._publish_callable is not None:
             event = AgentStatusChanged(
                 agent_id=agent.id,
                 old_status=old_status.value,
@@ -172,20 +197,96 @@ class AgentOrchestrator:
         Returns:
             Доступный агент или None
         """
-        available_agents = await self.agent_repository.get_available()
+        # Фильтр по возможностям выполняется в репозитории
+        agents = await self.agent_repository.find_available_with_capabilities(
+            required_capabilities or [], limit=1
+        )
+        return agents[0] if agents else None
+
+    async def find_available_agents(
+        self, capabilities_list: List[Optional[List[str]]]
+    ) -> List[Optional[Agent]]:
+        """
+        Поиск доступных агентов для нескольких наборов возможностей
 
-        if not available_agents:
-            return None
+        Репозиторий запрашивается один раз на каждый различный набор
+        возможностей (запросы выполняются конкурентно), а не на каждую задачу.
 
-        # Если требуются специфические возможности, фильтруем агентов
-        if required_capabilities:
-            for agent in available_agents:
-                if all(agent.has_capability(cap) for cap in required_capabilities):
-                    return agent
-            return None
+        Args:
+            capabilities_list: Требуемые возможности для каждой задачи
+
+        Returns:
+            Доступный агент (или None) для каждого элемента capabilities_list
+        """
+        keys = [frozenset(capabilities or ()) for capabilities in capabilities_list]
+        distinct = list(dict.fromkeys(keys))
+
+        found = await asyncio.gather(
+            *(
+                self.agent_repository.find_available_with_capabilities(list(key), limit=1)
+                for key in distinct
+            )
+        )
+        agents: Dict[FrozenSet[str], Optional[Agent]] = {
+            key: (result[0] if result else None) for key, result in zip(distinct, found)
+        }
+        return [agents[key] for key in keys]
+
+    async def assign_task_to_agent_bulk(self, assignments: List[Tuple[Task, str]]) -> List[Task]:
+        """
+        Назначение нескольких задач агентам
+
+        Каждый агент загружается один раз, задачи сохраняются одним вызовом
+        update_many. Назначения несуществующим или недоступным агентам,
+        а также задач, уже покинувших статус CREATED (например, назначенных
+        конкурентно, пока загружались агенты), пропускаются. Если update_many
+        завершился ошибкой, назначения в объектах задач откатываются.
+
+        Args:
+            assignments: Пары (задача, ID агента)
+
+        Returns:
+            Назначенные задачи
+        """
+        if not assignments:
+            return []
+
+        agent_ids = list(dict.fromkeys(agent_id for _, agent_id in assignments))
+        agents = dict(
+            zip(
+                agent_ids,
+                await asyncio.gather(*(self.agent_repository.get_by_id(i) for i in agent_ids)),
+            )
+        )
 
-        # Возвращаем первого доступного агента
-        return available_agents[0] if available_agents else None
+        tasks = []
+        previous = []
+        for task, agent_id in assignments:
+            if task.status != TaskStatus.CREATED:
+                logger.warning(f"Задача {task.id} уже в статусе {task.status}, не назначена")
+                continue
+            agent = agents[agent_id]
+            if not agent:
+                logger.warning(f"Агент с ID {agent_id} не найден, задача {task.id} не назначена")
+                continue
+            if not agent.is_available():
+                logger.warning(f"Агент {agent_id} недоступен, задача {task.id} не назначена")
+                continue
+            previous.append((task.status, task.assigned_agent, task.updated_at))
+            task.assign_to(agent_id)
+            tasks.append(task)
+
+        try:
+            tasks = await self.task_repository.update_many(tasks)
+        except Exception:
+            for task, (status, assigned_agent, updated_at) in zip(tasks, previous):
+                task.status = status
+                task.assigned_agent = assigned_agent
+                task.updated_at = updated_at
+            raise
+
+        logger.info(f"Назначено задач: {len(tasks)} из {len(assignments)}")
+        return tasks
 
     async def get_agent_tasks(self, agent_id: str) -> List[Task]:
         """
@@ -206,9 +307,9 @@ class AgentOrchestrator:
         Args:
             event: Доменное событие
         """
-        if self.event_bus and hasattr(self.event_bus, "publish"):
+        if self._publish_callable is not None:
             try:
-                await self.event_bus.publish(event)
+                await self._publish_callable(event)
             except Exception as e:
                 logger.warning(f"Не удалось опубликовать событие: {e}")
 
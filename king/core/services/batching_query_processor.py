@@ -0,0 +1,223 @@
+"""
+BatchingQueryProcessor - асинхронное пакетирование поисковых запросов RAG
+"""
+
+import asyncio
+import logging
+from typing import Any, List, Optional, Tuple
+
+from king.core.ports.llm import AbstractLLMClient
+from king.core.ports.vector_store import AbstractVectorStore, FilterLike, SearchResult
+from king.core.services.semantic_cache import SemanticCache
+
+logger = logging.getLogger(__name__)
+
+
+class BatchingQueryProcessor:
+    """
+    Коалесцер конкурентных поисковых запросов
+
+    Запросы, пришедшие в течение max_wait_ms, объединяются в одну пачку:
+    один запрос get_embeddings_batch и один search_batch на каждую группу
+    запросов с одинаковыми top_k и фильтром. Если задан семантический кэш,
+    запросы с близким embedding получают результат без обращения к хранилищу.
+    """
+
+    def __init__(
+        self,
+        llm_client: AbstractLLMClient,
+        vector_store: AbstractVectorStore,
+        collection: Optional[str] = None,
+        max_batch: int = 32,
+        max_wait_ms: float = 20.0,
+        cache: Optional[SemanticCache] = None,
+        local_store: Optional[AbstractVectorStore] = None,
+    ):
+        """
+        Инициализация процессора
+
+        Args:
+            llm_client: Клиент LLM для генерации embeddings
+            vector_store: Векторное хранилище
+            collection: Название коллекции в хранилище
+            max_batch: Максимальное количество запросов в пачке
+            max_wait_ms: Окно накопления запросов (мс)
+            cache: Семантический кэш результатов поиска (опционально)
+            local_store: Локальный ANN-индекс, используемый вместо vector_store,
+                пока его health_check возвращает True (опционально)
+        """
+        self.llm_client = llm_client
+        self.vector_store = vector_store
+        self.collection = collection
+        self.max_batch = max_batch
+        self._max_wait = max_wait_ms / 1000
+        self.cache = cache
+        self.local_store = local_store
+        self._queue: asyncio.Queue[Tuple[str, int, Any, Optional[List[float]], asyncio.Future]] = (
+            asyncio.Queue()
+        )
+        self._worker: Optional[asyncio.Task] = None
+
+    async def submit(
+        self,
+        query: str,
+        top_k: int = 5,
+        filter: Optional[FilterLike] = None,
+        embedding: Optional[List[float]] = None,
+    ) -> List[SearchResult]:
+        """
+        Постановка запроса в очередь и ожидание результата
+
+        Args:
+            query: Текст запроса
+            top_k: Количество результатов
+            filter: Фильтр по метаданным
+            embedding: Уже вычисленный embedding запроса (опционально)
+
+        Returns:
+            Список результатов поиска
+        """
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((query, top_k, filter, embedding, future))
+        return await future
+
+    async def _run(self) -> None:
+        """Фоновая задача: сбор запросов в пачки и их выполнение"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._max_wait
+
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Вызывающие могли отменить ожидание
+            batch = [item for item in batch if not item[4].done()]
+            if not batch:
+                continue
+            try:
+                await self._process(batch)
+            except asyncio.CancelledError:
+                self._fail(
+                    [item[4] for item in batch], RuntimeError("BatchingQueryProcessor остановлен")
+                )
+                raise
+            except Exception as e:
+                # Ошибка вне поиска (кэш и т.п.) не должна останавливать фоновую задачу
+                logger.error("Ошибка при обработке пачки запросов: %s", e, exc_info=True)
+                self._fail([item[4] for item in batch], e)
+
+    async def _process(
+        self, batch: List[Tuple[str, int, Any, Optional[List[float]], asyncio.Future]]
+    ) -> None:
+        """
+        Выполнение пачки запросов
+
+        Args:
+            batch: Запросы (query, top_k, filter, embedding, future)
+        """
+        embeddings = [item[3] for item in batch]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            try:
+                computed = await self.llm_client.get_embeddings_batch(
+                    [batch[i][0] for i in missing]
+                )
+                if len(computed) != len(missing):
+                    raise ValueError(
+                        f"Провайдер вернул {len(computed)} embeddings для {len(missing)} запросов"
+                    )
+            except Exception as e:
+                self._fail([batch[i][4] for i in missing], e)
+                batch = [item for item in batch if item[3] is not None]
+                embeddings = [item[3] for item in batch]
+            else:
+                for i, embedding in zip(missing, computed):
+                    embeddings[i] = embedding
+
+        # search_batch принимает общие top_k и фильтр - группируем по ним
+        # (фильтр может быть словарем, поэтому сравнение, а не хеширование)
+        groups: List[Tuple[int, Any, List[int]]] = []
+        for index, (_, top_k, filter, _, future) in enumerate(batch):
+            if self.cache is not None:
+                cached = self.cache.get(embeddings[index], ("search", top_k, filter))
+                if cached is not None:
+                    if not future.done():
+                        future.set_result(list(cached))
+                    continue
+
+            for group_top_k, group_filter, indexes in groups:
+                if group_top_k == top_k and group_filter == filter:
+                    indexes.append(index)
+                    break
+            else:
+                groups.append((top_k, filter, [index]))
+
+        store = self.vector_store
+        if groups and self.local_store is not None and await self._local_store_healthy():
+            store = self.local_store
+
+        for top_k, filter, indexes in groups:
+            futures = [batch[i][4] for i in indexes]
+            try:
+                results = await store.search_batch(
+                    query_vectors=[embeddings[i] for i in indexes],
+                    top_k=top_k,
+                    collection=self.collection,
+                    filter=filter,
+                )
+                if len(results) != len(indexes):
+                    raise ValueError(
+                        f"Хранилище вернуло {len(results)} результатов для {len(indexes)} запросов"
+                    )
+            except Exception as e:
+                self._fail(futures, e)
+                continue
+
+            for index, future, result in zip(indexes, futures, results):
+                if self.cache is not None:
+                    self.cache.put(embeddings[index], ("search", top_k, filter), result)
+                if not future.done():
+                    future.set_result(result)
+
+        logger.debug("Выполнена пачка из %d поисковых запросов (%d групп)", len(batch), len(groups))
+
+    async def _local_store_healthy(self) -> bool:
+        """Проверка локального индекса (ошибка проверки - индекс недоступен)"""
+        try:
+            return await self.local_store.health_check()
+        except Exception as e:
+            logger.warning("Локальный индекс недоступен, используется vector_store: %s", e)
+            return False
+
+    @staticmethod
+    def _fail(futures: List[asyncio.Future], error: Exception) -> None:
+        """Передача ошибки всем ожидающим запросам"""
+        for future in futures:
+            if not future.done():
+                future.set_exception(error)
+
+    async def close(self) -> None:
+        """Остановка фоновой задачи (ожидающие запросы получают ошибку)"""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+
+        while not self._queue.empty():
+            future = self._queue.get_nowait()[4]
+            if not future.done():
+                future.set_exception(RuntimeError("BatchingQueryProcessor остановлен"))
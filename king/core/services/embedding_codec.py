@@ -0,0 +1,44 @@
+"""
+Скалярное квантование embeddings в int8
+"""
+
+from array import array
+from typing import Sequence, Tuple
+
+
+def encode_int8(vector: Sequence[float]) -> Tuple[bytes, float]:
+    """
+    Квантование вектора в int8 с симметричной шкалой по максимуму модуля
+
+    1 байт на компонент вместо 4 (float32); значение восстанавливается
+    как code * scale с погрешностью не больше scale / 2.
+
+    Args:
+        vector: Вектор embeddings
+
+    Returns:
+        Кортеж (коды int8 в байтах, scale)
+    """
+    max_abs = max((abs(x) for x in vector), default=0.0)
+    if max_abs == 0:
+        return bytes(len(vector)), 1.0
+
+    scale = max_abs / 127
+    codes = array("b", (max(-127, min(127, round(x / scale))) for x in vector))
+    return codes.tobytes(), scale
+
+
+def decode_int8(data: bytes, scale: float) -> array:
+    """
+    Восстановление вектора из int8-кодов
+
+    Args:
+        data: Коды int8 (результат encode_int8)
+        scale: Шкала квантования
+
+    Returns:
+        Вектор array("f")
+    """
+    codes = array("b")
+    codes.frombytes(data)
+    return array("f", (code * scale for code in codes))
@@ -2,8 +2,11 @@
 LLMService - унифицированный интерфейс для работы с LLM
 """
 
+import asyncio
+import itertools
 import logging
-from typing import AsyncIterator, List, Optional
+from typing import AsyncIterator, List, Optional, Tuple
+from uuid import uuid4
 
 from king.core.domain.events import (
     LLMErrorOccurred,
@@ -14,6 +17,11 @@ from king.core.ports.llm import AbstractLLMClient, LLMResponse, Message
 
 logger = logging.getLogger(__name__)
 
+# Генерация request_id: префикс процесса + монотонный счетчик
+# (id(prompt) повторяется для одинаковых интернированных строк)
+_REQ_PREFIX = uuid4().hex[:8]
+_REQ_COUNTER = itertools.count()
+
 
 class LLMService:
     """
@@ -21,16 +29,32 @@ class LLMService:
     Обеспечивает унифицированный интерфейс независимо от провайдера
     """
 
-    def __init__(self, llm_client: AbstractLLMClient, event_bus: Optional[object] = None):
+    def __init__(
+        self,
+        llm_client: AbstractLLMClient,
+        event_bus: Optional[object] = None,
+        embed_flush_delay_ms: float = 5.0,
+        embed_max_batch: int = 64,
+    ):
         """
         Инициализация LLM сервиса
 
         Args:
             llm_client: Адаптер LLM-провайдера
             event_bus: Event bus для публикации событий (опционально)
+            embed_flush_delay_ms: Окно накопления запросов get_embeddings (мс)
+            embed_max_batch: Максимальный размер пачки embeddings
         """
         self.llm_client = llm_client
         self.event_bus = event_bus
+        # Метод публикации определяется один раз, а не на каждое событие
+        self._publish_callable = getattr(event_bus, "publish", None) if event_bus else None
+
+        # Объединение одиночных запросов embeddings в пачки
+        self._embed_flush_delay = embed_flush_delay_ms / 1000
+        self._embed_max_batch = embed_max_batch
+        self._embed_queue: asyncio.Queue[Tuple[str, asyncio.Future]] = asyncio.Queue()
+        self._embed_worker: Optional[asyncio.Task] = None
 
     async def generate(
         self,
@@ -51,11 +75,11 @@ class LLMService:
         Returns:
             LLMResponse или AsyncIterator[LLMResponse] при stream=True
         """
-        request_id = kwargs.get("request_id") or f"req_{id(prompt)}"
+        request_id = kwargs.get("request_id") or f"req_{_REQ_PREFIX}_{next(_REQ_COUNTER):x}"
 
         try:
             # Публикация события инициации запроса
-            if self.event_bus:
+            if self._publish_callable is not None:
                 event = LLMRequestInitiated(
                     request_id=request_id,
                     prompt=prompt,
@@ -71,7 +95,7 @@ class LLMService:
                 response = await self.llm_client.generate(prompt, context, stream=False, **kwargs)
 
                 # Публикация события получения ответа
-                if self.event_bus:
+                if self._publish_callable is not None:
                     event = LLMResponseReceived(
                         request_id=request_id,
                         response_content=response.content,
@@ -86,7 +110,7 @@ class LLMService:
             logger.error(f"Ошибка при генерации ответа: {e}", exc_info=True)
 
             # Публикация события ошибки
-            if self.event_bus:
+            if self._publish_callable is not None:
                 event = LLMErrorOccurred(
                     request_id=request_id,
                     error_message=str(e),
@@ -115,24 +139,32 @@ class LLMService:
         Yields:
             LLMResponse с частичными ответами
         """
+        # Накопление ответа по мере стрима, чтобы опубликовать полный текст
+        parts: List[str] = []
+        tokens_used = 0
+        model = kwargs.get("model")
+
         try:
             async for chunk in self.llm_client.stream(prompt, context, **kwargs):
+                parts.append(chunk.content)
+                tokens_used += chunk.tokens_used or 0
+                model = chunk.model or model
                 yield chunk
 
             # Публикация события получения ответа (после завершения стрима)
-            if self.event_bus:
-                # Здесь можно собрать полный ответ из чанков
+            if self._publish_callable is not None:
                 event = LLMResponseReceived(
                     request_id=request_id,
-                    response_content="[streaming]",
-                    model=kwargs.get("model"),
+                    response_content="".join(parts),
+                    tokens_used=tokens_used or None,
+                    model=model,
                 )
                 await self._publish_event(event)
 
         except Exception as e:
             logger.error(f"Ошибка при streaming-генерации: {e}", exc_info=True)
 
-            if self.event_bus:
+            if self._publish_callable is not None:
                 event = LLMErrorOccurred(
                     request_id=request_id,
                     error_message=str(e),
@@ -151,13 +183,98 @@ class LLMService:
 
         Returns:
             Список чисел (вектор embeddings)
+
+        Note:
+            Конкурентные вызовы накапливаются в течение embed_flush_delay_ms
+            (до embed_max_batch текстов) и отправляются провайдеру одной пачкой
         """
+        if self._embed_worker is None or self._embed_worker.done():
+            self._embed_worker = asyncio.create_task(self._embedding_worker())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._embed_queue.put((text, future))
+        return await future
+
+    async def get_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Получение embeddings для пачки текстов одним запросом
+
+        Args:
+            texts: Тексты для векторизации
+
+        Returns:
+            Векторы embeddings в порядке входных текстов
+        """
+        if not texts:
+            return []
+
         try:
-            return await self.llm_client.get_embeddings(text)
+            return await self.llm_client.get_embeddings_batch(texts)
         except Exception as e:
             logger.error(f"Ошибка при получении embeddings: {e}", exc_info=True)
             raise
 
+    async def _embedding_worker(self) -> None:
+        """Фоновая задача: сбор запросов get_embeddings в пачки и их отправка"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._embed_queue.get()]
+            deadline = loop.time() + self._embed_flush_delay
+
+            while len(batch) < self._embed_max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._embed_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Вызывающие могли отменить ожидание
+            batch = [(text, future) for text, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            try:
+                vectors = await self.get_embeddings_batch([text for text, _ in batch])
+                if len(vectors) != len(batch):
+                    raise ValueError(
+                        f"Провайдер вернул {len(vectors)} embeddings для {len(batch)} текстов"
+                    )
+            except asyncio.CancelledError:
+                self._fail_embeddings(batch, RuntimeError("LLMService остановлен"))
+                raise
+            except Exception as e:
+                self._fail_embeddings(batch, e)
+                continue
+
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+
+    @staticmethod
+    def _fail_embeddings(batch: List[Tuple[str, asyncio.Future]], error: Exception) -> None:
+        """Передача ошибки всем ожидающим вызовам пачки"""
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    async def close(self) -> None:
+        """Остановка фоновой задачи embeddings (ожидающие вызовы получают ошибку)"""
+        if self._embed_worker is not None and not self._embed_worker.done():
+            self._embed_worker.cancel()
+            try:
+                await self._embed_worker
+            except asyncio.CancelledError:
+                pass
+        self._embed_worker = None
+
+        while not self._embed_queue.empty():
+            _, future = self._embed_queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("LLMService остановлен"))
+
     async def health_check(self) -> bool:
         """
         Проверка доступности LLM-сервиса
@@ -178,9 +295,9 @@ class LLMService:
         Args:
             event: Доменное событие
         """
-        if self.event_bus and hasattr(self.event_bus, "publish"):
+        if self._publish_callable is not None:
             try:
-                await self.event_bus.publish(event)
+                await self._publish_callable(event)
             except Exception as e:
                 logger.warning(f"Не удалось опубликовать событие: {e}")
 
@@ -2,8 +2,10 @@
 MessageProcessor - обработка входящих сообщений
 """
 
+import asyncio
 import logging
-from typing import List, Optional
+from collections import deque
+from typing import Deque, Dict, List, Optional
 
 from king.core.domain import (
     Conversation,
@@ -12,10 +14,18 @@ from king.core.domain import (
     MessageReceived,
 )
 from king.core.ports.repositories import IMessageRepository
+from king.core.ports.vector_store import SearchResult
 from king.core.services.llm_service import LLMService
+from king.core.services.rag_service import RAGService
 
 logger = logging.getLogger(__name__)
 
+# Количество последних сообщений диалога, передаваемых в контекст LLM
+CONTEXT_CACHE_SIZE = 50
+
+# Максимальное количество диалогов с закэшированным контекстом
+MAX_CACHED_CONVERSATIONS = 1024
+
 
 class MessageProcessor:
     """
@@ -28,6 +38,8 @@ class MessageProcessor:
         message_repository: IMessageRepository,
         llm_service: Optional[LLMService] = None,
         event_bus: Optional[object] = None,
+        rag_service: Optional[RAGService] = None,
+        rag_top_k: int = 5,
     ):
         """
         Инициализация процессора сообщений
@@ -36,10 +48,18 @@ class MessageProcessor:
             message_repository: Репозиторий сообщений
             llm_service: Сервис для работы с LLM (опционально)
             event_bus: Event bus для публикации событий (опционально)
+            rag_service: RAG сервис для дополнения промпта найденными документами (опционально)
+            rag_top_k: Количество документов, добавляемых в промпт
         """
         self.message_repository = message_repository
         self.llm_service = llm_service
         self.event_bus = event_bus
+        self.rag_service = rag_service
+        self.rag_top_k = rag_top_k
+        # Метод публикации определяется один раз, а не на каждое событие
+        self._publish_callable = getattr(event_bus, "publish", None) if event_bus else None
+        # conversation_id -> последние CONTEXT_CACHE_SIZE сообщений диалога
+        self._context_cache: Dict[str, Deque[Message]] = {}
 
     async def process_message(
         self,
@@ -77,11 +97,11 @@ class MessageProcessor:
             metadata=metadata or {},
         )
 
-        message = await self.message_repository.create_message(message)
-        await self.message_repository.add_message_to_conversation(conversation.id, message)
+        message = await self.message_repository.append_message(conversation.id, message)
+        self._cache_message(conversation.id, message)
 
         # Публикация события получения сообщения
-        if self.event_bus:
+        if self._publish_callable is not None:
             event = MessageReceived(
                 message_id=message.id,
                 role=message.role,
@@ -106,24 +126,29 @@ class MessageProcessor:
             conversation: Диалог
             user_message: Сообщение пользователя
         """
+        # Поиск документов (embedding запроса + запрос к векторному хранилищу)
+        # не зависит от истории диалога, поэтому запускается параллельно с ее загрузкой
+        retrieval = (
+            asyncio.create_task(self._retrieve(user_message.content))
+            if self.rag_service is not None
+            else None
+        )
+
         try:
-            # Получение истории диалога
-            messages = await self.message_repository.get_conversation_messages(conversation.id)
-
-            # Преобразование в формат для LLM
-            context = []
-            for msg in messages:
-                context.append(
-                    Message(
-                        role=msg.role,
-                        content=msg.content,
-                        timestamp=msg.timestamp,
-                    )
-                )
+            # История диалога из кэша; репозиторий запрашивается только при промахе
+            messages = self._context_cache.get(conversation.id)
+            if messages is None:
+                messages = await self._load_context(conversation.id)
 
-            # Генерация ответа через LLM
             prompt = user_message.content
-            response = await self.llm_service.generate(prompt, context=context)
+            if retrieval is not None:
+                documents = await retrieval
+                prompt = self.rag_service.build_prompt(prompt, documents)
+
+            # Адаптеры LLM читают из контекста только role и content, поэтому
+            # доменные сообщения передаются как есть, без пересоздания объектов
+            # (снимок списка - кэш может пополниться во время генерации)
+            response = await self.llm_service.generate(prompt, context=list(messages))
 
             # Создание сообщения-ответа
             assistant_message = Message(
@@ -133,13 +158,13 @@ class MessageProcessor:
                 metadata={"model": response.model, "tokens_used": response.tokens_used},
             )
 
-            assistant_message = await self.message_repository.create_message(assistant_message)
-            await self.message_repository.add_message_to_conversation(
+            assistant_message = await self.message_repository.append_message(
                 conversation.id, assistant_message
             )
+            self._cache_message(conversation.id, assistant_message)
 
             # Публикация события обработки сообщения
-            if self.event_bus:
+            if self._publish_callable is not None:
                 event = MessageProcessed(
                     message_id=user_message.id,
                     response=assistant_message.content,
@@ -149,9 +174,74 @@ class MessageProcessor:
             logger.info(f"Сгенерирован ответ на сообщение {user_message.id}")
 
         except Exception as e:
+            if retrieval is not None and not retrieval.done():
+                retrieval.cancel()
             logger.error(f"Ошибка при генерации ответа: {e}", exc_info=True)
             raise
 
+    async def _retrieve(self, query: str) -> List[SearchResult]:
+        """
+        Поиск документов для промпта
+
+        Ошибка поиска не прерывает генерацию: ответ строится без контекста.
+
+        Args:
+            query: Текст сообщения пользователя
+
+        Returns:
+            Найденные документы (пустой список при ошибке)
+        """
+        try:
+            return await self.rag_service.search(query, top_k=self.rag_top_k)
+        except Exception as e:
+            logger.warning(f"Не удалось найти документы для сообщения: {e}")
+            return []
+
+    async def _load_context(self, conversation_id: str) -> Deque[Message]:
+        """
+        Загрузка последних сообщений диалога в кэш контекста
+
+        Args:
+            conversation_id: ID диалога
+
+        Returns:
+            Последние CONTEXT_CACHE_SIZE сообщений диалога
+        """
+        # Читаем историю с конца: в памяти не больше CONTEXT_CACHE_SIZE сообщений
+        context: Deque[Message] = deque(maxlen=CONTEXT_CACHE_SIZE)
+        async for message in self.message_repository.iter_conversation_messages(
+            conversation_id, reverse=True, limit=CONTEXT_CACHE_SIZE
+        ):
+            context.appendleft(message)
+
+        if len(self._context_cache) >= MAX_CACHED_CONVERSATIONS:
+            # Вытесняем самый давно загруженный диалог
+            del self._context_cache[next(iter(self._context_cache))]
+
+        self._context_cache[conversation_id] = context
+        return context
+
+    def _cache_message(self, conversation_id: str, message: Message) -> None:
+        """
+        Добавление сообщения в кэш контекста (если диалог закэширован)
+
+        Args:
+            conversation_id: ID диалога
+            message: Сохраненное сообщение
+        """
+        context = self._context_cache.get(conversation_id)
+        if context is not None:
+            context.append(message)
+
+    def invalidate_context(self, conversation_id: str) -> None:
+        """
+        Сброс кэша контекста диалога (например, при сбросе диалога)
+
+        Args:
+            conversation_id: ID диалога
+        """
+        self._context_cache.pop(conversation_id, None)
+
     async def get_conversation(self, conversation_id: str) -> Optional[Conversation]:
         """
         Получение диалога по ID
@@ -195,6 +285,15 @@ class MessageProcessor:
         """
         return await self.message_repository.get_all_conversations(skip=skip, limit=limit)
 
+    async def estimated_conversation_count(self) -> int:
+        """
+        Приблизительное количество диалогов
+
+        Returns:
+            Оценка количества диалогов
+        """
+        return await self.message_repository.estimated_conversation_count()
+
     async def _publish_event(self, event) -> None:
         """
         Публикация события через event bus
@@ -202,9 +301,9 @@ class MessageProcessor:
         Args:
             event: Доменное событие
         """
-        if self.event_bus and hasattr(self.event_bus, "publish"):
+        if self._publish_callable is not None:
             try:
-                await self.event_bus.publish(event)
+                await self._publish_callable(event)
             except Exception as e:
                 logger.warning(f"Не удалось опубликовать событие: {e}")
 
@@ -3,14 +3,34 @@ RAGService - интеграция с RAG-системами
 Retrieval-Augmented Generation
 """
 
+import asyncio
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+from uuid import uuid4
 
 from king.core.ports.llm import AbstractLLMClient, Message
-from king.core.ports.vector_store import AbstractVectorStore, SearchResult
+from king.core.ports.vector_store import (
+    AbstractVectorStore,
+    FilterLike,
+    SearchResult,
+    Vector,
+)
+from king.core.services.batching_query_processor import BatchingQueryProcessor
+from king.core.services.semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
+# Общий пустой словарь для результатов без метаданных (только чтение)
+_EMPTY_METADATA: dict = {}
+
+# Неизменяемые части промпта с контекстом
+_PROMPT_HEADER = "Используй следующую информацию для ответа на вопрос:\n\n"
+_PROMPT_MID = "\n\nВопрос: "
+_PROMPT_TAIL = "\n\nОтвет:"
+
+# Максимальное количество текстов в одном запросе embeddings
+EMBEDDINGS_BATCH_SIZE = 64
+
 
 class RAGService:
     """
@@ -23,6 +43,10 @@ class RAGService:
         llm_client: AbstractLLMClient,
         vector_store: AbstractVectorStore,
         collection: Optional[str] = None,
+        search_max_batch: int = 32,
+        search_max_wait_ms: float = 20.0,
+        semantic_cache: Optional[SemanticCache] = None,
+        local_index: Optional[AbstractVectorStore] = None,
     ):
         """
         Инициализация RAG сервиса
@@ -31,10 +55,45 @@ class RAGService:
             llm_client: Клиент LLM для генерации embeddings
             vector_store: Векторное хранилище для поиска
             collection: Название коллекции в хранилище
+            search_max_batch: Максимальное количество запросов search в одной пачке
+            search_max_wait_ms: Окно накопления конкурентных запросов search (мс)
+            semantic_cache: Кэш результатов search и generate_with_context
+                по близости embeddings запросов (опционально)
+            local_index: Локальный ANN-индекс (например, FaissLocalIndex) - зеркало
+                коллекции для поиска без сетевого запроса; vector_store остается
+                источником истины и используется, пока индекс не готов - до вызова
+                sync_local_index и до обучения индекса (опционально)
         """
         self.llm_client = llm_client
         self.vector_store = vector_store
         self.collection = collection or "king_embeddings"
+        self.semantic_cache = semantic_cache
+        self.local_index = local_index
+        self._query_processor = BatchingQueryProcessor(
+            llm_client,
+            vector_store,
+            collection=self.collection,
+            max_batch=search_max_batch,
+            max_wait_ms=search_max_wait_ms,
+            cache=semantic_cache,
+            local_store=local_index,
+        )
+
+    async def sync_local_index(self) -> None:
+        """
+        Заполнение локального индекса всеми векторами коллекции из vector_store
+
+        Вызывается при старте сервиса: без синхронизации зеркало содержало бы
+        только документы, добавленные этим процессом. Индексы без sync_from
+        (или при отсутствии local_index) не затрагиваются.
+
+        Raises:
+            NotImplementedError: Если vector_store не поддерживает iter_vectors
+        """
+        sync_from = getattr(self.local_index, "sync_from", None)
+        if sync_from is None:
+            return
+        await sync_from(self.vector_store, collection=self.collection)
 
     async def add_documents(self, texts: List[str], metadata: Optional[List[dict]] = None) -> None:
         """
@@ -57,55 +116,82 @@ class RAGService:
         
         if metadata is not None and len(metadata) != len(texts):
             logger.warning(
-                f"Количество метаданных ({len(metadata)}) не совпадает с количеством текстов ({len(texts)})"
+                "Количество метаданных (%d) не совпадает с количеством текстов (%d)",
+                len(metadata),
+                len(texts),
             )
 
-        from king.core.ports.vector_store import Vector
-        from uuid import uuid4
-
-        vectors = []
+        # Валидация всех текстов до первого обращения к провайдеру embeddings:
+        # пары (текст, метаданные) и индексы уникальных текстов (одинаковые
+        # тексты векторизуются один раз)
+        pairs: List[Tuple[str, dict]] = []
+        unique: Dict[str, int] = {}
         for i, text in enumerate(texts):
-            # Валидация текста
             if not isinstance(text, str):
                 raise ValueError(f"Текст на позиции {i} должен быть строкой, получен {type(text)}")
             
             if not text.strip():
-                logger.warning(f"Пропущен пустой текст на позиции {i}")
+                logger.warning("Пропущен пустой текст на позиции %d", i)
                 continue
-            # Генерация embeddings для текста
+            pairs.append((text, metadata[i] if metadata and i < len(metadata) else _EMPTY_METADATA))
+            unique.setdefault(text, len(unique))
+
+        if len(unique) < len(pairs):
+            logger.info(
+                "Дедупликация текстов: %d -> %d (%.0f%% повторов)",
+                len(pairs),
+                len(unique),
+                100 * (1 - len(unique) / len(pairs)),
+            )
+
+        unique_texts = list(unique)
+        embeddings: List[List[float]] = []
+        for start in range(0, len(unique_texts), EMBEDDINGS_BATCH_SIZE):
+            # Генерация embeddings для пачки текстов одним запросом
             try:
-                embedding = await self.llm_client.get_embeddings(text)
+                embeddings.extend(
+                    await self.llm_client.get_embeddings_batch(
+                        unique_texts[start:start + EMBEDDINGS_BATCH_SIZE]
+                    )
+                )
             except NotImplementedError:
+                raise self._embeddings_not_supported()
+            except Exception as e:
                 logger.error(
-                    f"Embeddings не поддерживаются для {type(self.llm_client).__name__}. "
-                    "RAG функциональность недоступна."
+                    "Ошибка при генерации embeddings для текстов %d-%d: %s",
+                    start,
+                    min(start + EMBEDDINGS_BATCH_SIZE, len(unique_texts)) - 1,
+                    e,
+                    exc_info=True,
                 )
-                raise ValueError(
-                    f"Embeddings не поддерживаются текущим LLM адаптером "
-                    f"({type(self.llm_client).__name__}). "
-                    "Для использования RAG необходим LLM адаптер с поддержкой embeddings."
-                )
-            except Exception as e:
-                logger.error(f"Ошибка при генерации embeddings для текста {i}: {e}", exc_info=True)
                 raise
 
-            # Создание вектора с метаданными
-            vector = Vector(
+        # Создание векторов с метаданными (дубликаты получают общий embedding)
+        vectors = [
+            Vector(
                 id=str(uuid4()),
-                vector=embedding,
-                metadata={
-                    "text": text,
-                    **(metadata[i] if metadata and i < len(metadata) else {}),
-                },
+                vector=embeddings[unique[text]],
+                metadata={"text": text, **meta},
             )
-            vectors.append(vector)
+            for text, meta in pairs
+        ]
 
         # Добавление векторов в хранилище
         await self.vector_store.add_vectors(vectors, collection=self.collection)
-        logger.info(f"Добавлено {len(vectors)} документов в коллекцию {self.collection}")
+        if self.local_index is not None:
+            await self.local_index.add_vectors(vectors, collection=self.collection)
+        if self.semantic_cache is not None:
+            # Сохраненные результаты не учитывают новые документы
+            self.semantic_cache.clear()
+        logger.info("Добавлено %d документов в коллекцию %s", len(vectors), self.collection)
 
     async def search(
-        self, query: str, top_k: int = 5, filter: Optional[dict] = None
+        self,
+        query: str,
+        top_k: int = 5,
+        filter: Optional[FilterLike] = None,
+        *,
+        embedding: Optional[List[float]] = None,
     ) -> List[SearchResult]:
         """
         Поиск релевантных документов
@@ -114,6 +200,7 @@ class RAGService:
             query: Текст запроса
             top_k: Количество результатов
             filter: Фильтр по метаданным
+            embedding: Уже вычисленный embedding запроса (опционально)
 
         Returns:
             Список результатов поиска
@@ -122,42 +209,26 @@ class RAGService:
             ValueError: Если query пуст или невалиден
             NotImplementedError: Если embeddings не поддерживаются
         """
-        # Валидация входных данных
-        if not query or not isinstance(query, str):
-            raise ValueError("query должен быть непустой строкой")
-        
-        if not query.strip():
-            raise ValueError("query не может быть пустой строкой")
-        
-        if top_k <= 0:
-            raise ValueError("top_k должен быть положительным числом")
-        
-        # Генерация embeddings для запроса
+        self._validate_query(query, top_k)
+
+        # Хранилище векторизует запрос само - без обращения к провайдеру embeddings
+        if embedding is None and self.vector_store.supports_text_query:
+            results = await self.vector_store.search_text(
+                query, top_k=top_k, collection=self.collection, filter=filter
+            )
+            logger.info("Найдено %d релевантных документов для запроса", len(results))
+            return results
+
+        # Конкурентные запросы объединяются в одну пачку embeddings + search_batch
         try:
-            query_embedding = await self.llm_client.get_embeddings(query)
+            results = await self._query_processor.submit(query, top_k, filter, embedding)
         except NotImplementedError:
-            logger.error(
-                f"Embeddings не поддерживаются для {type(self.llm_client).__name__}. "
-                "RAG поиск недоступен."
-            )
-            raise ValueError(
-                f"Embeddings не поддерживаются текущим LLM адаптером "
-                f"({type(self.llm_client).__name__}). "
-                "Для использования RAG необходим LLM адаптер с поддержкой embeddings."
-            )
+            raise self._embeddings_not_supported()
         except Exception as e:
-            logger.error(f"Ошибка при генерации embeddings для запроса: {e}", exc_info=True)
+            logger.error("Ошибка при поиске документов: %s", e, exc_info=True)
             raise
 
-        # Поиск в векторном хранилище
-        results = await self.vector_store.search(
-            query_vector=query_embedding,
-            top_k=top_k,
-            collection=self.collection,
-            filter=filter,
-        )
-
-        logger.info(f"Найдено {len(results)} релевантных документов для запроса")
+        logger.info("Найдено %d релевантных документов для запроса", len(results))
         return results
 
     async def generate_with_context(
@@ -183,14 +254,47 @@ class RAGService:
             ValueError: Если query невалиден или не найдено контекста
             NotImplementedError: Если embeddings не поддерживаются
         """
+        # Подготовка LLM клиента (токен, соединение) идет параллельно
+        # с поиском и форматированием контекста
+        prepare_task = asyncio.create_task(self.llm_client.prepare())
+        try:
+            return await self._generate_with_context(
+                query, top_k, context_template, prepare_task, **kwargs
+            )
+        finally:
+            if not prepare_task.done():
+                prepare_task.cancel()
+
+    async def _generate_with_context(
+        self,
+        query: str,
+        top_k: int,
+        context_template: Optional[str],
+        prepare_task: asyncio.Task,
+        **kwargs
+    ) -> str:
+        """Поиск контекста и генерация ответа (см. generate_with_context)"""
+        embedding = None
+        cache_key = None
+        if self.semantic_cache is not None:
+            self._validate_query(query, top_k)
+            try:
+                embedding = (await self.llm_client.get_embeddings_batch([query]))[0]
+            except NotImplementedError:
+                raise self._embeddings_not_supported()
+            cache_key = ("generate", top_k, context_template, repr(sorted(kwargs.items())))
+            cached = self.semantic_cache.get(embedding, cache_key)
+            if cached is not None:
+                return cached
+
         try:
             # Поиск релевантного контекста
-            search_results = await self.search(query, top_k=top_k)
+            search_results = await self.search(query, top_k=top_k, embedding=embedding)
         except (ValueError, NotImplementedError):
             # Пробрасываем известные ошибки
             raise
         except Exception as e:
-            logger.error(f"Ошибка при поиске контекста: {e}", exc_info=True)
+            logger.error("Ошибка при поиске контекста: %s", e, exc_info=True)
             raise ValueError(f"Не удалось найти релевантный контекст: {str(e)}") from e
 
         # Форматирование контекста
@@ -200,20 +304,71 @@ class RAGService:
             else:
                 context = self._format_context_default(search_results)
         except Exception as e:
-            logger.error(f"Ошибка при форматировании контекста: {e}", exc_info=True)
+            logger.error("Ошибка при форматировании контекста: %s", e, exc_info=True)
             raise ValueError(f"Не удалось отформатировать контекст: {str(e)}") from e
 
         # Создание промпта с контекстом
         enhanced_prompt = self._build_enhanced_prompt(query, context)
 
+        try:
+            await prepare_task
+        except Exception as e:
+            # generate выполнит подготовку сам
+            logger.warning("Не удалось подготовить LLM клиент: %s", e)
+
         # Генерация ответа через LLM
         try:
             response = await self.llm_client.generate(enhanced_prompt, **kwargs)
-            return response.content
         except Exception as e:
-            logger.error(f"Ошибка при генерации ответа через LLM: {e}", exc_info=True)
+            logger.error("Ошибка при генерации ответа через LLM: %s", e, exc_info=True)
             raise ValueError(f"Не удалось сгенерировать ответ: {str(e)}") from e
 
+        if cache_key is not None:
+            self.semantic_cache.put(embedding, cache_key, response.content)
+        return response.content
+
+    @staticmethod
+    def _validate_query(query: str, top_k: int) -> None:
+        """
+        Валидация поискового запроса
+
+        Raises:
+            ValueError: Если query пуст или top_k не положителен
+        """
+        if not query or not isinstance(query, str):
+            raise ValueError("query должен быть непустой строкой")
+        
+        if not query.strip():
+            raise ValueError("query не может быть пустой строкой")
+        
+        if top_k <= 0:
+            raise ValueError("top_k должен быть положительным числом")
+
+    def _embeddings_not_supported(self) -> ValueError:
+        """Ошибка для LLM адаптера без поддержки embeddings"""
+        logger.error(
+            "Embeddings не поддерживаются для %s. RAG поиск недоступен.",
+            type(self.llm_client).__name__,
+        )
+        return ValueError(
+            f"Embeddings не поддерживаются текущим LLM адаптером "
+            f"({type(self.llm_client).__name__}). "
+            "Для использования RAG необходим LLM адаптер с поддержкой embeddings."
+        )
+
+    def build_prompt(self, query: str, results: List[SearchResult]) -> str:
+        """
+        Построение промпта из запроса и уже найденных документов
+
+        Args:
+            query: Запрос пользователя
+            results: Результаты поиска (search)
+
+        Returns:
+            Промпт с контекстом (или исходный запрос, если документов нет)
+        """
+        return self._build_enhanced_prompt(query, self._format_context_default(results))
+
     def _format_context_default(self, results: List[SearchResult]) -> str:
         """
         Форматирование контекста по умолчанию
@@ -227,13 +382,14 @@ class RAGService:
         if not results:
             return ""
 
-        context_parts = []
-        for i, result in enumerate(results, 1):
-            text = result.metadata.get("text", "") if result.metadata else ""
-            score = result.score
-            context_parts.append(f"[{i}] (релевантность: {score:.2f})\n{text}")
-
-        return "\n\n".join(context_parts)
+        return "\n\n".join(
+            [
+                f"[{i}] (релевантность: {result.score:.2f})\n{metadata.get('text', '')}"
+                for i, (result, metadata) in enumerate(
+                    zip(results, [r.metadata or _EMPTY_METADATA for r in results]), 1
+                )
+            ]
+        )
 
     def _format_context_with_template(
         self, results: List[SearchResult], template: str
@@ -249,12 +405,8 @@ class RAGService:
             Отформатированный контекст
         """
         # Простая реализация - можно расширить с использованием Jinja2
-        context_texts = []
-        for result in results:
-            if result.metadata and "text" in result.metadata:
-                context_texts.append(result.metadata["text"])
-
-        return template.format(context="\n\n".join(context_texts))
+        maps = [r.metadata or _EMPTY_METADATA for r in results]
+        return template.format(context="\n\n".join([m["text"] for m in maps if "text" in m]))
 
     def _build_enhanced_prompt(self, query: str, context: str) -> str:
         """
@@ -270,13 +422,11 @@ class RAGService:
         if not context:
             return query
 
-        return f"""Используй следующую информацию для ответа на вопрос:
-
-{context}
-
-Вопрос: {query}
+        return "".join((_PROMPT_HEADER, context, _PROMPT_MID, query, _PROMPT_TAIL))
 
-Ответ:"""
+    async def close(self) -> None:
+        """Остановка фоновой задачи пакетирования поисковых запросов"""
+        await self._query_processor.close()
 
     async def health_check(self) -> bool:
         """
@@ -290,6 +440,6 @@ class RAGService:
             vector_store_ok = await self.vector_store.health_check()
             return llm_ok and vector_store_ok
         except Exception as e:
-            logger.error(f"Ошибка при проверке здоровья RAG: {e}", exc_info=True)
+            logger.error("Ошибка при проверке здоровья RAG: %s", e, exc_info=True)
             return False
 
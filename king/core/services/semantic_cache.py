@@ -0,0 +1,161 @@
+"""
+SemanticCache - кэш результатов RAG по близости embeddings запросов
+"""
+
+import math
+import operator
+import random
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from king.core.services.embedding_codec import encode_int8
+
+# Количество случайных гиперплоскостей LSH (бит сигнатуры)
+LSH_BITS = 8
+
+
+class SemanticCache:
+    """
+    LRU-кэш с поиском по косинусной близости embeddings
+
+    Запросы с одинаковым (или почти одинаковым) embedding получают
+    сохраненный результат без обращения к векторному хранилищу и LLM.
+    Кандидаты отбираются по LSH-сигнатуре (знаки проекций на случайные
+    гиперплоскости), косинус считается только внутри корзины сигнатуры.
+    Сохраненные embeddings квантуются в int8 (в 4 раза меньше памяти, чем float32).
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1024,
+        threshold: float = 0.95,
+        ttl_seconds: float = 300.0,
+        seed: int = 0,
+    ):
+        """
+        Инициализация кэша
+
+        Args:
+            capacity: Максимальное количество записей
+            threshold: Минимальная косинусная близость для попадания
+            ttl_seconds: Время жизни записи (секунды)
+            seed: Seed генератора гиперплоскостей LSH
+        """
+        self.capacity = capacity
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self._rng = random.Random(seed)
+        self._planes: List[array] = []
+        # id записи -> (int8-коды нормированного вектора, scale, ключ, значение,
+        #              срок истечения, сигнатура)
+        self._entries: "OrderedDict[int, Tuple[array, float, Any, Any, float, int]]" = OrderedDict()
+        # сигнатура LSH -> id записей
+        self._buckets: Dict[int, List[int]] = {}
+        self._next_id = 0
+
+    def get(self, embedding: Sequence[float], key: Any) -> Optional[Any]:
+        """
+        Поиск сохраненного значения для близкого embedding
+
+        Args:
+            embedding: Embedding запроса
+            key: Дополнительный ключ (параметры запроса), сравнивается на равенство
+
+        Returns:
+            Значение самой близкой записи или None при промахе
+        """
+        vector = self._normalize(embedding)
+        if vector is None or not self._planes or len(vector) != len(self._planes[0]):
+            return None
+
+        now = time.monotonic()
+        best_id, best_score = None, self.threshold
+        for entry_id in tuple(self._buckets.get(self._signature(vector), ())):
+            codes, scale, cached_key, _, expires_at, _ = self._entries[entry_id]
+            if expires_at <= now:
+                self._remove(entry_id)
+                continue
+            if cached_key != key:
+                continue
+            score = math.fsum(map(operator.mul, vector, codes)) * scale
+            if score >= best_score:
+                best_id, best_score = entry_id, score
+
+        if best_id is None:
+            return None
+
+        self._entries.move_to_end(best_id)
+        return self._entries[best_id][3]
+
+    def put(self, embedding: Sequence[float], key: Any, value: Any) -> None:
+        """
+        Сохранение значения
+
+        Args:
+            embedding: Embedding запроса
+            key: Дополнительный ключ (параметры запроса)
+            value: Сохраняемое значение
+        """
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+
+        if not self._planes:
+            self._planes = [
+                array("f", (self._rng.gauss(0.0, 1.0) for _ in range(len(vector))))
+                for _ in range(LSH_BITS)
+            ]
+        elif len(vector) != len(self._planes[0]):
+            # Сменилась модель embeddings - старые записи несопоставимы
+            self.clear()
+            return self.put(embedding, key, value)
+
+        while len(self._entries) >= self.capacity:
+            self._remove(next(iter(self._entries)))
+
+        signature = self._signature(vector)
+        data, scale = encode_int8(vector)
+        codes = array("b")
+        codes.frombytes(data)
+
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = (
+            codes, scale, key, value, time.monotonic() + self.ttl_seconds, signature
+        )
+        self._buckets.setdefault(signature, []).append(entry_id)
+
+    def clear(self) -> None:
+        """Очистка кэша (например, после добавления документов)"""
+        self._entries.clear()
+        self._buckets.clear()
+        self._planes = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, entry_id: int) -> None:
+        """Удаление записи из LRU и корзины LSH"""
+        signature = self._entries.pop(entry_id)[5]
+        bucket = self._buckets[signature]
+        bucket.remove(entry_id)
+        if not bucket:
+            del self._buckets[signature]
+
+    def _signature(self, vector: array) -> int:
+        """LSH-сигнатура: биты знаков проекций на гиперплоскости"""
+        signature = 0
+        for bit, plane in enumerate(self._planes):
+            if math.fsum(map(float.__mul__, vector, plane)) >= 0:
+                signature |= 1 << bit
+        return signature
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> Optional[array]:
+        """Нормировка вектора (косинус сводится к скалярному произведению)"""
+        norm = math.sqrt(math.fsum(x * x for x in embedding))
+        if norm == 0:
+            return None
+        return array("f", (x / norm for x in embedding))
@@ -2,6 +2,7 @@
 TaskScheduler - планирование и распределение задач
 """
 
+import asyncio
 import logging
 from typing import List, Optional
 
@@ -10,6 +11,9 @@ from king.core.ports.repositories import IAgentRepository, ITaskRepository
 
 logger = logging.getLogger(__name__)
 
+# Максимальное количество задач, планируемых одновременно
+SCHEDULE_CONCURRENCY = 16
+
 
 class TaskScheduler:
     """
@@ -37,6 +41,11 @@ class TaskScheduler:
         self.agent_repository = agent_repository
         self.agent_orchestrator = agent_orchestrator
         self.event_bus = event_bus
+        # Метод публикации определяется один раз, а не на каждое событие
+        self._publish_callable = getattr(event_bus, "publish", None) if event_bus else None
+        self._publish_many_callable = (
+            getattr(event_bus, "publish_many", None) if event_bus else None
+        )
 
     async def create_task(
         self,
@@ -57,8 +66,13 @@ class TaskScheduler:
         Returns:
             Созданная задача
         """
+        # TaskType.parse - поиск в таблице _TYPE_IDX; строковое значение
+        # вычисляется один раз для события и лога
+        task_type = TaskType.parse(task_type) if isinstance(task_type, str) else task_type
+        type_name = str(task_type)
+
         task = Task(
-            type=TaskType(task_type) if isinstance(task_type, str) else task_type,
+            type=task_type,
             status=TaskStatus.CREATED,
             payload=payload,
             metadata={**(metadata or {}), "priority": priority},
@@ -67,15 +81,15 @@ class TaskScheduler:
         task = await self.task_repository.create(task)
 
         # Публикация события создания задачи
-        if self.event_bus:
+        if self._publish_callable is not None:
             event = TaskCreated(
                 task_id=task.id,
-                task_type=task.type.value,
+                task_type=type_name,
                 payload=task.payload,
             )
             await self._publish_event(event)
 
-        logger.info(f"Создана задача: {task.id} (тип: {task.type.value})")
+        logger.info("Создана задача: %s (тип: %s)", task.id, type_name)
 
         # Автоматическое назначение задачи, если есть оркестратор
         if self.agent_orchestrator:
@@ -90,16 +104,29 @@ class TaskScheduler:
         Args:
             task_id: ID задачи
 
+        Returns:
+            Обновленная задача или None если не найдена
+        """
+        return await self._schedule(task_id)
+
+    async def _schedule(self, task_id: str, events: Optional[List] = None) -> Optional[Task]:
+        """
+        Планирование задачи с публикацией события сразу или в пачке
+
+        Args:
+            task_id: ID задачи
+            events: Список для накопления событий (None - публиковать сразу)
+
         Returns:
             Обновленная задача или None если не найдена
         """
         task = await self.task_repository.get_by_id(task_id)
         if not task:
-            logger.warning(f"Задача {task_id} не найдена")
+            logger.warning("Задача %s не найдена", task_id)
             return None
 
         if task.status != TaskStatus.CREATED:
-            logger.warning(f"Задача {task_id} уже назначена или выполнена")
+            logger.warning("Задача %s уже назначена или выполнена", task_id)
             return task
 
         # Поиск подходящего агента
@@ -110,7 +137,7 @@ class TaskScheduler:
             agent = await self.agent_orchestrator.find_available_agent(required_capabilities)
 
         if not agent:
-            logger.warning(f"Не найден доступный агент для задачи {task_id}")
+            logger.warning("Не найден доступный агент для задачи %s", task_id)
             return task
 
         # Назначение задачи агенту
@@ -122,44 +149,134 @@ class TaskScheduler:
                 task = await self.task_repository.update(task)
 
             # Публикация события назначения задачи
-            if self.event_bus:
+            if self._publish_callable is not None:
                 event = TaskAssigned(task_id=task.id, agent_id=agent.id)
-                await self._publish_event(event)
+                if events is not None:
+                    events.append(event)
+                else:
+                    await self._publish_event(event)
 
-            logger.info(f"Задача {task_id} назначена агенту {agent.id}")
+            logger.info("Задача %s назначена агенту %s", task_id, agent.id)
             return task
 
         except Exception as e:
-            logger.error(f"Ошибка при назначении задачи {task_id}: {e}", exc_info=True)
+            logger.error("Ошибка при назначении задачи %s: %s", task_id, e, exc_info=True)
             return task
 
-    async def get_pending_tasks(self) -> List[Task]:
+    async def get_pending_tasks(self, limit: Optional[int] = None) -> List[Task]:
         """
         Получение задач, ожидающих выполнения
 
+        Args:
+            limit: Максимальное количество задач (None - без ограничения)
+
         Returns:
             Список задач в статусе CREATED или ASSIGNED
         """
-        return await self.task_repository.get_pending()
+        return await self.task_repository.get_pending(limit=limit)
 
-    async def schedule_all_pending(self) -> int:
+    async def schedule_all_pending(
+        self, limit: Optional[int] = None, concurrency: int = SCHEDULE_CONCURRENCY
+    ) -> int:
         """
         Планирование всех ожидающих задач
 
+        Если оркестратор поддерживает пакетные операции, задачи планируются
+        пакетно (см. _schedule_bulk). Иначе - конкурентно (не более concurrency
+        одновременно), ожидание репозиториев и оркестратора перекрывается.
+        События назначения в обоих случаях публикуются одним вызовом
+        publish_many после планирования.
+
+        Args:
+            limit: Максимальное количество задач за вызов (None - все)
+            concurrency: Максимальное количество одновременно планируемых задач
+
         Returns:
             Количество запланированных задач
         """
-        pending_tasks = await self.get_pending_tasks()
-        scheduled_count = 0
+        pending_tasks = await self.get_pending_tasks(limit=limit)
 
-        for task in pending_tasks:
-            scheduled = await self.schedule_task(task.id)
-            if scheduled and scheduled.status == TaskStatus.ASSIGNED:
+        if hasattr(self.agent_orchestrator, "assign_task_to_agent_bulk"):
+            scheduled_count = await self._schedule_bulk(
+                [task for task in pending_tasks if task.status == TaskStatus.CREATED]
+            )
+            logger.info("Запланировано задач: %d из %d", scheduled_count, len(pending_tasks))
+            return scheduled_count
+
+        semaphore = asyncio.Semaphore(concurrency)
+        pending_events: List = []
+
+        async def schedule_one(task_id: str) -> Optional[Task]:
+            async with semaphore:
+                return await self._schedule(task_id, pending_events)
+
+        # Уже назначенные задачи schedule_task пропускает - не запрашиваем их повторно
+        results = await asyncio.gather(
+            *(
+                schedule_one(task.id)
+                for task in pending_tasks
+                if task.status == TaskStatus.CREATED
+            ),
+            return_exceptions=True,
+        )
+
+        scheduled_count = 0
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("Ошибка при планировании задачи: %s", result, exc_info=result)
+            elif result and result.status == TaskStatus.ASSIGNED:
                 scheduled_count += 1
 
-        logger.info(f"Запланировано задач: {scheduled_count} из {len(pending_tasks)}")
+        if pending_events:
+            await self._publish_events(pending_events)
+
+        logger.info("Запланировано задач: %d из %d", scheduled_count, len(pending_tasks))
         return scheduled_count
 
+    async def _schedule_bulk(self, tasks: List[Task]) -> int:
+        """
+        Пакетное назначение задач
+
+        Задачи упорядочиваются по приоритету (по убыванию), агенты ищутся
+        одним вызовом find_available_agents, назначения сохраняются одним
+        вызовом assign_task_to_agent_bulk, события публикуются одной пачкой.
+
+        Args:
+            tasks: Задачи в статусе CREATED
+
+        Returns:
+            Количество назначенных задач
+        """
+        if not tasks:
+            return 0
+
+        tasks = sorted(tasks, key=lambda task: task.metadata.get("priority", 0), reverse=True)
+        agents = await self.agent_orchestrator.find_available_agents(
+            [task.metadata.get("required_capabilities") for task in tasks]
+        )
+
+        assignments = []
+        for task, agent in zip(tasks, agents):
+            if task.status != TaskStatus.CREATED:
+                # Задача назначена конкурентно, пока искались агенты
+                continue
+            if agent:
+                assignments.append((task, agent.id))
+            else:
+                logger.warning("Не найден доступный агент для задачи %s", task.id)
+
+        try:
+            assigned = await self.agent_orchestrator.assign_task_to_agent_bulk(assignments)
+        except Exception as e:
+            logger.error("Ошибка при пакетном назначении задач: %s", e, exc_info=True)
+            return 0
+
+        if assigned:
+            await self._publish_events(
+                [TaskAssigned(task_id=task.id, agent_id=task.assigned_agent) for task in assigned]
+            )
+        return len(assigned)
+
     async def get_task(self, task_id: str) -> Optional[Task]:
         """
         Получение задачи по ID
@@ -191,9 +308,25 @@ class TaskScheduler:
         Args:
             event: Доменное событие
         """
-        if self.event_bus and hasattr(self.event_bus, "publish"):
+        if self._publish_callable is not None:
+            try:
+                await self._publish_callable(event)
+            except Exception as e:
+                logger.warning("Не удалось опубликовать событие: %s", e)
+
+    async def _publish_events(self, events: List) -> None:
+        """
+        Публикация нескольких событий одним вызовом event bus
+
+        Args:
+            events: Доменные события
+        """
+        if self._publish_many_callable is not None:
             try:
-                await self.event_bus.publish(event)
+                await self._publish_many_callable(events)
             except Exception as e:
-                logger.warning(f"Не удалось опубликовать событие: {e}")
+                logger.warning("Не удалось опубликовать события: %s", e)
+        else:
+            for event in events:
+                await self._publish_event(event)
 
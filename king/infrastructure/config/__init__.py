@@ -2,6 +2,7 @@
 Конфигурация системы
 """
 
+from king.infrastructure.config.cached_config import CachedConfigProvider
 from king.infrastructure.config.config_loader import ConfigLoader
 from king.infrastructure.config.environment_config import EnvironmentConfig
 from king.infrastructure.config.settings import (
@@ -17,6 +18,7 @@ from king.infrastructure.config.settings import (
 )
 
 __all__ = [
+    "CachedConfigProvider",
     "ConfigLoader",
     "EnvironmentConfig",
     "Settings",
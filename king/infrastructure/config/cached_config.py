@@ -0,0 +1,106 @@
+"""
+CachedConfigProvider - кэш типизированных значений конфигурации по схеме
+"""
+
+import logging
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class CachedConfigProvider:
+    """
+    Миксин для провайдеров конфигурации (AbstractConfigProvider)
+
+    Компилирует схему "ключ -> тип" в плоский словарь уже приведенных значений,
+    после чего чтение ключа схемы - одно обращение к словарю.
+    Кэш инвалидируется счетчиком поколений при перезагрузке конфигурации.
+    """
+
+    _MISSING = object()
+
+    # Пустые значения по умолчанию: до compile_schema get_typed поднимает KeyError
+    # (словари только заменяются целиком, поэтому разделение классом безопасно)
+    _schema: Dict[str, type] = {}
+    _typed: Dict[str, Any] = {}
+    _generation: int = 0
+    _compiled_generation: int = -1
+
+    def compile_schema(self, schema: Dict[str, type]) -> None:
+        """
+        Предварительная материализация типизированных значений по схеме
+
+        Args:
+            schema: Словарь "ключ -> тип" (str, int, bool, float)
+        """
+        self._schema = dict(schema)
+        self._materialize()
+
+    def get_typed(self, key: str) -> Any:
+        """
+        Получение типизированного значения из скомпилированной схемы
+
+        Args:
+            key: Ключ конфигурации из схемы
+
+        Returns:
+            Типизированное значение
+
+        Raises:
+            KeyError: Если ключ не входит в скомпилированную схему
+        """
+        if self._compiled_generation != self._generation:
+            self._materialize()
+        return self._typed[key]
+
+    def _invalidate_schema(self) -> None:
+        """Инвалидация кэша (вызывается при перезагрузке конфигурации)"""
+        self._generation += 1
+
+    def _get_cached(self, key: str, type_: type) -> Any:
+        """
+        Быстрый путь для get_bool/get_int
+
+        Returns:
+            Значение из кэша или _MISSING, если ключ не скомпилирован с этим типом
+            или отсутствует в конфигурации
+        """
+        if self._schema.get(key) is not type_:
+            return self._MISSING
+        if self._compiled_generation != self._generation:
+            self._materialize()
+        value = self._typed.get(key)
+        return self._MISSING if value is None else value
+
+    def _materialize(self) -> None:
+        """Приведение значений всех ключей схемы к их типам"""
+        # Сбрасываем схему на время материализации, чтобы get_bool/get_int
+        # читали исходные значения, а не кэш
+        schema, self._schema = self._schema, {}
+        typed: Dict[str, Any] = {}
+        try:
+            for key, type_ in schema.items():
+                if self.get(key) is None:
+                    typed[key] = None
+                    continue
+
+                if type_ is bool:
+                    value = self.get_bool(key)
+                elif type_ is int:
+                    value = self.get_int(key)
+                else:
+                    value = self.get(key)
+                    if value is not None and not isinstance(value, type_):
+                        try:
+                            value = type_(value)
+                        except (ValueError, TypeError):
+                            logger.warning(
+                                f"Не удалось преобразовать '{key}' в {type_.__name__}"
+                            )
+                            value = None
+                typed[key] = value
+        finally:
+            self._schema = schema
+
+        self._typed = typed
+        self._compiled_generation = self._generation
@@ -2,19 +2,59 @@
 ConfigLoader для загрузки конфигурации из YAML/JSON файлов
 """
 
+import codecs
+import copy
 import json
 import logging
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional, Tuple
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from king.core.ports.config import AbstractConfigProvider
+from king.infrastructure.config.cached_config import CachedConfigProvider
 
 logger = logging.getLogger(__name__)
 
+# путь -> ((st_mtime_ns, st_size), разобранное содержимое файла, плоский словарь ключей)
+# Одна запись на файл: изменение файла вытесняет прежнюю версию. Содержимое
+# разделяется экземплярами и наружу отдается только копиями.
+_PARSE_CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, Any], Dict[str, Any]]] = {}
+
+
+def _flatten(data: Dict[str, Any], prefix: str = "") -> Iterator[Tuple[str, Any]]:
+    """
+    Обход вложенной конфигурации с ключами через точку
+
+    Вложенные словари тоже попадают в результат, поэтому разрешаются
+    и "db", и "db.host".
+
+    Args:
+        data: Словарь конфигурации
+        prefix: Префикс ключей ("db.")
 
-class ConfigLoader(AbstractConfigProvider):
+    Yields:
+        Пары (ключ через точку, значение)
+    """
+    for key, value in data.items():
+        full_key = f"{prefix}{key}"
+        yield full_key, value
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{full_key}.")
+
+
+class ConfigLoader(CachedConfigProvider, AbstractConfigProvider):
     """
     Загрузчик конфигурации из YAML/JSON файлов
     Поддерживает вложенные ключи через точку (например, "db.host")
@@ -31,6 +71,8 @@ class ConfigLoader(AbstractConfigProvider):
         self.config_path = Path(config_path)
         self.encoding = encoding
         self._config: Dict[str, Any] = {}
+        # "db.host" -> значение; get выполняет один поиск в словаре
+        self._flat: Dict[str, Any] = {}
         self._load_config()
 
     def _load_config(self) -> None:
@@ -40,15 +82,33 @@ class ConfigLoader(AbstractConfigProvider):
             return
 
         try:
-            with open(self.config_path, "r", encoding=self.encoding) as f:
-                if self.config_path.suffix in [".yaml", ".yml"]:
-                    self._config = yaml.safe_load(f) or {}
-                elif self.config_path.suffix == ".json":
-                    self._config = json.load(f) or {}
-                else:
-                    raise ValueError(
-                        f"Неподдерживаемый формат файла: {self.config_path.suffix}"
-                    )
+            stat = self.config_path.stat()
+            cache_path = str(self.config_path.resolve())
+            version = (stat.st_mtime_ns, stat.st_size)
+            cached = _PARSE_CACHE.get(cache_path)
+            if cached is not None and cached[0] == version:
+                _, self._config, self._flat = cached
+                logger.debug("Конфигурация %s не изменилась, используется кэш", self.config_path)
+                return
+
+            if self.config_path.suffix not in (".yaml", ".yml", ".json"):
+                raise ValueError(
+                    f"Неподдерживаемый формат файла: {self.config_path.suffix}"
+                )
+
+            # Файл читается целиком; UTF-8 передается парсерам как bytes
+            # без декодирования в Python
+            content = self.config_path.read_bytes()
+            if codecs.lookup(self.encoding).name != "utf-8":
+                content = content.decode(self.encoding)
+
+            if self.config_path.suffix == ".json":
+                loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+                self._config = loads(content) or {}
+            else:
+                self._config = yaml.load(content, Loader=_YamlLoader) or {}
+            self._flat = dict(_flatten(self._config)) if isinstance(self._config, dict) else {}
+            _PARSE_CACHE[cache_path] = (version, self._config, self._flat)
             logger.info(f"Конфигурация загружена из {self.config_path}")
         except Exception as e:
             logger.error(f"Ошибка при загрузке конфигурации: {e}")
@@ -78,8 +138,11 @@ class ConfigLoader(AbstractConfigProvider):
 
     def get(self, key: str, default: Any = None) -> Any:
         """Получение значения конфигурации"""
-        value = self._get_nested_value(self._config, key)
-        return value if value is not None else default
+        value = self._flat.get(key)
+        if value is None:
+            return default
+        # Вложенные словари и списки разделяются через _PARSE_CACHE
+        return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
 
     def get_secret(self, key: str) -> str:
         """Получение секретного значения"""
@@ -90,6 +153,9 @@ class ConfigLoader(AbstractConfigProvider):
 
     def get_bool(self, key: str, default: bool = False) -> bool:
         """Получение булевого значения"""
+        cached = self._get_cached(key, bool)
+        if cached is not self._MISSING:
+            return cached
         value = self.get(key, default)
         if isinstance(value, bool):
             return value
@@ -99,6 +165,9 @@ class ConfigLoader(AbstractConfigProvider):
 
     def get_int(self, key: str, default: int = 0) -> int:
         """Получение целочисленного значения"""
+        cached = self._get_cached(key, int)
+        if cached is not self._MISSING:
+            return cached
         value = self.get(key, default)
         try:
             return int(value)
@@ -109,8 +178,10 @@ class ConfigLoader(AbstractConfigProvider):
     def reload(self) -> None:
         """Перезагрузка конфигурации из файла"""
         self._load_config()
+        self._invalidate_schema()
 
     def get_all(self) -> Dict[str, Any]:
         """Получение всей конфигурации"""
-        return self._config.copy()
+        # Разобранный файл разделяется экземплярами через _PARSE_CACHE
+        return copy.deepcopy(self._config)
 
@@ -4,17 +4,32 @@ EnvironmentConfig для загрузки конфигурации из пере
 
 import logging
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
 
 from dotenv import load_dotenv
 
 from king.core.ports.config import AbstractConfigProvider
+from king.infrastructure.config.cached_config import CachedConfigProvider
 
 logger = logging.getLogger(__name__)
 
 
-class EnvironmentConfig(AbstractConfigProvider):
+@lru_cache(maxsize=1024)
+def _normalize(key: str) -> str:
+    """Преобразование "db.host" в "DB__HOST" (кэшируется на ключ)"""
+    return key.replace(".", "__").upper()
+
+
+@lru_cache(maxsize=1024)
+def _denormalize(env_key: str) -> str:
+    """Преобразование "DB__HOST" в "db.host" (кэшируется на ключ)"""
+    return env_key.replace("__", ".").lower()
+
+
+class EnvironmentConfig(CachedConfigProvider, AbstractConfigProvider):
     """
     Провайдер конфигурации из переменных окружения
     Поддерживает .env файлы и вложенные ключи через двойное подчеркивание
@@ -43,6 +58,19 @@ class EnvironmentConfig(AbstractConfigProvider):
                 load_dotenv(default_env, override=override)
                 logger.info(f"Переменные окружения загружены из {default_env}")
 
+        # Префикс переменных проекта для get_all (пустой - все переменные)
+        self._prefix = os.getenv("KING_ENV_PREFIX", "")
+
+        # Снимок окружения: get выполняет поиск в обычном словаре
+        self._env: Dict[str, str] = dict(os.environ)
+        self._env_view: Optional[Mapping[str, str]] = None
+
+    def refresh(self) -> None:
+        """Обновление снимка переменных окружения (после изменения os.environ)"""
+        self._env = dict(os.environ)
+        self._env_view = None
+        self._invalidate_schema()
+
     def _normalize_key(self, key: str) -> str:
         """
         Нормализация ключа для переменных окружения
@@ -55,7 +83,7 @@ class EnvironmentConfig(AbstractConfigProvider):
             Нормализованный ключ для переменной окружения
         """
         # Заменяем точку на двойное подчеркивание и приводим к верхнему регистру
-        return key.replace(".", "__").upper()
+        return _normalize(key)
 
     def _denormalize_key(self, env_key: str) -> str:
         """
@@ -68,13 +96,11 @@ class EnvironmentConfig(AbstractConfigProvider):
         Returns:
             Денормализованный ключ
         """
-        return env_key.replace("__", ".").lower()
+        return _denormalize(env_key)
 
     def get(self, key: str, default: Any = None) -> Any:
         """Получение значения из переменных окружения"""
-        env_key = self._normalize_key(key)
-        value = os.getenv(env_key, default)
-        return value
+        return self._env.get(_normalize(key), default)
 
     def get_secret(self, key: str) -> str:
         """Получение секретного значения"""
@@ -85,6 +111,9 @@ class EnvironmentConfig(AbstractConfigProvider):
 
     def get_bool(self, key: str, default: bool = False) -> bool:
         """Получение булевого значения"""
+        cached = self._get_cached(key, bool)
+        if cached is not self._MISSING:
+            return cached
         value = self.get(key)
         if value is None:
             return default
@@ -99,6 +128,9 @@ class EnvironmentConfig(AbstractConfigProvider):
 
     def get_int(self, key: str, default: int = 0) -> int:
         """Получение целочисленного значения"""
+        cached = self._get_cached(key, int)
+        if cached is not self._MISSING:
+            return cached
         value = self.get(key)
         if value is None:
             return default
@@ -111,9 +143,18 @@ class EnvironmentConfig(AbstractConfigProvider):
             )
             return default
 
-    def get_all(self) -> dict:
-        """Получение всех переменных окружения, связанных с проектом"""
-        # Фильтруем переменные окружения по префиксу (опционально)
-        # Для простоты возвращаем все, но можно добавить фильтрацию
-        return dict(os.environ)
+    def get_all(self) -> Mapping[str, str]:
+        """
+        Получение всех переменных окружения, связанных с проектом
+
+        Returns:
+            Неизменяемое представление переменных с префиксом KING_ENV_PREFIX
+            (строится один раз до следующего refresh)
+        """
+        if self._env_view is None:
+            prefix = self._prefix
+            self._env_view = MappingProxyType(
+                {key: value for key, value in self._env.items() if key.startswith(prefix)}
+            )
+        return self._env_view
 
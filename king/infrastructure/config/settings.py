@@ -2,10 +2,11 @@
 Настройки приложения с валидацией через Pydantic
 """
 
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Annotated, Literal, Optional, Tuple
 
-from pydantic import Field, field_validator
+from pydantic import BeforeValidator, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -17,7 +18,7 @@ class DatabaseSettings(BaseSettings):
     max_overflow: int = Field(default=20, description="Максимальное переполнение пула")
     echo: bool = Field(default=False, description="Логирование SQL запросов")
 
-    model_config = SettingsConfigDict(env_prefix="DATABASE_")
+    model_config = SettingsConfigDict(env_prefix="DATABASE_", defer_build=True)
 
 
 class RedisSettings(BaseSettings):
@@ -26,7 +27,7 @@ class RedisSettings(BaseSettings):
     url: str = Field(default="redis://localhost:6379/0", description="URL подключения к Redis")
     decode_responses: bool = Field(default=True, description="Декодирование ответов")
 
-    model_config = SettingsConfigDict(env_prefix="REDIS_")
+    model_config = SettingsConfigDict(env_prefix="REDIS_", defer_build=True)
 
 
 class KafkaSettings(BaseSettings):
@@ -38,7 +39,7 @@ class KafkaSettings(BaseSettings):
     topic_prefix: str = Field(default="king", description="Префикс топиков")
     consumer_group: Optional[str] = Field(default=None, description="Группа потребителей")
 
-    model_config = SettingsConfigDict(env_prefix="KAFKA_")
+    model_config = SettingsConfigDict(env_prefix="KAFKA_", defer_build=True)
 
 
 class GigaChatSettings(BaseSettings):
@@ -55,7 +56,13 @@ class GigaChatSettings(BaseSettings):
         description="Базовый URL API GigaChat",
     )
 
-    model_config = SettingsConfigDict(env_prefix="GIGACHAT_")
+    model_config = SettingsConfigDict(env_prefix="GIGACHAT_", defer_build=True)
+
+
+# Уровень логирования: регистр не важен, допустимые значения проверяет pydantic-core
+LogLevel = Annotated[
+    Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], BeforeValidator(str.upper)
+]
 
 
 class AppSettings(BaseSettings):
@@ -64,23 +71,19 @@ class AppSettings(BaseSettings):
     name: str = Field(default="KING", description="Название приложения")
     version: str = Field(default="1.0.0", description="Версия приложения")
     debug: bool = Field(default=False, description="Режим отладки")
-    log_level: str = Field(default="INFO", description="Уровень логирования")
+    log_level: LogLevel = Field(default="INFO", description="Уровень логирования")
     secret_key: str = Field(..., description="Секретный ключ приложения")
-    allowed_origins: List[str] = Field(
-        default=["http://localhost:3000", "http://localhost:8000"],
+    allowed_origins: Tuple[str, ...] = Field(
+        default=("http://localhost:3000", "http://localhost:8000"),
         description="Разрешенные источники для CORS",
     )
 
-    @field_validator("log_level")
-    @classmethod
-    def validate_log_level(cls, v: str) -> str:
-        """Валидация уровня логирования"""
-        valid_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-        if v.upper() not in valid_levels:
-            raise ValueError(f"log_level должен быть одним из: {valid_levels}")
-        return v.upper()
+    @cached_property
+    def allowed_origins_set(self) -> frozenset:
+        """Разрешенные источники CORS для проверки вхождения за O(1)"""
+        return frozenset(self.allowed_origins)
 
-    model_config = SettingsConfigDict(env_prefix="APP_")
+    model_config = SettingsConfigDict(env_prefix="APP_", defer_build=True)
 
 
 class ObservabilitySettings(BaseSettings):
@@ -92,7 +95,7 @@ class ObservabilitySettings(BaseSettings):
     prometheus_port: int = Field(default=9090, description="Порт для метрик Prometheus")
     enable_tracing: bool = Field(default=True, description="Включить трейсинг")
 
-    model_config = SettingsConfigDict(env_prefix="OBSERVABILITY_")
+    model_config = SettingsConfigDict(env_prefix="OBSERVABILITY_", defer_build=True)
 
 
 class Settings(BaseSettings):
@@ -111,6 +114,8 @@ class Settings(BaseSettings):
         env_nested_delimiter="__",  # Для вложенных настроек: APP__DEBUG
         case_sensitive=False,
         extra="ignore",
+        # Валидаторы строятся при первой валидации, а не при импорте модуля
+        defer_build=True,
     )
 
     @classmethod
@@ -124,10 +129,7 @@ class Settings(BaseSettings):
         Returns:
             Экземпляр Settings
         """
-        # Сначала загружаем из переменных окружения
-        settings = cls()
-
-        # Затем перезаписываем значениями из файла (если есть)
+        file_config = {}
         if config_path.exists():
             import yaml
 
@@ -139,21 +141,24 @@ class Settings(BaseSettings):
 
                     file_config = json.load(f) or {}
 
-            # Обновляем настройки значениями из файла
-            # Pydantic автоматически обработает вложенные структуры
-            settings = cls.model_validate({**settings.model_dump(), **file_config})
-
-        return settings
+        # Одна валидация: значения из файла передаются как init-источник,
+        # который pydantic-settings объединяет с переменными окружения
+        # (значения файла имеют приоритет)
+        return cls(**file_config)
 
 
 # Глобальный экземпляр настроек (будет инициализирован при старте приложения)
 settings: Optional[Settings] = None
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """
     Получение глобальных настроек приложения
 
+    Результат кэшируется до следующего init_settings (исключение
+    до инициализации не кэшируется).
+
     Returns:
         Экземпляр Settings
 
@@ -182,5 +187,6 @@ def init_settings(config_path: Optional[Path] = None) -> Settings:
     else:
         settings = Settings()
 
+    get_settings.cache_clear()
     return settings
 
@@ -3,7 +3,8 @@ Dependency injection для FastAPI
 """
 
 import logging
-from typing import Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
 
 from fastapi import Depends
 
@@ -15,18 +16,16 @@ from king.core.ports.repositories import (
     IMessageRepository,
     ITaskRepository,
 )
-from king.core.services import (
-    AgentOrchestrator,
-    LLMService,
-    MessageProcessor,
-    TaskScheduler,
-)
 from king.infrastructure.config import get_settings, init_settings, Settings
-from king.infrastructure.persistence.in_memory_repositories import (
-    InMemoryAgentRepository,
-    InMemoryMessageRepository,
-    InMemoryTaskRepository,
-)
+
+if TYPE_CHECKING:
+    # Сервисы и реализации репозиториев импортируются в init_dependencies
+    from king.core.services import (
+        AgentOrchestrator,
+        LLMService,
+        MessageProcessor,
+        TaskScheduler,
+    )
 
 logger = logging.getLogger(__name__)
 
@@ -37,10 +36,10 @@ _agent_repository: Optional[IAgentRepository] = None
 _task_repository: Optional[ITaskRepository] = None
 _message_repository: Optional[IMessageRepository] = None
 _event_bus: Optional[EventBus] = None
-_llm_service: Optional[LLMService] = None
-_agent_orchestrator: Optional[AgentOrchestrator] = None
-_task_scheduler: Optional[TaskScheduler] = None
-_message_processor: Optional[MessageProcessor] = None
+_llm_service: Optional["LLMService"] = None
+_agent_orchestrator: Optional["AgentOrchestrator"] = None
+_task_scheduler: Optional["TaskScheduler"] = None
+_message_processor: Optional["MessageProcessor"] = None
 _message_queue: Optional[AbstractMessageQueue] = None
 
 
@@ -58,6 +57,18 @@ def init_dependencies(config_path: Optional[str] = None) -> None:
 
     from pathlib import Path
 
+    from king.core.services import (
+        AgentOrchestrator,
+        LLMService,
+        MessageProcessor,
+        TaskScheduler,
+    )
+    from king.infrastructure.persistence.in_memory_repositories import (
+        InMemoryAgentRepository,
+        InMemoryMessageRepository,
+        InMemoryTaskRepository,
+    )
+
     # Инициализация настроек
     if config_path:
         _settings = init_settings(Path(config_path))
@@ -139,9 +150,11 @@ def init_dependencies(config_path: Optional[str] = None) -> None:
         # Можно добавить инициализацию RabbitMQ здесь, если нужно
         logger.info("Messaging адаптер не инициализирован (Kafka не настроен)")
 
+    _clear_dependency_cache()
     logger.info("Все зависимости инициализированы")
 
 
+@lru_cache(maxsize=1)
 def get_settings_dep() -> Settings:
     """Dependency для получения настроек"""
     if _settings is None:
@@ -149,6 +162,7 @@ def get_settings_dep() -> Settings:
     return _settings
 
 
+@lru_cache(maxsize=1)
 def get_agent_repository() -> IAgentRepository:
     """Dependency для получения репозитория агентов"""
     if _agent_repository is None:
@@ -156,6 +170,7 @@ def get_agent_repository() -> IAgentRepository:
     return _agent_repository
 
 
+@lru_cache(maxsize=1)
 def get_task_repository() -> ITaskRepository:
     """Dependency для получения репозитория задач"""
     if _task_repository is None:
@@ -163,6 +178,7 @@ def get_task_repository() -> ITaskRepository:
     return _task_repository
 
 
+@lru_cache(maxsize=1)
 def get_message_repository() -> IMessageRepository:
     """Dependency для получения репозитория сообщений"""
     if _message_repository is None:
@@ -170,35 +186,65 @@ def get_message_repository() -> IMessageRepository:
     return _message_repository
 
 
-def get_llm_service() -> Optional[LLMService]:
+@lru_cache(maxsize=1)
+def get_llm_service() -> Optional["LLMService"]:
     """Dependency для получения LLM сервиса"""
     return _llm_service
 
 
-def get_agent_orchestrator() -> AgentOrchestrator:
+@lru_cache(maxsize=1)
+def get_agent_orchestrator() -> "AgentOrchestrator":
     """Dependency для получения оркестратора агентов"""
     if _agent_orchestrator is None:
         raise RuntimeError("Оркестратор агентов не инициализирован")
     return _agent_orchestrator
 
 
-def get_task_scheduler() -> TaskScheduler:
+@lru_cache(maxsize=1)
+def get_task_scheduler() -> "TaskScheduler":
     """Dependency для получения планировщика задач"""
     if _task_scheduler is None:
         raise RuntimeError("Планировщик задач не инициализирован")
     return _task_scheduler
 
 
-def get_message_processor() -> Optional[MessageProcessor]:
+@lru_cache(maxsize=1)
+def get_message_processor() -> Optional["MessageProcessor"]:
     """Dependency для получения процессора сообщений"""
     return _message_processor
 
 
+@lru_cache(maxsize=1)
 def get_message_queue() -> Optional[AbstractMessageQueue]:
     """Dependency для получения messaging адаптера"""
     return _message_queue
 
 
+def _clear_dependency_cache() -> None:
+    """
+    Сброс кэша dependency-функций
+
+    Функции вызываются FastAPI на каждый запрос; после инициализации их
+    результат не меняется и кэшируется (исключения до инициализации не
+    кэшируются). Кэш сбрасывается при каждой (пере)инициализации.
+    """
+    for dependency in _CACHED_DEPENDENCIES:
+        dependency.cache_clear()
+
+
+_CACHED_DEPENDENCIES = (
+    get_settings_dep,
+    get_agent_repository,
+    get_task_repository,
+    get_message_repository,
+    get_llm_service,
+    get_agent_orchestrator,
+    get_task_scheduler,
+    get_message_processor,
+    get_message_queue,
+)
+
+
 async def cleanup_dependencies() -> None:
     """Очистка ресурсов при завершении"""
     global _llm_client, _event_bus, _message_queue
@@ -213,6 +259,10 @@ async def cleanup_dependencies() -> None:
         await _message_queue.close()
         logger.info("Messaging адаптер закрыт")
 
+    # Остановка фоновой пакетной обработки embeddings
+    if _llm_service:
+        await _llm_service.close()
+
     # Закрытие LLM клиента
     if _llm_client and hasattr(_llm_client, "close"):
         await _llm_client.close()
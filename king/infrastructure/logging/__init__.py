@@ -2,9 +2,10 @@
 Логирование (OpenTelemetry)
 """
 
-from king.infrastructure.logging.setup import get_logger, setup_logging
+from king.infrastructure.logging.setup import get_logger, setup_logging, shutdown_logging
 
 __all__ = [
     "setup_logging",
     "get_logger",
+    "shutdown_logging",
 ]
@@ -2,13 +2,28 @@
 Настройка логирования для платформы KING
 """
 
+import atexit
+import copy
 import json
 import logging
+import queue
 import sys
+import time
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
 from king.infrastructure.config import get_settings
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Поток записи логов (форматирование и вывод в stdout вне вызывающего потока)
+_listener: Optional[QueueListener] = None
+
 
 def setup_logging(
     log_level: Optional[str] = None,
@@ -47,11 +62,18 @@ def setup_logging(
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
 
-    # Создание console handler
+    # Создание console handler; записи передаются ему через очередь
+    # в отдельном потоке QueueListener
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(numeric_level)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+
+    global _listener
+    shutdown_logging()
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+    _listener.start()
+    root_logger.addHandler(_LocalQueueHandler(log_queue))
 
     # Настройка уровней для сторонних библиотек
     logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -59,7 +81,55 @@ def setup_logging(
     logging.getLogger("urllib3").setLevel(logging.WARNING)
 
 
-class StructuredFormatter(logging.Formatter):
+def shutdown_logging() -> None:
+    """Остановка потока записи логов (оставшиеся записи выводятся)"""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+class _LocalQueueHandler(QueueHandler):
+    """
+    QueueHandler для очереди внутри процесса
+
+    Стандартный prepare форматирует запись в вызывающем потоке и убирает
+    exc_info (для передачи между процессами). Здесь в вызывающем потоке
+    только подставляются аргументы сообщения, форматирование (включая
+    трейсбек) выполняет форматтер console handler в потоке QueueListener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+@lru_cache(maxsize=4)
+def _format_seconds(seconds: int, datefmt: str) -> str:
+    """Время с точностью до секунды (записи одной секунды используют одну строку)"""
+    return time.strftime(datefmt, time.localtime(seconds))
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """Форматтер с кэшированием строки времени в пределах секунды"""
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        if datefmt:
+            return _format_seconds(int(record.created), datefmt)
+        # Формат logging.Formatter по умолчанию: "%Y-%m-%d %H:%M:%S,mmm"
+        return self.default_msec_format % (
+            _format_seconds(int(record.created), self.default_time_format),
+            record.msecs,
+        )
+
+
+class StructuredFormatter(_CachedTimeFormatter):
     """Структурированный форматтер для логов"""
 
     def __init__(self, enable_trace_id: bool = True):
@@ -74,41 +144,21 @@ class StructuredFormatter(logging.Formatter):
 
     def format(self, record: logging.LogRecord) -> str:
         """Форматирование записи лога"""
-        # Базовое форматирование
-        log_data = {
-            "timestamp": self.formatTime(record, self.datefmt),
-            "level": record.levelname,
-            "logger": record.name,
-            "message": record.getMessage(),
-        }
-
-        # Добавление trace_id если доступен
+        timestamp = self.formatTime(record, self.datefmt)
         if self.enable_trace_id and hasattr(record, "trace_id"):
-            log_data["trace_id"] = record.trace_id
+            prefix = f"[{timestamp}] trace_id={record.trace_id}"
+        else:
+            prefix = f"[{timestamp}]"
 
-        # Добавление исключений
-        if record.exc_info:
-            log_data["exception"] = self.formatException(record.exc_info)
-
-        # Добавление дополнительных полей
-        if hasattr(record, "extra_fields"):
-            log_data.update(record.extra_fields)
+        line = f"{prefix} {record.levelname:8s} {record.name:30s} - {record.getMessage()}"
 
-        # Форматирование в читаемый вид
-        parts = [
-            f"[{log_data['timestamp']}]",
-            f"{log_data['level']:8s}",
-            f"{log_data['logger']:30s}",
-            f"- {log_data['message']}",
-        ]
-
-        if "trace_id" in log_data:
-            parts.insert(1, f"trace_id={log_data['trace_id']}")
-
-        return " ".join(parts)
+        # Трейсбек исключения - на следующих строках
+        if record.exc_info:
+            line = f"{line}\n{self.formatException(record.exc_info)}"
+        return line
 
 
-class JSONFormatter(logging.Formatter):
+class JSONFormatter(_CachedTimeFormatter):
     """JSON форматтер для логов (для production)"""
 
     def __init__(self, enable_trace_id: bool = True):
@@ -142,13 +192,20 @@ class JSONFormatter(logging.Formatter):
         if hasattr(record, "extra_fields"):
             log_data.update(record.extra_fields)
 
+        if ORJSON_AVAILABLE:
+            # orjson пишет UTF-8 без экранирования; ключи extra_fields могут быть не строками
+            return orjson.dumps(log_data, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
         return json.dumps(log_data, ensure_ascii=False)
 
 
+@lru_cache(maxsize=1024)
 def get_logger(name: str) -> logging.Logger:
     """
     Получение логгера с указанным именем
 
+    Логгеры не удаляются из logging, поэтому результат кэшируется
+    (повторные вызовы не берут блокировку модуля logging).
+
     Args:
         name: Имя логгера
 
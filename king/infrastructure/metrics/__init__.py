@@ -6,6 +6,7 @@ from king.infrastructure.metrics.prometheus import (
     agents_active,
     app_info,
     domain_events_total,
+    flush_http_metrics,
     get_metrics,
     http_request_duration_seconds,
     http_requests_total,
@@ -19,6 +20,8 @@ from king.infrastructure.metrics.prometheus import (
     record_message_metrics,
     record_task_metrics,
     setup_metrics,
+    start_http_metrics_flusher,
+    stop_http_metrics_flusher,
     tasks_duration_seconds,
     tasks_total,
     timing_metric,
@@ -29,6 +32,9 @@ __all__ = [
     "setup_metrics",
     "get_metrics",
     "record_http_metrics",
+    "flush_http_metrics",
+    "start_http_metrics_flusher",
+    "stop_http_metrics_flusher",
     "record_llm_metrics",
     "record_domain_event",
     "record_task_metrics",
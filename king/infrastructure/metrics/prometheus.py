@@ -2,10 +2,12 @@
 Prometheus метрики для платформы KING
 """
 
+import asyncio
 import logging
 import time
+from collections import deque
 from functools import wraps
-from typing import Callable, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from prometheus_client import (
     Counter,
@@ -90,6 +92,36 @@ domain_events_total = Counter(
 )
 
 
+# (метрика, значения меток) -> дочерняя метрика
+_CHILDREN: Dict[Tuple[Any, Tuple], Any] = {}
+
+# Очередь HTTP метрик: запись в запросе - только append, метрики обновляет
+# фоновая задача. При переполнении вытесняются самые старые записи.
+HTTP_METRICS_QUEUE_SIZE = 65536
+# Максимальное количество записей за один проход (между ними - возврат в event loop)
+HTTP_METRICS_FLUSH_BATCH = 1024
+_http_queue: "deque[Tuple[str, str, int, float]]" = deque(maxlen=HTTP_METRICS_QUEUE_SIZE)
+_flusher_task: Optional[asyncio.Task] = None
+
+
+def _child(metric, *values):
+    """
+    Дочерняя метрика для значений меток (кэшируется вместо вызова labels())
+
+    Args:
+        metric: Prometheus метрика с метками
+        *values: Значения меток в порядке их объявления
+
+    Returns:
+        Дочерняя метрика
+    """
+    key = (metric, values)
+    child = _CHILDREN.get(key)
+    if child is None:
+        child = _CHILDREN[key] = metric.labels(*values)
+    return child
+
+
 def record_http_metrics(method: str, endpoint: str, status_code: int, duration: float):
     """
     Запись метрик HTTP запроса
@@ -100,8 +132,78 @@ def record_http_metrics(method: str, endpoint: str, status_code: int, duration:
         status_code: HTTP статус код
         duration: Длительность запроса в секундах
     """
-    http_requests_total.labels(method=method, endpoint=endpoint, status=status_code).inc()
-    http_request_duration_seconds.labels(method=method, endpoint=endpoint).observe(duration)
+    if _flusher_task is not None:
+        _http_queue.append((method, endpoint, status_code, duration))
+    else:
+        _observe_http(method, endpoint, status_code, duration)
+
+
+def _observe_http(method: str, endpoint: str, status_code: int, duration: float) -> None:
+    """Обновление HTTP метрик"""
+    _child(http_requests_total, method, endpoint, status_code).inc()
+    _child(http_request_duration_seconds, method, endpoint).observe(duration)
+
+
+def flush_http_metrics(limit: Optional[int] = None) -> int:
+    """
+    Перенос накопленных HTTP метрик из очереди в Prometheus метрики
+
+    Args:
+        limit: Максимальное количество записей (None - вся очередь)
+
+    Returns:
+        Количество обработанных записей
+    """
+    count = len(_http_queue) if limit is None else min(limit, len(_http_queue))
+    popleft = _http_queue.popleft
+    for _ in range(count):
+        _observe_http(*popleft())
+    return count
+
+
+async def _flush_http_metrics_loop(interval: float) -> None:
+    """Фоновая задача: периодический перенос HTTP метрик"""
+    while True:
+        await asyncio.sleep(interval)
+        while flush_http_metrics(HTTP_METRICS_FLUSH_BATCH) == HTTP_METRICS_FLUSH_BATCH:
+            await asyncio.sleep(0)
+
+
+def start_http_metrics_flusher(interval: float = 1.0) -> bool:
+    """
+    Запуск фоновой записи HTTP метрик в текущем event loop
+
+    Args:
+        interval: Период переноса метрик из очереди (секунды)
+
+    Returns:
+        True если задача запущена, False если нет запущенного event loop
+        (метрики продолжают записываться синхронно)
+    """
+    global _flusher_task
+
+    if _flusher_task is not None and not _flusher_task.done():
+        return True
+    try:
+        _flusher_task = asyncio.get_running_loop().create_task(_flush_http_metrics_loop(interval))
+    except RuntimeError:
+        _flusher_task = None
+        return False
+    return True
+
+
+async def stop_http_metrics_flusher() -> None:
+    """Остановка фоновой записи HTTP метрик с переносом оставшихся записей"""
+    global _flusher_task
+
+    task, _flusher_task = _flusher_task, None
+    if task is not None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    flush_http_metrics()
 
 
 def record_llm_metrics(
@@ -123,21 +225,14 @@ def record_llm_metrics(
         input_tokens: Количество входных токенов
         output_tokens: Количество выходных токенов
     """
-    llm_requests_total.labels(
-        provider=provider, model=model or "unknown", status=status
-    ).inc()
-    llm_request_duration_seconds.labels(provider=provider, model=model or "unknown").observe(
-        duration
-    )
+    model = model or "unknown"
+    _child(llm_requests_total, provider, model, status).inc()
+    _child(llm_request_duration_seconds, provider, model).observe(duration)
 
     if input_tokens:
-        llm_tokens_total.labels(provider=provider, model=model or "unknown", type="input").inc(
-            input_tokens
-        )
+        _child(llm_tokens_total, provider, model, "input").inc(input_tokens)
     if output_tokens:
-        llm_tokens_total.labels(provider=provider, model=model or "unknown", type="output").inc(
-            output_tokens
-        )
+        _child(llm_tokens_total, provider, model, "output").inc(output_tokens)
 
 
 def record_domain_event(event_type: str):
@@ -147,7 +242,7 @@ def record_domain_event(event_type: str):
     Args:
         event_type: Тип события
     """
-    domain_events_total.labels(event_type=event_type).inc()
+    _child(domain_events_total, event_type).inc()
 
 
 def record_task_metrics(task_type: str, status: str, duration: Optional[float] = None):
@@ -159,9 +254,9 @@ def record_task_metrics(task_type: str, status: str, duration: Optional[float] =
         status: Статус задачи
         duration: Длительность выполнения (опционально)
     """
-    tasks_total.labels(type=task_type, status=status).inc()
+    _child(tasks_total, task_type, status).inc()
     if duration is not None:
-        tasks_duration_seconds.labels(type=task_type).observe(duration)
+        _child(tasks_duration_seconds, task_type).observe(duration)
 
 
 def record_message_metrics(role: str):
@@ -171,7 +266,7 @@ def record_message_metrics(role: str):
     Args:
         role: Роль сообщения (user, assistant, system)
     """
-    messages_total.labels(role=role).inc()
+    _child(messages_total, role).inc()
 
 
 def update_agents_metrics(status: str, count: int):
@@ -182,7 +277,7 @@ def update_agents_metrics(status: str, count: int):
         status: Статус агентов
         count: Количество агентов
     """
-    agents_active.labels(status=status).set(count)
+    _child(agents_active, status).set(count)
 
 
 def setup_metrics(app_name: str = "KING", app_version: str = "1.0.0", port: int = 9090) -> None:
@@ -197,6 +292,9 @@ def setup_metrics(app_name: str = "KING", app_version: str = "1.0.0", port: int
     # Установка информационных метрик
     app_info.info({"name": app_name, "version": app_version})
 
+    # HTTP метрики записываются фоновой задачей (если вызвано из event loop)
+    start_http_metrics_flusher()
+
     # Запуск HTTP сервера для метрик
     try:
         start_http_server(port)
@@ -212,6 +310,7 @@ def get_metrics() -> bytes:
     Returns:
         Метрики в формате Prometheus text format
     """
+    flush_http_metrics()
     return generate_latest()
 
 
@@ -228,49 +327,29 @@ def timing_metric(metric: Histogram, labels: Optional[dict] = None):
     """
 
     def decorator(func: Callable):
-        @wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            start_time = time.time()
-            try:
-                result = await func(*args, **kwargs)
-                duration = time.time() - start_time
-                if labels:
-                    metric.labels(**labels).observe(duration)
-                else:
-                    metric.observe(duration)
-                return result
-            except Exception as e:
-                duration = time.time() - start_time
-                if labels:
-                    metric.labels(**labels).observe(duration)
-                else:
-                    metric.observe(duration)
-                raise
+        # Дочерняя метрика и тип обертки определяются один раз при декорировании
+        bound = metric.labels(**labels) if labels else metric
+
+        if asyncio.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start_time = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    bound.observe(time.perf_counter() - start_time)
+
+            return async_wrapper
 
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
-            start_time = time.time()
+            start_time = time.perf_counter()
             try:
-                result = func(*args, **kwargs)
-                duration = time.time() - start_time
-                if labels:
-                    metric.labels(**labels).observe(duration)
-                else:
-                    metric.observe(duration)
-                return result
-            except Exception as e:
-                duration = time.time() - start_time
-                if labels:
-                    metric.labels(**labels).observe(duration)
-                else:
-                    metric.observe(duration)
-                raise
-
-        # Возвращаем соответствующий wrapper
-        import asyncio
+                return func(*args, **kwargs)
+            finally:
+                bound.observe(time.perf_counter() - start_time)
 
-        if asyncio.iscoroutinefunction(func):
-            return async_wrapper
         return sync_wrapper
 
     return decorator
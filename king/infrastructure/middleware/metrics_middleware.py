@@ -2,6 +2,8 @@
 Middleware для автоматического сбора метрик HTTP запросов
 """
 
+import re
+import sys
 import time
 from typing import Callable
 
@@ -12,6 +14,15 @@ from king.infrastructure.metrics import record_http_metrics
 
 logger = None  # Будет инициализирован при первом использовании
 
+# Служебные endpoints (scrape Prometheus, health check, документация) - без метрик
+EXCLUDED_ENDPOINTS = frozenset({"/metrics", "/health", "/docs", "/openapi.json", "/redoc"})
+
+# UUID и длинные числовые ID в пути заменяются на {id}
+_UUID_RE = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE
+)
+_LONG_ID_RE = re.compile(r"/\d{10,}/")
+
 
 class MetricsMiddleware(BaseHTTPMiddleware):
     """Middleware для сбора метрик HTTP запросов"""
@@ -27,18 +38,17 @@ class MetricsMiddleware(BaseHTTPMiddleware):
         Returns:
             HTTP ответ
         """
-        start_time = time.time()
-
-        # Получение информации о запросе
-        method = request.method
         endpoint = request.url.path
 
-        # Исключаем метрики и health check из детального логирования
-        if endpoint in ["/metrics", "/health", "/docs", "/openapi.json", "/redoc"]:
-            endpoint = endpoint
-        else:
-            # Нормализация endpoint (убираем ID из пути)
-            endpoint = self._normalize_endpoint(endpoint)
+        # Исключаем метрики и health check из метрик
+        if endpoint in EXCLUDED_ENDPOINTS:
+            return await call_next(request)
+
+        start_time = time.perf_counter()
+        # Интернированные строки: ключи кэша дочерних метрик сравниваются по идентичности
+        method = sys.intern(request.method)
+        # Нормализация endpoint (убираем ID из пути)
+        endpoint = self._normalize_endpoint(endpoint)
 
         try:
             response = await call_next(request)
@@ -47,7 +57,7 @@ class MetricsMiddleware(BaseHTTPMiddleware):
             status_code = 500
             raise
         finally:
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             record_http_metrics(method=method, endpoint=endpoint, status_code=status_code, duration=duration)
 
         return response
@@ -63,15 +73,6 @@ class MetricsMiddleware(BaseHTTPMiddleware):
         Returns:
             Нормализованный путь
         """
-        # Простая нормализация - заменяем UUID-подобные строки
-        import re
-
-        # Заменяем UUID на {id}
-        uuid_pattern = r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
-        normalized = re.sub(uuid_pattern, "{id}", path, flags=re.IGNORECASE)
-
-        # Заменяем длинные числовые ID на {id}
-        normalized = re.sub(r"/\d{10,}/", "/{id}/", normalized)
-
-        return normalized
+        normalized = _UUID_RE.sub("{id}", path)
+        return sys.intern(_LONG_ID_RE.sub("/{id}/", normalized))
 
@@ -3,128 +3,336 @@ In-memory реализации репозиториев для разработ
 """
 
 import logging
-from typing import Dict, List, Optional
+from bisect import bisect_right, insort
+from collections import defaultdict
+from heapq import nsmallest
+from itertools import islice
+from typing import AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
 
-from king.core.domain import Agent, Conversation, Message, Task
+from king.core.domain import Agent, AgentStatus, Conversation, Message, Task, TaskStatus
 from king.core.ports.repositories import (
     IAgentRepository,
     IMessageRepository,
     ITaskRepository,
+    decode_cursor,
+    encode_cursor,
 )
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Маркер отсутствующего ключа для dict.pop
+_MISSING = object()
+
+
+def _keyset_page(
+    items: Iterable[T],
+    key: Callable[[T], Tuple],
+    cursor: Optional[str],
+    limit: int,
+    presorted: bool = False,
+) -> Tuple[List[T], Optional[str]]:
+    """
+    Страница keyset-пагинации по ключу (время, id)
+
+    Без presorted полная сортировка не выполняется: записи после курсора
+    отбираются heapq.nsmallest(limit + 1) - O(N log limit) вместо O(N log N).
+
+    Args:
+        items: Записи
+        key: Функция ключа сортировки (время, id)
+        cursor: Курсор предыдущей страницы
+        limit: Максимальное количество записей
+        presorted: Записи уже (почти) упорядочены - сортировка линейна
+
+    Returns:
+        Кортеж (записи страницы, курсор следующей страницы или None)
+    """
+    if presorted:
+        ordered = sorted(items, key=key)
+        start = bisect_right(ordered, decode_cursor(cursor), key=key) if cursor else 0
+        head = ordered[start : start + limit + 1]
+    else:
+        if cursor:
+            after = decode_cursor(cursor)
+            items = (item for item in items if key(item) > after)
+        head = nsmallest(limit + 1, items, key=key)
+
+    page = head[:limit]
+    next_cursor = None
+    if page and len(head) > limit:
+        next_cursor = encode_cursor(*key(page[-1]))
+    return page, next_cursor
+
+
+def _created_key(entity) -> Tuple:
+    return (entity.created_at, entity.id)
+
+
+def _timestamp_key(message: Message) -> Tuple:
+    return (message.timestamp, message.id)
+
+
+def _message_time(message: Message):
+    return message.timestamp
+
 
 class InMemoryAgentRepository(IAgentRepository):
     """In-memory реализация репозитория агентов"""
 
+    # Порядок выдачи доступных агентов
+    _AVAILABLE_ORDER = (AgentStatus.ACTIVE, AgentStatus.IDLE)
+
     def __init__(self):
         """Инициализация репозитория"""
         self._agents: Dict[str, Agent] = {}
+        # Индекс по статусу: статус -> ID агентов (dict как упорядоченное множество)
+        # и статус, под которым агент проиндексирован (объект агента изменяется
+        # на месте, поэтому прежний статус хранится отдельно)
+        self._status_index: Dict[AgentStatus, Dict[str, None]] = defaultdict(dict)
+        self._indexed_status: Dict[str, AgentStatus] = {}
+
+    def _index(self, agent: Agent) -> None:
+        """Обновление индекса по статусу для сохраненного агента"""
+        previous = self._indexed_status.get(agent.id)
+        if previous == agent.status:
+            return
+        if previous is not None:
+            self._status_index[previous].pop(agent.id, None)
+        self._status_index[agent.status][agent.id] = None
+        self._indexed_status[agent.id] = agent.status
 
     async def create(self, agent: Agent) -> Agent:
         """Создание агента"""
         self._agents[agent.id] = agent
-        logger.debug(f"Создан агент: {agent.id}")
+        self._index(agent)
+        logger.debug("Создан агент: %s", agent.id)
         return agent
 
+    async def create_many(self, agents: List[Agent]) -> List[Agent]:
+        """Создание нескольких агентов"""
+        self._agents.update((agent.id, agent) for agent in agents)
+        for agent in agents:
+            self._index(agent)
+        logger.debug("Создано агентов: %d", len(agents))
+        return list(agents)
+
     async def get_by_id(self, agent_id: str) -> Optional[Agent]:
         """Получение агента по ID"""
         return self._agents.get(agent_id)
 
+    def get_by_id_nowait(self, agent_id: str) -> Optional[Agent]:
+        """
+        Синхронное получение агента по ID
+
+        Для кода, работающего именно с in-memory репозиторием (тесты,
+        инструменты разработки): без создания корутины на вызов.
+        """
+        return self._agents.get(agent_id)
+
+    async def get_many(self, agent_ids: List[str]) -> List[Agent]:
+        """Получение нескольких агентов по ID"""
+        agents = self._agents
+        return [agents[agent_id] for agent_id in agent_ids if agent_id in agents]
+
     async def get_all(self, skip: int = 0, limit: int = 100) -> List[Agent]:
         """Получение всех агентов"""
-        agents = list(self._agents.values())
-        return agents[skip : skip + limit]
+        return list(islice(self._agents.values(), skip, skip + limit))
+
+    async def list_after(
+        self, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Agent], Optional[str]]:
+        """Keyset-пагинация агентов"""
+        return _keyset_page(self._agents.values(), _created_key, cursor, limit)
 
     async def update(self, agent: Agent) -> Agent:
         """Обновление агента"""
         if agent.id not in self._agents:
             raise ValueError(f"Агент {agent.id} не найден")
         self._agents[agent.id] = agent
-        logger.debug(f"Обновлен агент: {agent.id}")
+        self._index(agent)
+        logger.debug("Обновлен агент: %s", agent.id)
         return agent
 
     async def delete(self, agent_id: str) -> bool:
         """Удаление агента"""
-        if agent_id in self._agents:
-            del self._agents[agent_id]
-            logger.debug(f"Удален агент: {agent_id}")
-            return True
-        return False
+        if self._agents.pop(agent_id, _MISSING) is _MISSING:
+            return False
+        self._status_index[self._indexed_status.pop(agent_id)].pop(agent_id, None)
+        logger.debug("Удален агент: %s", agent_id)
+        return True
 
     async def get_by_status(self, status: str) -> List[Agent]:
-        """Получение агентов по статусу"""
-        return [agent for agent in self._agents.values() if agent.status.value == status]
+        """
+        Получение агентов по статусу
 
-    async def get_available(self) -> List[Agent]:
-        """Получение доступных агентов"""
-        from king.core.domain import AgentStatus
+        AgentStatus - str Enum, поэтому строка ищется в индексе напрямую.
+        """
+        agents = self._agents
+        return [agents[agent_id] for agent_id in self._status_index.get(status, ())]
+
+    def _iter_available(self) -> Iterator[Agent]:
+        """Доступные агенты по индексу статусов (сначала ACTIVE, затем IDLE)"""
+        agents = self._agents
+        for status in self._AVAILABLE_ORDER:
+            for agent_id in self._status_index.get(status, ()):
+                yield agents[agent_id]
 
-        return [
+    async def get_available(self) -> List[Agent]:
+        """Получение доступных агентов (сначала ACTIVE, затем IDLE)"""
+        return list(self._iter_available())
+
+    async def find_available_with_capabilities(
+        self, required: List[str], limit: int = 1
+    ) -> List[Agent]:
+        """Поиск доступных агентов с требуемыми возможностями"""
+        required_set = set(required)
+        matching = (
             agent
-            for agent in self._agents.values()
-            if agent.status in [AgentStatus.ACTIVE, AgentStatus.IDLE]
-        ]
+            for agent in self._iter_available()
+            if agent.capabilities.keys() >= required_set
+        )
+        return list(islice(matching, limit))
+
+    async def estimated_count(self) -> int:
+        """Количество агентов (в памяти - точное, O(1))"""
+        return len(self._agents)
 
 
 class InMemoryTaskRepository(ITaskRepository):
     """In-memory реализация репозитория задач"""
 
+    # Порядок выдачи ожидающих задач
+    _PENDING_ORDER = (TaskStatus.CREATED, TaskStatus.ASSIGNED)
+
     def __init__(self):
         """Инициализация репозитория"""
         self._tasks: Dict[str, Task] = {}
+        # Индексы по статусу и агенту (dict как упорядоченное множество ID) и
+        # значения, под которыми задача проиндексирована (задача изменяется на месте)
+        self._by_status: Dict[TaskStatus, Dict[str, None]] = defaultdict(dict)
+        self._by_agent: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self._indexed: Dict[str, Tuple[TaskStatus, Optional[str]]] = {}
+
+    def _index(self, task: Task) -> None:
+        """Обновление индексов для сохраненной задачи"""
+        previous = self._indexed.get(task.id)
+        current = (task.status, task.assigned_agent)
+        if previous == current:
+            return
+        if previous is not None:
+            self._unindex(task.id, previous)
+        self._by_status[task.status][task.id] = None
+        if task.assigned_agent is not None:
+            self._by_agent[task.assigned_agent][task.id] = None
+        self._indexed[task.id] = current
+
+    def _unindex(self, task_id: str, indexed: Tuple[TaskStatus, Optional[str]]) -> None:
+        """Удаление задачи из индексов"""
+        status, agent_id = indexed
+        self._by_status[status].pop(task_id, None)
+        if agent_id is not None:
+            bucket = self._by_agent.get(agent_id)
+            if bucket is not None:
+                bucket.pop(task_id, None)
+                if not bucket:
+                    del self._by_agent[agent_id]
 
     async def create(self, task: Task) -> Task:
         """Создание задачи"""
         self._tasks[task.id] = task
-        logger.debug(f"Создана задача: {task.id}")
+        self._index(task)
+        logger.debug("Создана задача: %s", task.id)
         return task
 
+    async def create_many(self, tasks: List[Task]) -> List[Task]:
+        """Создание нескольких задач"""
+        self._tasks.update((task.id, task) for task in tasks)
+        for task in tasks:
+            self._index(task)
+        logger.debug("Создано задач: %d", len(tasks))
+        return list(tasks)
+
     async def get_by_id(self, task_id: str) -> Optional[Task]:
         """Получение задачи по ID"""
         return self._tasks.get(task_id)
 
+    def get_by_id_nowait(self, task_id: str) -> Optional[Task]:
+        """Синхронное получение задачи по ID (см. InMemoryAgentRepository.get_by_id_nowait)"""
+        return self._tasks.get(task_id)
+
+    async def get_many(self, task_ids: List[str]) -> List[Task]:
+        """Получение нескольких задач по ID"""
+        tasks = self._tasks
+        return [tasks[task_id] for task_id in task_ids if task_id in tasks]
+
     async def get_all(self, skip: int = 0, limit: int = 100) -> List[Task]:
         """Получение всех задач"""
-        tasks = list(self._tasks.values())
-        return tasks[skip : skip + limit]
+        return list(islice(self._tasks.values(), skip, skip + limit))
+
+    async def list_after(
+        self, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Task], Optional[str]]:
+        """Keyset-пагинация задач"""
+        return _keyset_page(self._tasks.values(), _created_key, cursor, limit)
 
     async def update(self, task: Task) -> Task:
         """Обновление задачи"""
         if task.id not in self._tasks:
             raise ValueError(f"Задача {task.id} не найдена")
         self._tasks[task.id] = task
-        logger.debug(f"Обновлена задача: {task.id}")
+        self._index(task)
+        logger.debug("Обновлена задача: %s", task.id)
         return task
 
+    async def update_many(self, tasks: List[Task]) -> List[Task]:
+        """Обновление нескольких задач"""
+        missing = [task.id for task in tasks if task.id not in self._tasks]
+        if missing:
+            raise ValueError(f"Задачи не найдены: {', '.join(missing)}")
+        for task in tasks:
+            self._tasks[task.id] = task
+            self._index(task)
+        logger.debug("Обновлено задач: %d", len(tasks))
+        return list(tasks)
+
     async def delete(self, task_id: str) -> bool:
         """Удаление задачи"""
-        if task_id in self._tasks:
-            del self._tasks[task_id]
-            logger.debug(f"Удалена задача: {task_id}")
-            return True
-        return False
+        if self._tasks.pop(task_id, _MISSING) is _MISSING:
+            return False
+        self._unindex(task_id, self._indexed.pop(task_id))
+        logger.debug("Удалена задача: %s", task_id)
+        return True
 
     async def get_by_status(self, status: str) -> List[Task]:
         """Получение задач по статусу"""
-        return [task for task in self._tasks.values() if task.status.value == status]
+        if not isinstance(status, TaskStatus):
+            try:
+                status = TaskStatus.parse(status)
+            except ValueError:
+                return []
+        tasks = self._tasks
+        return [tasks[task_id] for task_id in self._by_status.get(status, ())]
 
     async def get_by_agent(self, agent_id: str) -> List[Task]:
         """Получение задач агента"""
-        return [
-            task for task in self._tasks.values() if task.assigned_agent == agent_id
-        ]
+        tasks = self._tasks
+        return [tasks[task_id] for task_id in self._by_agent.get(agent_id, ())]
 
-    async def get_pending(self) -> List[Task]:
-        """Получение ожидающих задач"""
-        from king.core.domain import TaskStatus
+    async def get_pending(self, limit: Optional[int] = None) -> List[Task]:
+        """Получение ожидающих задач (сначала CREATED, затем ASSIGNED)"""
+        tasks = self._tasks
+        pending = (
+            tasks[task_id]
+            for status in self._PENDING_ORDER
+            for task_id in self._by_status.get(status, ())
+        )
+        return list(islice(pending, limit))
 
-        return [
-            task
-            for task in self._tasks.values()
-            if task.status in [TaskStatus.CREATED, TaskStatus.ASSIGNED]
-        ]
+    async def estimated_count(self) -> int:
+        """Количество задач (в памяти - точное, O(1))"""
+        return len(self._tasks)
 
 
 class InMemoryMessageRepository(IMessageRepository):
@@ -134,21 +342,56 @@ class InMemoryMessageRepository(IMessageRepository):
         """Инициализация репозитория"""
         self._messages: Dict[str, Message] = {}
         self._conversations: Dict[str, Conversation] = {}
+        # ID диалога -> сообщения, упорядоченные по timestamp (при равном
+        # timestamp - в порядке добавления)
+        self._conv_messages: Dict[str, List[Message]] = {}
+        # ID сообщения -> диалог, под которым оно проиндексировано (сообщение
+        # изменяется на месте, например add_message меняет conversation_id)
+        self._indexed_conversation: Dict[str, Optional[str]] = {}
+
+    def _store(self, message: Message) -> None:
+        """Сохранение сообщения и его позиции в индексе диалога"""
+        indexed = self._indexed_conversation.get(message.id, _MISSING)
+        if indexed is not _MISSING:
+            bucket = self._conv_messages[indexed]
+            bucket.remove(self._messages[message.id])
+            if not bucket:
+                del self._conv_messages[indexed]
+        self._messages[message.id] = message
+        self._indexed_conversation[message.id] = message.conversation_id
+
+        messages = self._conv_messages.setdefault(message.conversation_id, [])
+        if not messages or messages[-1].timestamp <= message.timestamp:
+            # Обычный случай: сообщения приходят в порядке времени
+            messages.append(message)
+        else:
+            insort(messages, message, key=_message_time)
 
     async def create_message(self, message: Message) -> Message:
         """Создание сообщения"""
-        self._messages[message.id] = message
-        logger.debug(f"Создано сообщение: {message.id}")
+        self._store(message)
+        logger.debug("Создано сообщение: %s", message.id)
         return message
 
+    async def create_messages(self, messages: List[Message]) -> List[Message]:
+        """Создание нескольких сообщений"""
+        for message in messages:
+            self._store(message)
+        logger.debug("Создано сообщений: %d", len(messages))
+        return list(messages)
+
     async def get_message_by_id(self, message_id: str) -> Optional[Message]:
         """Получение сообщения по ID"""
         return self._messages.get(message_id)
 
+    def get_message_by_id_nowait(self, message_id: str) -> Optional[Message]:
+        """Синхронное получение сообщения по ID (см. InMemoryAgentRepository.get_by_id_nowait)"""
+        return self._messages.get(message_id)
+
     async def create_conversation(self, conversation: Conversation) -> Conversation:
         """Создание диалога"""
         self._conversations[conversation.id] = conversation
-        logger.debug(f"Создан диалог: {conversation.id}")
+        logger.debug("Создан диалог: %s", conversation.id)
         return conversation
 
     async def get_conversation_by_id(
@@ -161,31 +404,70 @@ class InMemoryMessageRepository(IMessageRepository):
         self, conversation_id: str, skip: int = 0, limit: int = 100
     ) -> List[Message]:
         """Получение сообщений диалога"""
-        messages = [
-            msg
-            for msg in self._messages.values()
-            if msg.conversation_id == conversation_id
-        ]
-        # Сортировка по timestamp
-        messages.sort(key=lambda m: m.timestamp)
-        return messages[skip : skip + limit]
-
-    async def add_message_to_conversation(
-        self, conversation_id: str, message: Message
-    ) -> Message:
-        """Добавление сообщения в диалог"""
-        conversation = await self.get_conversation_by_id(conversation_id)
+        return self._conv_messages.get(conversation_id, [])[skip : skip + limit]
+
+    async def iter_conversation_messages(
+        self,
+        conversation_id: str,
+        *,
+        reverse: bool = True,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[Message]:
+        """Потоковое чтение сообщений диалога"""
+        # Тот же индекс, что у get_conversation_messages и list_messages_after
+        messages = self._conv_messages.get(conversation_id, [])
+
+        # Снимок ссылок: между yield другие корутины могут изменить список
+        # (insort/remove в _store), и итерация по живому списку пропустила бы
+        # или повторила сообщения. Запись в репозиторий не содержит await и
+        # атомарна в цикле событий, поэтому блокировка писателей не нужна.
+        if limit is not None:
+            if limit <= 0:
+                return
+            snapshot = messages[:-limit - 1:-1] if reverse else messages[:limit]
+        else:
+            snapshot = messages[::-1] if reverse else messages[:]
+
+        for message in snapshot:
+            yield message
+
+    async def list_messages_after(
+        self, conversation_id: str, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Message], Optional[str]]:
+        """Keyset-пагинация сообщений диалога"""
+        # Индекс уже упорядочен по времени - сортировка в _keyset_page линейна
+        return _keyset_page(
+            self._conv_messages.get(conversation_id, ()),
+            _timestamp_key,
+            cursor,
+            limit,
+            presorted=True,
+        )
+
+    async def append_message(self, conversation_id: str, message: Message) -> Message:
+        """Сохранение сообщения с привязкой к диалогу"""
+        conversation = self._conversations.get(conversation_id)
         if not conversation:
             raise ValueError(f"Диалог {conversation_id} не найден")
 
         conversation.add_message(message)
-        await self.create_message(message)
+        self._store(message)
+        logger.debug("Создано сообщение: %s", message.id)
         return message
 
     async def get_all_conversations(
         self, skip: int = 0, limit: int = 100
     ) -> List[Conversation]:
         """Получение всех диалогов"""
-        conversations = list(self._conversations.values())
-        return conversations[skip : skip + limit]
+        return list(islice(self._conversations.values(), skip, skip + limit))
+
+    async def list_conversations_after(
+        self, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Conversation], Optional[str]]:
+        """Keyset-пагинация диалогов"""
+        return _keyset_page(self._conversations.values(), _created_key, cursor, limit)
+
+    async def estimated_conversation_count(self) -> int:
+        """Количество диалогов (в памяти - точное, O(1))"""
+        return len(self._conversations)
 
@@ -10,9 +10,10 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from king.api.rest import root_router, router as rest_router
+from king.infrastructure.config import get_settings
 from king.infrastructure.dependencies import cleanup_dependencies, init_dependencies
 from king.infrastructure.logging import setup_logging
-from king.infrastructure.metrics import setup_metrics
+from king.infrastructure.metrics import setup_metrics, stop_http_metrics_flusher
 from king.infrastructure.middleware import MetricsMiddleware
 
 logging.basicConfig(
@@ -31,11 +32,16 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting KING platform...")
     
-    # Настройка логирования
+    # Настройки загружаются один раз для логирования и метрик
     try:
-        from king.infrastructure.config import get_settings
-        
         settings = get_settings()
+    except Exception:
+        settings = None
+    
+    # Настройка логирования
+    try:
+        if settings is None:
+            raise RuntimeError("Настройки не инициализированы")
         setup_logging(
             log_level=settings.app.log_level,
             json_format=not settings.app.debug,
@@ -47,9 +53,8 @@ async def lifespan(app: FastAPI):
     
     # Настройка метрик
     try:
-        from king.infrastructure.config import get_settings
-        
-        settings = get_settings()
+        if settings is None:
+            raise RuntimeError("Настройки не инициализированы")
         setup_metrics(
             app_name=settings.app.name,
             app_version=settings.app.version,
@@ -79,6 +84,9 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Ошибка при очистке ресурсов: {e}", exc_info=True)
 
+    # Запись оставшихся HTTP метрик
+    await stop_http_metrics_flusher()
+
 
 def create_app() -> FastAPI:
     """
@@ -96,13 +104,11 @@ def create_app() -> FastAPI:
     
     # Настройка CORS из конфигурации
     try:
-        from king.infrastructure.config import get_settings
-        settings = get_settings()
-        allowed_origins = settings.app.allowed_origins
+        allowed_origins = get_settings().app.allowed_origins_set
     except Exception:
         # Fallback на безопасные значения по умолчанию
         logger.warning("Не удалось загрузить настройки CORS, используются значения по умолчанию")
-        allowed_origins = ["http://localhost:3000", "http://localhost:8000"]
+        allowed_origins = frozenset({"http://localhost:3000", "http://localhost:8000"})
     
     app.add_middleware(
         CORSMiddleware,
@@ -110,6 +116,7 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Total-Count-Approx"],
     )
     
     # Подключение REST API роутеров
@@ -0,0 +1,223 @@
+"""
+Тесты пакетирования поисковых запросов RAG
+"""
+
+import asyncio
+
+import pytest
+
+from king.core.services.batching_query_processor import BatchingQueryProcessor
+from king.core.services.semantic_cache import SemanticCache
+
+
+class StubLLM:
+    """Embedding текста - вектор из его длины и первого символа"""
+
+    def __init__(self, short=False):
+        self.calls = []
+        self.short = short
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def get_embeddings_batch(self, texts):
+        self.calls.append(list(texts))
+        await self.release.wait()
+        vectors = [[float(len(text)), float(ord(text[0]))] for text in texts]
+        return vectors[:-1] if self.short else vectors
+
+
+class StubStore:
+    """Результат поиска - запрос, top_k и фильтр, с которыми он выполнен"""
+
+    def __init__(self, short=False, healthy=True):
+        self.calls = []
+        self.short = short
+        self.healthy = healthy
+
+    async def search_batch(self, query_vectors, top_k, collection=None, filter=None):
+        self.calls.append((len(query_vectors), top_k, filter))
+        results = [[(vector, top_k, filter)] for vector in query_vectors]
+        return results[:-1] if self.short else results
+
+    async def health_check(self):
+        return self.healthy
+
+
+async def test_concurrent_queries_share_one_batch():
+    llm, store = StubLLM(), StubStore()
+    processor = BatchingQueryProcessor(llm, store, max_wait_ms=20)
+
+    results = await asyncio.gather(*(processor.submit(q) for q in ("a", "bb", "ccc")))
+
+    assert llm.calls == [["a", "bb", "ccc"]]
+    assert store.calls == [(3, 5, None)]
+    assert [result[0][0] for result in results] == [[1.0, 97.0], [2.0, 98.0], [3.0, 99.0]]
+    await processor.close()
+
+
+async def test_queries_grouped_by_top_k_and_filter():
+    llm, store = StubLLM(), StubStore()
+    processor = BatchingQueryProcessor(llm, store, max_wait_ms=20)
+
+    results = await asyncio.gather(
+        processor.submit("a", top_k=3),
+        processor.submit("b", top_k=3, filter={"tag": "x"}),
+        processor.submit("c", top_k=3),
+        processor.submit("d", top_k=7, filter={"tag": "x"}),
+    )
+
+    assert len(llm.calls) == 1
+    assert sorted(store.calls, key=repr) == sorted(
+        [(2, 3, None), (1, 3, {"tag": "x"}), (1, 7, {"tag": "x"})], key=repr
+    )
+    assert [result[0][1:] for result in results] == [
+        (3, None),
+        (3, {"tag": "x"}),
+        (3, None),
+        (7, {"tag": "x"}),
+    ]
+    await processor.close()
+
+
+async def test_max_batch_splits_queries():
+    llm, store = StubLLM(), StubStore()
+    processor = BatchingQueryProcessor(llm, store, max_batch=2, max_wait_ms=20)
+
+    await asyncio.gather(*(processor.submit(q) for q in "abcde"))
+
+    assert [len(call) for call in llm.calls] == [2, 2, 1]
+    await processor.close()
+
+
+async def test_precomputed_embedding_skips_llm():
+    llm, store = StubLLM(), StubStore()
+    processor = BatchingQueryProcessor(llm, store, max_wait_ms=5)
+
+    result = await processor.submit("a", embedding=[0.5, 0.5])
+
+    assert llm.calls == []
+    assert result[0][0] == [0.5, 0.5]
+    await processor.close()
+
+
+async def test_cancelled_caller_is_skipped():
+    llm, store = StubLLM(), StubStore()
+    processor = BatchingQueryProcessor(llm, store, max_wait_ms=50)
+
+    first = asyncio.create_task(processor.submit("a"))
+    cancelled = asyncio.create_task(processor.submit("bb"))
+    last = asyncio.create_task(processor.submit("ccc"))
+    await asyncio.sleep(0.01)
+    cancelled.cancel()
+
+    assert (await first)[0][0] == [1.0, 97.0]
+    assert (await last)[0][0] == [3.0, 99.0]
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    assert llm.calls == [["a", "ccc"]]
+    await processor.close()
+
+
+async def test_close_fails_pending_queries():
+    llm, store = StubLLM(), StubStore()
+    llm.release.clear()
+    processor = BatchingQueryProcessor(llm, store, max_wait_ms=1)
+
+    pending = [asyncio.create_task(processor.submit(q)) for q in ("a", "b")]
+    while not llm.calls:
+        await asyncio.sleep(0.001)
+    await processor.close()
+
+    for task in pending:
+        with pytest.raises(RuntimeError):
+            await task
+
+
+async def test_short_embeddings_response_fails_every_query():
+    processor = BatchingQueryProcessor(StubLLM(short=True), StubStore(), max_wait_ms=20)
+
+    results = await asyncio.gather(
+        processor.submit("a"),
+        processor.submit("b"),
+        processor.submit("c", embedding=[1.0, 0.0]),
+        return_exceptions=True,
+    )
+
+    assert isinstance(results[0], ValueError)
+    assert isinstance(results[1], ValueError)
+    assert results[2][0][0] == [1.0, 0.0]
+    await processor.close()
+
+
+async def test_short_search_response_fails_every_query_in_group():
+    processor = BatchingQueryProcessor(StubLLM(), StubStore(short=True), max_wait_ms=20)
+
+    results = await asyncio.gather(
+        processor.submit("a"), processor.submit("b"), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    await processor.close()
+
+
+async def test_cache_hit_skips_vector_store():
+    llm, store = StubLLM(), StubStore()
+    processor = BatchingQueryProcessor(llm, store, max_wait_ms=5, cache=SemanticCache())
+
+    first = await processor.submit("a")
+    second = await processor.submit("a")
+    other_top_k = await processor.submit("a", top_k=9)
+
+    assert first == second
+    assert store.calls == [(1, 5, None), (1, 9, None)]
+    assert other_top_k[0][1] == 9
+    await processor.close()
+
+
+async def test_healthy_local_store_is_preferred():
+    store, local = StubStore(), StubStore()
+    processor = BatchingQueryProcessor(StubLLM(), store, max_wait_ms=5, local_store=local)
+
+    await processor.submit("a")
+    local.healthy = False
+    await processor.submit("b")
+
+    assert len(local.calls) == 1
+    assert len(store.calls) == 1
+    await processor.close()
+
+
+async def test_failing_health_check_falls_back_to_vector_store():
+    class BrokenLocalStore(StubStore):
+        async def health_check(self):
+            raise ConnectionError("local index down")
+
+    store, local = StubStore(), BrokenLocalStore()
+    processor = BatchingQueryProcessor(StubLLM(), store, max_wait_ms=5, local_store=local)
+
+    result = await asyncio.wait_for(processor.submit("a"), 1)
+
+    assert result[0][0] == [1.0, 97.0]
+    assert len(store.calls) == 1
+    assert local.calls == []
+    await processor.close()
+
+
+async def test_unexpected_error_fails_batch_and_worker_keeps_running():
+    class BrokenCache(SemanticCache):
+        def get(self, embedding, key):
+            if self.broken:
+                raise RuntimeError("cache broken")
+            return super().get(embedding, key)
+
+    cache = BrokenCache()
+    cache.broken = True
+    processor = BatchingQueryProcessor(StubLLM(), StubStore(), max_wait_ms=5, cache=cache)
+
+    with pytest.raises(RuntimeError, match="cache broken"):
+        await asyncio.wait_for(processor.submit("a"), 1)
+
+    cache.broken = False
+    result = await asyncio.wait_for(processor.submit("b"), 1)
+    assert result[0][0] == [1.0, 98.0]
+    await processor.close()
@@ -0,0 +1,315 @@
+"""
+Тесты in-memory репозиториев: согласованность индексов и keyset-пагинация
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from king.core.domain import Agent, AgentStatus, Conversation, Message, Task, TaskStatus
+from king.core.ports.repositories import decode_cursor, encode_cursor
+from king.infrastructure.persistence.in_memory_repositories import (
+    InMemoryAgentRepository,
+    InMemoryMessageRepository,
+    InMemoryTaskRepository,
+)
+
+BASE_TIME = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def ids(entities):
+    return [entity.id for entity in entities]
+
+
+async def collect_pages(list_after, limit):
+    """Обход всех страниц keyset-пагинации"""
+    items, cursor, pages = [], None, 0
+    while True:
+        page, cursor = await list_after(cursor=cursor, limit=limit)
+        items.extend(page)
+        pages += 1
+        if cursor is None:
+            return items, pages
+
+
+class TestAgentStatusIndex:
+    async def test_create_indexes_by_status(self):
+        repo = InMemoryAgentRepository()
+        active = await repo.create(Agent(name="a", status=AgentStatus.ACTIVE))
+        idle = await repo.create(Agent(name="i", status=AgentStatus.IDLE))
+        await repo.create(Agent(name="s", status=AgentStatus.STOPPED))
+
+        assert ids(await repo.get_by_status("active")) == [active.id]
+        assert ids(await repo.get_by_status(AgentStatus.IDLE)) == [idle.id]
+        assert ids(await repo.get_available()) == [active.id, idle.id]
+
+    async def test_update_moves_agent_between_statuses(self):
+        repo = InMemoryAgentRepository()
+        agent = await repo.create(Agent(name="a", status=AgentStatus.ACTIVE))
+
+        agent.status = AgentStatus.BUSY
+        await repo.update(agent)
+
+        assert await repo.get_by_status("active") == []
+        assert ids(await repo.get_by_status("busy")) == [agent.id]
+        assert await repo.get_available() == []
+
+    async def test_delete_removes_agent_from_index(self):
+        repo = InMemoryAgentRepository()
+        agent = await repo.create(Agent(name="a", status=AgentStatus.ACTIVE))
+
+        assert await repo.delete(agent.id) is True
+        assert await repo.delete(agent.id) is False
+        assert await repo.get_by_status("active") == []
+        assert await repo.get_available() == []
+
+    async def test_update_unknown_agent_raises(self):
+        repo = InMemoryAgentRepository()
+        with pytest.raises(ValueError):
+            await repo.update(Agent(name="ghost"))
+
+    async def test_find_available_with_capabilities(self):
+        repo = InMemoryAgentRepository()
+        await repo.create(Agent(name="x", status=AgentStatus.ACTIVE, capabilities={"x": 1}))
+        xy = await repo.create(
+            Agent(name="xy", status=AgentStatus.IDLE, capabilities={"x": 1, "y": 1})
+        )
+        await repo.create(
+            Agent(name="busy", status=AgentStatus.BUSY, capabilities={"x": 1, "y": 1})
+        )
+
+        assert ids(await repo.find_available_with_capabilities(["x", "y"], limit=5)) == [xy.id]
+        assert len(await repo.find_available_with_capabilities([], limit=5)) == 2
+
+    async def test_create_many_and_get_many(self):
+        repo = InMemoryAgentRepository()
+        agents = [Agent(name=str(i), status=AgentStatus.ACTIVE) for i in range(3)]
+        await repo.create_many(agents)
+
+        assert ids(await repo.get_available()) == ids(agents)
+        found = await repo.get_many([agents[2].id, "missing", agents[0].id])
+        assert ids(found) == [agents[2].id, agents[0].id]
+
+
+class TestTaskIndexes:
+    async def test_status_and_agent_indexes_follow_update(self):
+        repo = InMemoryTaskRepository()
+        task = await repo.create(Task())
+        assert ids(await repo.get_by_status("created")) == [task.id]
+
+        task.assign_to("agent-1")
+        await repo.update(task)
+
+        assert await repo.get_by_status("created") == []
+        assert ids(await repo.get_by_status(TaskStatus.ASSIGNED)) == [task.id]
+        assert ids(await repo.get_by_agent("agent-1")) == [task.id]
+
+        task.assigned_agent = "agent-2"
+        await repo.update(task)
+
+        assert await repo.get_by_agent("agent-1") == []
+        assert ids(await repo.get_by_agent("agent-2")) == [task.id]
+
+    async def test_update_many_reindexes_all_tasks(self):
+        repo = InMemoryTaskRepository()
+        tasks = await repo.create_many([Task() for _ in range(3)])
+        for task in tasks:
+            task.assign_to("agent-1")
+
+        await repo.update_many(tasks)
+
+        assert await repo.get_by_status("created") == []
+        assert ids(await repo.get_by_status("assigned")) == ids(tasks)
+        assert ids(await repo.get_by_agent("agent-1")) == ids(tasks)
+
+    async def test_update_many_with_unknown_task_changes_nothing(self):
+        repo = InMemoryTaskRepository()
+        task = await repo.create(Task())
+        task.assign_to("agent-1")
+
+        with pytest.raises(ValueError):
+            await repo.update_many([task, Task()])
+
+        assert ids(await repo.get_by_status("created")) == [task.id]
+        assert await repo.get_by_agent("agent-1") == []
+
+    async def test_delete_removes_task_from_indexes(self):
+        repo = InMemoryTaskRepository()
+        task = await repo.create(Task())
+        task.assign_to("agent-1")
+        await repo.update(task)
+
+        assert await repo.delete(task.id) is True
+        assert await repo.delete(task.id) is False
+        assert await repo.get_by_status("assigned") == []
+        assert await repo.get_by_agent("agent-1") == []
+        assert await repo.get_pending() == []
+
+    async def test_get_pending_lists_created_before_assigned(self):
+        repo = InMemoryTaskRepository()
+        assigned = await repo.create(Task())
+        assigned.assign_to("agent-1")
+        await repo.update(assigned)
+        created = await repo.create(Task())
+        await repo.create(Task(status=TaskStatus.COMPLETED))
+
+        assert ids(await repo.get_pending()) == [created.id, assigned.id]
+        assert ids(await repo.get_pending(limit=1)) == [created.id]
+
+    async def test_get_by_status_with_unknown_status(self):
+        repo = InMemoryTaskRepository()
+        await repo.create(Task())
+        assert await repo.get_by_status("no-such-status") == []
+
+
+class TestConversationIndex:
+    async def test_create_and_append_share_one_index(self):
+        repo = InMemoryMessageRepository()
+        conversation = await repo.create_conversation(Conversation())
+        await repo.create_message(
+            Message(content="a", conversation_id=conversation.id, timestamp=BASE_TIME)
+        )
+        await repo.append_message(
+            conversation.id, Message(content="b", timestamp=BASE_TIME + timedelta(seconds=1))
+        )
+
+        listed = [m.content for m in await repo.get_conversation_messages(conversation.id)]
+        streamed = [
+            m.content async for m in repo.iter_conversation_messages(conversation.id, reverse=False)
+        ]
+        assert listed == streamed == ["a", "b"]
+
+    async def test_messages_are_ordered_by_timestamp(self):
+        repo = InMemoryMessageRepository()
+        for content, seconds in (("second", 2), ("first", 1), ("third", 3)):
+            await repo.create_message(
+                Message(
+                    content=content,
+                    conversation_id="c",
+                    timestamp=BASE_TIME + timedelta(seconds=seconds),
+                )
+            )
+
+        assert [m.content for m in await repo.get_conversation_messages("c")] == [
+            "first",
+            "second",
+            "third",
+        ]
+        newest = [m.content async for m in repo.iter_conversation_messages("c", limit=2)]
+        assert newest == ["third", "second"]
+
+    async def test_resaving_message_replaces_index_entry(self):
+        repo = InMemoryMessageRepository()
+        message = await repo.create_message(
+            Message(content="a", conversation_id="c", timestamp=BASE_TIME)
+        )
+        await repo.create_message(
+            Message(content="b", conversation_id="c", timestamp=BASE_TIME + timedelta(seconds=1))
+        )
+
+        message.timestamp = BASE_TIME + timedelta(seconds=2)
+        await repo.create_message(message)
+
+        assert [m.content for m in await repo.get_conversation_messages("c")] == ["b", "a"]
+
+    async def test_appending_saved_message_moves_it_to_conversation(self):
+        repo = InMemoryMessageRepository()
+        conversation = await repo.create_conversation(Conversation())
+        message = await repo.create_message(Message(content="a"))
+
+        await repo.append_message(conversation.id, message)
+
+        assert ids(await repo.get_conversation_messages(conversation.id)) == [message.id]
+        assert await repo.get_conversation_messages(None) == []
+
+    async def test_streaming_reader_ignores_concurrent_writes(self):
+        repo = InMemoryMessageRepository()
+        for i in range(3):
+            await repo.create_message(
+                Message(
+                    content=str(i), conversation_id="c", timestamp=BASE_TIME + timedelta(seconds=i)
+                )
+            )
+
+        streamed = []
+        async for message in repo.iter_conversation_messages("c"):
+            streamed.append(message.content)
+            await repo.create_message(
+                Message(content="early", conversation_id="c", timestamp=BASE_TIME)
+            )
+
+        assert streamed == ["2", "1", "0"]
+
+    async def test_append_to_unknown_conversation_raises(self):
+        repo = InMemoryMessageRepository()
+        with pytest.raises(ValueError):
+            await repo.append_message("missing", Message(content="a"))
+
+
+class TestKeysetPagination:
+    def test_cursor_round_trip(self):
+        ts = datetime(2024, 5, 6, 7, 8, 9, 123456)
+        assert decode_cursor(encode_cursor(ts, "id|with|bars")) == (ts, "id|with|bars")
+
+    def test_invalid_cursor_raises(self):
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+    @pytest.mark.parametrize("limit", [1, 3, 7, 50])
+    async def test_agent_pages_cover_all_records_once(self, limit):
+        repo = InMemoryAgentRepository()
+        # Одинаковое время создания у пар записей - порядок задает id
+        agents = [
+            Agent(name=str(i), created_at=BASE_TIME + timedelta(seconds=i // 2)) for i in range(20)
+        ]
+        await repo.create_many(list(reversed(agents)))
+
+        items, pages = await collect_pages(repo.list_after, limit)
+
+        expected = sorted(agents, key=lambda a: (a.created_at, a.id))
+        assert ids(items) == ids(expected)
+        assert pages == max(1, -(-len(agents) // limit))
+
+    async def test_task_pages_cover_all_records_once(self):
+        repo = InMemoryTaskRepository()
+        tasks = [Task(created_at=BASE_TIME + timedelta(seconds=i % 5)) for i in range(12)]
+        await repo.create_many(tasks)
+
+        items, _ = await collect_pages(repo.list_after, 5)
+
+        assert ids(items) == ids(sorted(tasks, key=lambda t: (t.created_at, t.id)))
+
+    async def test_conversation_pages_cover_all_records_once(self):
+        repo = InMemoryMessageRepository()
+        conversations = [
+            Conversation(created_at=BASE_TIME + timedelta(seconds=i)) for i in range(7)
+        ]
+        for conversation in reversed(conversations):
+            await repo.create_conversation(conversation)
+
+        items, _ = await collect_pages(repo.list_conversations_after, 3)
+
+        assert ids(items) == ids(conversations)
+
+    async def test_message_pages_cover_all_records_once(self):
+        repo = InMemoryMessageRepository()
+        messages = [
+            Message(
+                content=str(i),
+                conversation_id="c",
+                timestamp=BASE_TIME + timedelta(seconds=i // 3),
+            )
+            for i in range(10)
+        ]
+        await repo.create_messages(messages)
+
+        async def list_after(cursor, limit):
+            return await repo.list_messages_after("c", cursor=cursor, limit=limit)
+
+        items, _ = await collect_pages(list_after, 4)
+
+        assert ids(items) == ids(sorted(messages, key=lambda m: (m.timestamp, m.id)))
+
+    async def test_empty_repository_has_single_empty_page(self):
+        repo = InMemoryAgentRepository()
+        assert await repo.list_after() == ([], None)
@@ -0,0 +1,111 @@
+"""
+Тесты пакетирования запросов embeddings в LLMService
+"""
+
+import asyncio
+
+import pytest
+
+from king.core.services.llm_service import LLMService
+
+
+class StubLLMClient:
+    """Embedding текста - вектор из его длины"""
+
+    def __init__(self, short=False, error=None):
+        self.calls = []
+        self.short = short
+        self.error = error
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def get_embeddings_batch(self, texts):
+        self.calls.append(list(texts))
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        vectors = [[float(len(text))] for text in texts]
+        return vectors[:-1] if self.short else vectors
+
+
+async def test_concurrent_embeddings_share_one_request():
+    client = StubLLMClient()
+    service = LLMService(client, embed_flush_delay_ms=20)
+
+    vectors = await asyncio.gather(*(service.get_embeddings(t) for t in ("a", "bb", "ccc")))
+
+    assert client.calls == [["a", "bb", "ccc"]]
+    assert vectors == [[1.0], [2.0], [3.0]]
+    await service.close()
+
+
+async def test_max_batch_splits_requests():
+    client = StubLLMClient()
+    service = LLMService(client, embed_flush_delay_ms=20, embed_max_batch=2)
+
+    await asyncio.gather(*(service.get_embeddings(t) for t in "abcde"))
+
+    assert [len(call) for call in client.calls] == [2, 2, 1]
+    await service.close()
+
+
+async def test_provider_error_reaches_every_caller():
+    service = LLMService(StubLLMClient(error=ConnectionError("down")), embed_flush_delay_ms=5)
+
+    results = await asyncio.gather(
+        service.get_embeddings("a"), service.get_embeddings("b"), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+    await service.close()
+
+
+async def test_short_provider_response_fails_every_caller():
+    service = LLMService(StubLLMClient(short=True), embed_flush_delay_ms=20)
+
+    results = await asyncio.gather(
+        service.get_embeddings("a"), service.get_embeddings("b"), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    await service.close()
+
+
+async def test_cancelled_caller_is_skipped():
+    client = StubLLMClient()
+    service = LLMService(client, embed_flush_delay_ms=50)
+
+    kept = asyncio.create_task(service.get_embeddings("a"))
+    cancelled = asyncio.create_task(service.get_embeddings("bb"))
+    await asyncio.sleep(0.01)
+    cancelled.cancel()
+
+    assert await kept == [1.0]
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    assert client.calls == [["a"]]
+    await service.close()
+
+
+async def test_close_fails_in_flight_and_queued_callers():
+    client = StubLLMClient()
+    client.release.clear()
+    service = LLMService(client, embed_flush_delay_ms=1, embed_max_batch=1)
+
+    in_flight = asyncio.create_task(service.get_embeddings("a"))
+    queued = asyncio.create_task(service.get_embeddings("b"))
+    while not client.calls:
+        await asyncio.sleep(0.001)
+    await service.close()
+
+    for task in (in_flight, queued):
+        with pytest.raises(RuntimeError):
+            await task
+
+
+async def test_empty_batch_skips_provider():
+    client = StubLLMClient()
+    service = LLMService(client)
+
+    assert await service.get_embeddings_batch([]) == []
+    assert client.calls == []
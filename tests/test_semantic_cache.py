@@ -0,0 +1,75 @@
+"""
+Тесты семантического кэша результатов RAG
+"""
+
+from king.core.services.semantic_cache import SemanticCache
+
+A = [1.0, 0.0, 0.0, 0.0]
+B = [0.0, 1.0, 0.0, 0.0]
+C = [0.0, 0.0, 1.0, 0.0]
+
+
+def test_hit_on_same_embedding_and_key():
+    cache = SemanticCache()
+    cache.put(A, "k", "value")
+
+    assert cache.get(A, "k") == "value"
+    assert cache.get([x * 3 for x in A], "k") == "value"
+    assert cache.get([1.0, 0.01, 0.0, 0.0], "k") == "value"
+
+
+def test_miss_on_other_key_or_distant_embedding():
+    cache = SemanticCache()
+    cache.put(A, ("search", 5, None), "value")
+
+    assert cache.get(A, ("search", 10, None)) is None
+    assert cache.get(B, ("search", 5, None)) is None
+    assert cache.get([0.0, 0.0, 0.0, 0.0], ("search", 5, None)) is None
+
+
+def test_zero_vector_is_not_stored():
+    cache = SemanticCache()
+    cache.put([0.0, 0.0], "k", "value")
+    assert len(cache) == 0
+
+
+def test_expired_entry_is_dropped():
+    cache = SemanticCache(ttl_seconds=0.0)
+    cache.put(A, "k", "value")
+
+    assert cache.get(A, "k") is None
+    assert len(cache) == 0
+
+
+def test_capacity_evicts_least_recently_used():
+    cache = SemanticCache(capacity=2)
+    cache.put(A, "a", 1)
+    cache.put(B, "b", 2)
+    assert cache.get(A, "a") == 1
+
+    cache.put(C, "c", 3)
+
+    assert len(cache) == 2
+    assert cache.get(B, "b") is None
+    assert cache.get(A, "a") == 1
+    assert cache.get(C, "c") == 3
+
+
+def test_dimension_change_clears_cache():
+    cache = SemanticCache()
+    cache.put(A, "k", "old")
+
+    cache.put([1.0, 0.0], "k", "new")
+
+    assert len(cache) == 1
+    assert cache.get(A, "k") is None
+    assert cache.get([1.0, 0.0], "k") == "new"
+
+
+def test_clear():
+    cache = SemanticCache()
+    cache.put(A, "k", "value")
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.get(A, "k") is None
@@ -0,0 +1,96 @@
+"""
+Тесты пакетного назначения задач агентам
+"""
+
+import pytest
+
+from king.core.domain import Agent, AgentStatus, Task, TaskStatus
+from king.core.services.agent_orchestrator import AgentOrchestrator
+from king.core.services.task_scheduler import TaskScheduler
+from king.infrastructure.persistence.in_memory_repositories import (
+    InMemoryAgentRepository,
+    InMemoryTaskRepository,
+)
+
+
+class RacingAgentRepository(InMemoryAgentRepository):
+    """Репозиторий, во время загрузки агента выполняющий конкурентное действие"""
+
+    def __init__(self):
+        super().__init__()
+        self.on_get = None
+
+    async def get_by_id(self, agent_id):
+        if self.on_get is not None:
+            action, self.on_get = self.on_get, None
+            await action()
+        return await super().get_by_id(agent_id)
+
+
+class StubEventBus:
+    def __init__(self):
+        self.events = []
+
+    async def publish(self, event):
+        self.events.append(event)
+
+    async def publish_many(self, events):
+        self.events.extend(events)
+
+
+async def make_scheduler():
+    tasks, agents, bus = InMemoryTaskRepository(), RacingAgentRepository(), StubEventBus()
+    agent = await agents.create(Agent(name="worker", status=AgentStatus.ACTIVE))
+    orchestrator = AgentOrchestrator(agents, tasks)
+    scheduler = TaskScheduler(tasks, agents, agent_orchestrator=orchestrator, event_bus=bus)
+    return scheduler, tasks, agents, agent, bus
+
+
+async def test_bulk_assignment_persists_and_publishes():
+    scheduler, tasks, _, agent, bus = await make_scheduler()
+    created = await tasks.create_many([Task() for _ in range(3)])
+
+    assert await scheduler.schedule_all_pending() == 3
+
+    assert await tasks.get_by_status("created") == []
+    assert {t.id for t in await tasks.get_by_agent(agent.id)} == {t.id for t in created}
+    assert {e.task_id for e in bus.events} == {t.id for t in created}
+
+
+async def test_task_assigned_concurrently_is_skipped():
+    scheduler, tasks, agents, agent, bus = await make_scheduler()
+    created = await tasks.create_many([Task() for _ in range(3)])
+    raced = created[1]
+
+    async def assign_elsewhere():
+        raced.assign_to("other-agent")
+        await tasks.update(raced)
+
+    agents.on_get = assign_elsewhere
+
+    assert await scheduler.schedule_all_pending() == 2
+
+    assert await tasks.get_by_status("created") == []
+    assert {t.id for t in await tasks.get_by_agent(agent.id)} == {
+        created[0].id,
+        created[2].id,
+    }
+    assert [t.id for t in await tasks.get_by_agent("other-agent")] == [raced.id]
+    for task in await tasks.get_by_status("assigned"):
+        assert task.status == TaskStatus.ASSIGNED
+    assert {e.task_id for e in bus.events} == {created[0].id, created[2].id}
+
+
+async def test_failed_update_rolls_back_assignments():
+    _, tasks, agents, agent, _ = await make_scheduler()
+    orchestrator = AgentOrchestrator(agents, tasks)
+    stored = await tasks.create(Task())
+    unknown = Task()
+
+    with pytest.raises(ValueError):
+        await orchestrator.assign_task_to_agent_bulk([(stored, agent.id), (unknown, agent.id)])
+
+    assert stored.status == TaskStatus.CREATED
+    assert stored.assigned_agent is None
+    assert [t.id for t in await tasks.get_by_status("created")] == [stored.id]
+    assert await tasks.get_by_agent(agent.id) == []